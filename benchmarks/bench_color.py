@@ -0,0 +1,41 @@
+"""Durchsatz der Farbumrechnung: skalarer Pfad vs. NumPy-Batch vs. Lookup-Tabelle.
+
+    PYTHONPATH=src python benchmarks/bench_color.py [anzahl_farben]
+"""
+import sys
+import time
+
+import numpy as np
+
+from huekit.utils.color import ColorLUT, rgb_to_xyb, srgb_to_xy
+
+
+def _rate(fn, n: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def main(n: int = 100_000):
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(n, 3), dtype=np.uint8)
+    as_list = pixels.tolist()
+    lut = ColorLUT("C")
+    out = np.empty((n, 3), dtype=np.float32)
+
+    results = {
+        "scalar srgb_to_xy": _rate(lambda: [srgb_to_xy(r, g, b) for r, g, b in as_list], n),
+        "numpy rgb_to_xyb": _rate(lambda: rgb_to_xyb(pixels), n),
+        "numpy rgb_to_xyb + gamut C": _rate(lambda: rgb_to_xyb(pixels, "C"), n),
+        "ColorLUT.lookup (gamut C)": _rate(lambda: lut.lookup(pixels, out=out), n),
+    }
+    baseline = results["scalar srgb_to_xy"]
+    for name, rate in results.items():
+        print(f"{name:<30} {rate / 1e6:8.2f} M colors/s  ({rate / baseline:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
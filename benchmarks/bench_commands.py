@@ -0,0 +1,39 @@
+"""Befehle pro Sekunde: validierter pydantic-Pfad vs. Fast Path (commands/fast.py).
+
+    PYTHONPATH=src python benchmarks/bench_commands.py [anzahl]
+"""
+import json
+import sys
+import time
+
+from huekit.commands.base import color_command, dimming_command
+from huekit.commands.fast import color_body, dimming_body, encode_state
+
+
+def _rate(fn, n: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(n):
+            fn(i)
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def main(n: int = 50_000):
+    results = {
+        "pydantic dimming + json.dumps": _rate(
+            lambda i: json.dumps(dimming_command(i % 100, 100).to_payload()).encode(), n),
+        "pydantic dimming + to_json": _rate(lambda i: dimming_command(i % 100, 100).to_json(), n),
+        "fast dimming_body": _rate(lambda i: dimming_body(float(i % 100), 100), n),
+        "pydantic color + to_json": _rate(lambda i: color_command((0.3, (i % 100) / 200), 50).to_json(), n),
+        "fast color_body": _rate(lambda i: color_body((0.3, (i % 100) / 200), 50), n),
+        "fast encode_state (on+dim+xy)": _rate(
+            lambda i: encode_state(on=True, brightness=float(i % 100), xy=(0.3, 0.3), duration_ms=100), n),
+    }
+    for name, rate in results.items():
+        print(f"{name:<32} {rate / 1e3:9.1f} k commands/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
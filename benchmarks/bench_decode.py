@@ -0,0 +1,54 @@
+"""Decoding großer List-Responses: pydantic-Validierung vs. lazy Views (models/fast.py).
+
+    PYTHONPATH=src python benchmarks/bench_decode.py [räume] [lampen_pro_raum]
+
+Gemessen wird ab dem bereits geparsten JSON (so wie es HttpClient liefert) und zusätzlich ab den
+rohen Bytes, einmal ohne Feldzugriffe und einmal mit typischem Zugriff (Name + An/Aus jeder Lampe).
+"""
+import json
+import sys
+import time
+
+from pydantic import TypeAdapter
+
+from huekit.models.fast import decode_list
+from huekit.models.light import LightModel
+from huekit.testing.fake_bridge import generate_resources
+
+
+def _best(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rooms: int = 50, lights_per_room: int = 10):
+    resources = generate_resources(rooms=rooms, lights_per_room=lights_per_room)
+    body = {"errors": [], "data": list(resources["light"].values())}
+    raw = json.dumps(body).encode()
+    raw_data = json.dumps(body["data"]).encode()
+    adapter = TypeAdapter(list[LightModel])
+
+    def touch(lights):
+        return [(light.metadata.name, light.on.is_on) for light in lights]
+
+    results = {
+        "pydantic model_validate (dict)": _best(lambda: [LightModel.model_validate(r) for r in body["data"]]),
+        "pydantic TypeAdapter (bytes)": _best(lambda: adapter.validate_json(raw_data)),
+        "lazy views (dict)": _best(lambda: decode_list(body, "light")),
+        "lazy views + name/on (dict)": _best(lambda: touch(decode_list(body, "light"))),
+        "json.loads + lazy views (bytes)": _best(lambda: decode_list(json.loads(raw), "light")),
+        "pydantic + name/on (dict)": _best(lambda: touch([LightModel.model_validate(r) for r in body["data"]])),
+    }
+    n = len(body["data"])
+    print(f"{n} lights, {len(raw) / 1024:.0f} KiB JSON")
+    for name, seconds in results.items():
+        print(f"{name:<34} {seconds * 1e3:8.3f} ms   {n / seconds / 1e3:8.1f} k lights/s")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
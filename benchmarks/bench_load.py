@@ -0,0 +1,156 @@
+"""Lastbenchmark gegen die lokale Fake-Bridge: Requests/s und p50/p95/p99-Latenz pro Szenario.
+
+    PYTHONPATH=src python benchmarks/bench_load.py --requests 500 --workers 8 --latency-ms 2 --out bench.json
+
+Die Ausgabe ist JSON, damit Ergebnisse über Commits hinweg verglichen werden können.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable
+
+from huekit.api.http_client import AsyncHttpClient, HttpClient
+from huekit.api.hue_api import AsyncHueApi, HueApi
+from huekit.repo.hue_repository import HueRepository
+from huekit.services.group_service import GroupService
+from huekit.services.light_service import LightService
+from huekit.testing.fake_bridge import FakeBridge, FakeBridgeConfig, generate_resources
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(latencies: list[float], wall_s: float, errors: int) -> dict:
+    lat = sorted(latencies)
+    return {
+        "requests": len(lat) + errors,
+        "errors": errors,
+        "wall_s": round(wall_s, 4),
+        "rps": round(len(lat) / wall_s, 1) if wall_s else 0.0,
+        "p50_ms": round(percentile(lat, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(lat, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(lat, 0.99) * 1e3, 3),
+        "max_ms": round(lat[-1] * 1e3, 3) if lat else 0.0,
+    }
+
+
+def run_threaded(call: Callable[[int], object], n: int, workers: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+
+    def one(i: int):
+        start = time.perf_counter()
+        call(i)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(one, i) for i in range(n)]:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def run_async(call, n: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            try:
+                await call(i)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rooms", type=int, default=5)
+    parser.add_argument("--lights-per-room", type=int, default=6)
+    parser.add_argument("--out", help="JSON-Datei; ohne Angabe nach stdout")
+    args = parser.parse_args(argv)
+
+    config = FakeBridgeConfig(latency_s=args.latency_ms / 1e3, jitter_s=args.jitter_ms / 1e3,
+                              error_rate=args.error_rate)
+    resources = generate_resources(rooms=args.rooms, lights_per_room=args.lights_per_room)
+    n, workers = args.requests, args.workers
+    scenarios: dict[str, dict] = {}
+
+    with FakeBridge(resources, config) as bridge:
+        http = HttpClient(bridge.base_url, bridge.headers)
+        api = HueApi(http)
+        repo = HueRepository(api)
+        repo.sync()
+        lights = [r["id"] for r in repo.all("light")]
+        groups = [r["id"] for r in repo.all("grouped_light")]
+        groups_svc, lights_svc = GroupService(api), LightService(api, repo)
+
+        scenarios["api.get_light"] = run_threaded(lambda i: api.get_light(lights[i % len(lights)]), n, workers)
+        scenarios["api.put_light"] = run_threaded(
+            lambda i: api.put_light(lights[i % len(lights)], {"dimming": {"brightness": float(i % 100)}}), n, workers)
+        scenarios["api.list_lights"] = run_threaded(lambda i: api.list_lights(), max(n // 10, 1), workers)
+        scenarios["group_service.set_brightness"] = run_threaded(
+            lambda i: groups_svc.set_brightness(groups[i % len(groups)], i % 100), n, workers)
+        scenarios["light_service.set_color"] = run_threaded(
+            lambda i: lights_svc.set_color(lights[i % len(lights)], (0.3, 0.3 + (i % 10) / 100)), n, workers)
+        scenarios["light_service.set_states (all lights)"] = run_threaded(
+            lambda i: lights_svc.set_states({lid: {"on": {"on": bool(i % 2)}} for lid in lights}),
+            max(n // 20, 1), 1)
+        http.close()
+
+        async def async_put():
+            async with AsyncHttpClient(bridge.base_url, bridge.headers, pool_size=workers) as client:
+                async_api = AsyncHueApi(client)
+                return await run_async(
+                    lambda i: async_api.put_light(lights[i % len(lights)], {"dimming": {"brightness": 10.0}}),
+                    n, workers)
+
+        scenarios["async_api.put_light"] = asyncio.run(async_put())
+        bridge_stats = vars(bridge.stats)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {"requests": n, "workers": workers, "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+                   "error_rate": args.error_rate, "lights": len(lights), "groups": len(groups)},
+        "scenarios": scenarios,
+        "bridge": bridge_stats,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Entertainment-Pipeline (entertainment/pipeline.py): Kosten pro Frame und Allokationen.
+
+    PYTHONPATH=src python benchmarks/bench_pipeline.py [breite] [höhe] [kanäle]
+
+Gemessen wird Sampling + Farbkonvertierung + Glättung + Kodierung des HueStream-Pakets, also
+alles, was pro Tick auf dem Stream-Thread läuft. Das Dekodieren des Videos ist nicht enthalten.
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from huekit.entertainment.pipeline import FramePipeline, array_frames
+from huekit.entertainment.protocol import HueStreamEncoder
+
+
+def main(width: int = 1920, height: int = 1080, channels: int = 20, frames: int = 2000):
+    rng = np.random.default_rng(0)
+    clip = rng.integers(0, 256, size=(8, height, width, 3), dtype=np.uint8)
+    angles = np.linspace(0, 2 * np.pi, channels, endpoint=False)
+    positions = np.stack([np.cos(angles), np.zeros(channels), np.sin(angles)], axis=-1)
+    pipeline = FramePipeline(array_frames(clip, loop=True), positions)
+    encoder = HueStreamEncoder("0" * 36, list(range(channels)))
+
+    def step(i: int):
+        encoder.encode_array(pipeline(i, 0.0))
+
+    for i in range(50):  # Puffer anlegen, LUT warm
+        step(i)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(frames):
+        step(i)
+    per_frame = (time.perf_counter() - start) / frames
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{width}x{height}, {channels} channels")
+    print(f"per frame      {per_frame * 1e6:8.1f} us   (budget at 50 Hz: 20000 us)")
+    print(f"max rate       {1 / per_frame:8.0f} Hz  on one core")
+    print(f"peak traced    {peak / 1024:8.1f} KiB over {frames} frames")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:4]])
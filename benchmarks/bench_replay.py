@@ -0,0 +1,68 @@
+"""Replay eines Befehls-Traces durch Dispatcher + Rate-Limiter gegen die Fake-Bridge.
+
+    PYTHONPATH=src python benchmarks/bench_replay.py [trace.bin] --speed 1 10 max --workers 4
+
+Ohne Trace-Datei wird zuerst ein synthetischer Trace aufgezeichnet (per TraceRecorder an HueApi):
+ein "Szenen-Sturm" am Abend - alle Räume kurz hintereinander - plus Chat-Bursts mit Dimm-Stufen.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from huekit.api.http_client import HttpClient
+from huekit.api.hue_api import HueApi
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.trace import TraceRecorder
+from huekit.services.group_service import GroupService
+from huekit.services.light_service import LightService
+from huekit.testing.fake_bridge import FakeBridge, generate_resources
+from huekit.testing.replay import Replayer
+
+
+def record_synthetic(path: str, rooms: int = 8, seed: int = 0):
+    rng = random.Random(seed)
+    with FakeBridge(generate_resources(rooms=rooms, lights_per_room=4)) as bridge, TraceRecorder(path) as recorder:
+        api = HueApi(HttpClient(bridge.base_url, bridge.headers), recorder=recorder)
+        repo = HueRepository(api)
+        repo.sync()
+        groups, lights = GroupService(api), LightService(api, repo)
+        room_groups = [g for g in repo.group_memberships() if repo.resolve_group_room(g) is not None]
+        light_ids = [r["id"] for r in repo.all("light")]
+        # Szenen-Sturm: jeder Raum an, dann Farbe für jede Lampe
+        for gid in room_groups:
+            groups.turn_on(gid)
+        for lid in light_ids:
+            lights.set_color(lid, (rng.uniform(0.2, 0.5), rng.uniform(0.2, 0.5)))
+        # Chat-Bursts: Slider-artige Dimm-Stufen auf wenige Ziele
+        for _ in range(5):
+            gid = rng.choice(room_groups)
+            for level in range(10, 100, 10):
+                groups.set_brightness(gid, level, duration_ms=100)
+            time.sleep(0.05)
+    return recorder.records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("trace", nargs="?")
+    parser.add_argument("--speed", nargs="+", default=["1", "10", "max"])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.trace
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="hue-trace-"), "synthetic.trace")
+        print(f"recorded {record_synthetic(path)} commands to {path} ({os.path.getsize(path)} bytes)")
+    replayer = Replayer.from_file(path)
+    results = {}
+    for speed in args.speed:
+        report = replayer.run(speed=None if speed == "max" else float(speed), workers=args.workers)
+        results[speed] = report.summary()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
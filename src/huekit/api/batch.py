@@ -0,0 +1,73 @@
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from huekit.api.http_client import Payload
+
+BatchItem = tuple[str, str, Payload]  # (rtype, rid, payload)
+
+
+@dataclass
+class ItemResult:
+    index: int                 # Position in der Eingabe
+    rtype: str
+    rid: str
+    response: Optional[dict] = None
+    error: Optional[Exception] = None
+    seconds: float = 0.0       # inkl. Wartezeit im Rate-Limiter
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchError(Exception):
+    def __init__(self, result: "BatchResult"):
+        self.result = result
+        first = result.failed[0]
+        super().__init__(f"{len(result.failed)} of {len(result.items)} commands failed "
+                         f"(first: {first.rtype}/{first.rid}: {first.error})")
+
+
+@dataclass
+class BatchResult:
+    items: list[ItemResult] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(item.ok for item in self.items)
+
+    @property
+    def succeeded(self) -> list[ItemResult]:
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> list[ItemResult]:
+        return [item for item in self.items if not item.ok]
+
+    def raise_for_errors(self):
+        if not self.ok:
+            raise BatchError(self)
+
+
+def lanes(items: list[BatchItem]) -> list[list[int]]:
+    """Indizes pro Ressource in Eingabereihenfolge - innerhalb einer Lane wird sequenziell gesendet."""
+    by_target: dict[tuple[str, str], list[int]] = {}
+    for i, (rtype, rid, _) in enumerate(items):
+        by_target.setdefault((rtype, rid), []).append(i)
+    return list(by_target.values())
+
+
+def prepare(items: Iterable[BatchItem], concurrency: int) -> tuple[list[BatchItem], BatchResult]:
+    if concurrency < 1:
+        raise ValueError(f"'concurrency' must be >= 1, got {concurrency}")
+    items = list(items)
+    result = BatchResult([ItemResult(i, rtype, rid) for i, (rtype, rid, _) in enumerate(items)])
+    return items, result
+
+
+def record(slot: ItemResult, start: float, response: Optional[dict] = None, error: Optional[Exception] = None):
+    slot.seconds = time.perf_counter() - start
+    slot.response = response
+    slot.error = error
@@ -0,0 +1,157 @@
+import json
+import logging
+import socket
+import threading
+from typing import Callable, Iterator, Optional
+
+import requests
+
+from huekit.api.http_client import HttpClient
+
+log = logging.getLogger(__name__)
+
+EventHandler = Callable[[list[dict]], None]
+ConnectHandler = Callable[[bool], None]
+
+
+def eventstream_url(base_url: str) -> str:
+    # https://<ip>/clip/v2/resource -> https://<ip>/eventstream/clip/v2
+    root = base_url.rstrip("/").split("/clip/v2")[0]
+    return f"{root}/eventstream/clip/v2"
+
+
+def _iter_lines(raw) -> Iterator[str]:
+    # iter_lines() von requests puffert bis chunk_size voll ist - read1() liefert, was da ist
+    buffer = b""
+    while True:
+        chunk = raw.read1(8192)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
+
+
+def iter_sse(lines: Iterator[str]) -> Iterator[tuple[Optional[str], str]]:
+    """Zerlegt einen text/event-stream in (event_id, data)-Paare."""
+    event_id: Optional[str] = None
+    data: list[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield event_id, "\n".join(data)
+            event_id, data = None, []
+            continue
+        if line.startswith(":"):
+            continue  # Kommentar / Keep-Alive ("hi")
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "data":
+            data.append(value)
+        elif field == "id":
+            event_id = value
+    if data:
+        yield event_id, "\n".join(data)
+
+
+class EventStream:
+    """Liest /eventstream/clip/v2 in einem Hintergrund-Thread und verbindet sich bei Abbruch neu."""
+
+    def __init__(self, http: HttpClient, on_events: EventHandler, *,
+                 on_connect: Optional[ConnectHandler] = None,
+                 url: Optional[str] = None,
+                 connect_timeout: float = 5.0,
+                 read_timeout: Optional[float] = None,
+                 backoff_initial_s: float = 1.0,
+                 backoff_max_s: float = 30.0):
+        self.url = url or eventstream_url(http.base_url)
+        self.headers = {**http.headers, "Accept": "text/event-stream"}
+        self.verify = http.verify
+        self.on_events = on_events
+        self.on_connect = on_connect
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.backoff_initial_s = backoff_initial_s
+        self.backoff_max_s = backoff_max_s
+
+        self.last_event_id: Optional[str] = None
+        self.connects = 0
+        self._session = requests.Session()
+        self._response: Optional[requests.Response] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hue-eventstream", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            self._abort(response)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._session.close()
+
+    @staticmethod
+    def _abort(response: requests.Response):
+        # close() allein weckt einen blockierenden Read nicht auf -> Socket hart schließen
+        # raw (urllib3) -> _fp (http.client) -> fp (SocketIO-Reader) -> raw -> _sock
+        sock = response.raw
+        for attr in ("_fp", "fp", "raw", "_sock"):
+            sock = getattr(sock, attr, None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        response.close()
+
+    def _run(self):
+        backoff = self.backoff_initial_s
+        while not self._stop.is_set():
+            try:
+                self._consume()
+                delay, backoff = self.backoff_initial_s, self.backoff_initial_s
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                delay, backoff = backoff, min(backoff * 2, self.backoff_max_s)
+                log.warning("event stream disconnected (%s), retry in %.1fs", e, delay)
+            if self._stop.wait(delay):
+                break
+
+    def _consume(self):
+        headers = dict(self.headers)
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+        with self._session.get(self.url, headers=headers, stream=True, verify=self.verify,
+                               timeout=(self.connect_timeout, self.read_timeout)) as r:
+            r.raise_for_status()
+            self._response = r
+            self.connects += 1
+            if self.on_connect is not None:
+                # Nach einem Reconnect fehlen ggf. Events -> Aufrufer muss neu synchronisieren
+                self.on_connect(self.connects > 1)
+            try:
+                for event_id, data in iter_sse(_iter_lines(r.raw)):
+                    if self._stop.is_set():
+                        return
+                    if event_id:
+                        self.last_event_id = event_id
+                    events = json.loads(data)
+                    self.on_events(events if isinstance(events, list) else [events])
+            finally:
+                self._response = None
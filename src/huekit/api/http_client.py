@@ -1,18 +1,366 @@
+import asyncio
+import ssl
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+import aiohttp
 import requests
+import urllib3
+
+from huekit.api.resilience import CircuitBreaker, HedgePolicy, RetryPolicy, failure_reason
+from huekit.runtime.metrics import (HTTP_ERRORS, HTTP_HEDGE_WINS, HTTP_HEDGED, HTTP_IN_FLIGHT, HTTP_RETRIES,
+                                    HTTP_SECONDS, MetricsSink)
+
+# Die Bridge nutzt ein selbstsigniertes Zertifikat (lokales Netz)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+class HueBridgeError(Exception):
+    def __init__(self, status: int, errors: list[dict], path: str = ""):
+        self.status = status
+        self.errors = errors
+        self.path = path
+        descriptions = ", ".join(e.get("description", "?") for e in errors) or "no details"
+        super().__init__(f"Hue bridge returned {status} for '{path}': {descriptions}")
+
+
+# dict -> als JSON serialisieren; bytes -> bereits fertiger JSON-Body (commands/fast.py)
+Payload = Union[dict, bytes]
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _body(payload: Optional[Payload]) -> dict:
+    if isinstance(payload, (bytes, bytearray)):
+        return {"data": payload, "headers": _JSON_HEADERS}
+    return {"json": payload}
+
+
+def _parse_response(status: int, body: Optional[dict], text: str, path: str) -> dict:
+    if status >= 400:
+        errors = (body or {}).get("errors") or [{"description": text[:200]}]
+        raise HueBridgeError(status, errors, path)
+    return body if body is not None else {}
+
+
+def _rtype(path: str) -> str:
+    return path.lstrip("/").split("/", 1)[0]
+
+
+class _Resilient:
+    """Gemeinsame Policy-Logik für den sync- und async-Client."""
+    base_url: str
+    metrics: Optional[MetricsSink]
+    retry: Optional[RetryPolicy]
+    hedge: Optional[HedgePolicy]
+    breaker: Optional[CircuitBreaker]
+
+    def _init_policies(self, retry: Optional[RetryPolicy], hedge: Optional[HedgePolicy],
+                       breaker: Optional[CircuitBreaker]):
+        self.retry = retry
+        self.hedge = hedge
+        self.breaker = breaker
+        if breaker is not None and breaker.metrics is None:
+            breaker.metrics = self.metrics
+        if breaker is not None and breaker.name == "bridge":
+            breaker.name = self.base_url
+        self._plain = retry is None and hedge is None and breaker is None
+
+    def _attempts(self, method: str) -> int:
+        return self.retry.max_attempts if self.retry is not None and method in self.retry.methods else 1
+
+    def _hedged(self, method: str) -> bool:
+        return self.hedge is not None and method == "GET"
+
+    def _on_error(self, e: Exception, method: str, path: str, attempt: int, attempts: int) -> Optional[float]:
+        """Verbucht einen Fehlversuch; gibt die Wartezeit bis zum nächsten Versuch zurück oder None."""
+        reason = failure_reason(e)
+        if self.breaker is not None:
+            if reason is None:
+                self.breaker.record_success()   # z.B. 404: die Bridge selbst ist gesund
+            else:
+                self.breaker.record_failure()
+        if reason is None or attempt + 1 >= attempts:
+            return None
+        if self.metrics is not None:
+            self.metrics.inc(HTTP_RETRIES, labels={"method": method, "rtype": _rtype(path), "reason": reason})
+        return self.retry.delay(attempt)
+
+    def _count_hedge(self, path: str, won: bool):
+        if self.metrics is not None:
+            labels = {"rtype": _rtype(path)}
+            self.metrics.inc(HTTP_HEDGED, labels=labels)
+            if won:
+                self.metrics.inc(HTTP_HEDGE_WINS, labels=labels)
+
+
+@contextmanager
+def _instrumented(metrics: MetricsSink, method: str, path: str) -> Iterator[None]:
+    labels = {"method": method, "rtype": _rtype(path)}
+    metrics.add_gauge(HTTP_IN_FLIGHT, 1.0)
+    start = time.perf_counter()
+    try:
+        yield
+    except HueBridgeError as e:
+        metrics.inc(HTTP_ERRORS, labels={**labels, "status": str(e.status)})
+        raise
+    except Exception as e:
+        metrics.inc(HTTP_ERRORS, labels={**labels, "status": type(e).__name__})
+        raise
+    finally:
+        metrics.observe(HTTP_SECONDS, time.perf_counter() - start, labels)
+        metrics.add_gauge(HTTP_IN_FLIGHT, -1.0)
+
 
-class HttpClient:
-    def __init__(self, base_url: str, headers: dict[str, str]):
+class HttpClient(_Resilient):
+    def __init__(self, base_url: str, headers: dict[str, str], *, verify: bool = False,
+                 metrics: Optional[MetricsSink] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 hedge: Optional[HedgePolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         self.session = requests.Session()
-        self.base_url = base_url
+        self.session.headers.update(headers)
+        self.base_url = base_url.rstrip("/")
         self.headers = headers
+        self.verify = verify
+        self.metrics = metrics
+        self._init_policies(retry, hedge, breaker)
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    @staticmethod
+    def _handle(r: requests.Response, path: str) -> dict:
+        try:
+            body = r.json()
+        except ValueError:
+            body = None
+        return _parse_response(r.status_code, body, r.text, path)
+
+    def _send(self, method: str, path: str, payload: Optional[Payload], timeout: float) -> dict:
+        r = self.session.request(method, self._url(path), timeout=timeout, verify=self.verify, **_body(payload))
+        return self._handle(r, path)
+
+    def _attempt(self, method: str, path: str, payload: Optional[Payload], timeout: float) -> dict:
+        if self.metrics is None:
+            return self._send(method, path, payload, timeout)
+        with _instrumented(self.metrics, method, path):
+            return self._send(method, path, payload, timeout)
+
+    def request(self, method: str, path: str, payload: Optional[Payload] = None, *, timeout: float = 5) -> dict:
+        if self._plain:
+            return self._attempt(method, path, payload, timeout)
+        attempts = self._attempts(method)
+        for attempt in range(attempts):
+            if self.breaker is not None:
+                self.breaker.before_request()
+            try:
+                if self._hedged(method):
+                    result = self._hedged_get(path, timeout)
+                else:
+                    result = self._attempt(method, path, payload, timeout)
+            except Exception as e:
+                delay = self._on_error(e, method, path, attempt, attempts)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # Abgebrochen (CancelledError, KeyboardInterrupt): weder Erfolg noch Fehler
+                if self.breaker is not None:
+                    self.breaker.release()
+                raise
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+        raise AssertionError("unreachable")
+
+    def _hedged_get(self, path: str, timeout: float) -> dict:
+        if self._hedge_pool is None:
+            with self._hedge_lock:
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(max_workers=4 * (self.hedge.max_hedges + 1),
+                                                          thread_name_prefix="hue-hedge")
+        pending = {self._hedge_pool.submit(self._attempt, "GET", path, None, timeout)}
+        primary = next(iter(pending))
+        hedges = 0
+        error: Optional[BaseException] = None
+        while pending:
+            can_hedge = hedges < self.hedge.max_hedges
+            done, pending = wait(pending, timeout=self.hedge.delay_s if can_hedge else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if hedges:
+                        self._count_hedge(path, won=future is not primary)
+                    # Verlierer laufen im Hintergrund zu Ende, ihr Ergebnis wird verworfen
+                    return future.result()
+                error = future.exception()
+            if not done and can_hedge:
+                hedges += 1
+                pending.add(self._hedge_pool.submit(self._attempt, "GET", path, None, timeout))
+        if hedges:
+            self._count_hedge(path, won=False)
+        raise error
+
+    def get(self, path: str, *, timeout: int = 5) -> dict:
+        return self.request("GET", path, timeout=timeout)
+
+    def put(self, path: str, payload: Payload, *, timeout: int = 5) -> dict:
+        return self.request("PUT", path, payload, timeout=timeout)
+
+    def post(self, path: str, payload: Payload, *, timeout: int = 5) -> dict:
+        return self.request("POST", path, payload, timeout=timeout)
+
+    def close(self):
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        self.session.close()
+
+
+class AsyncHttpClient(_Resilient):
+    """asyncio-Gegenstück zu HttpClient mit begrenztem Keep-Alive-Pool pro Bridge."""
+
+    def __init__(self, base_url: str, headers: dict[str, str], *,
+                 verify: bool = False,
+                 pool_size: int = 4,
+                 keepalive_s: float = 30.0,
+                 ssl_context: Optional[ssl.SSLContext] = None,
+                 metrics: Optional[MetricsSink] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 hedge: Optional[HedgePolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.verify = verify
+        self.pool_size = pool_size
+        self.keepalive_s = keepalive_s
+        self.metrics = metrics
+        self._init_policies(retry, hedge, breaker)
+        # Ein SSLContext für alle Verbindungen, damit Handshakes Sessions wiederverwenden können
+        self.ssl_context = ssl_context or self._build_ssl_context(verify)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+
+    @staticmethod
+    def _build_ssl_context(verify: bool) -> ssl.SSLContext:
+        ctx = ssl.create_default_context()
+        if not verify:
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+        return ctx
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is not None and not self._session.closed:
+            return self._session
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=self.pool_size,
+                    keepalive_timeout=self.keepalive_s,
+                    ssl=self.ssl_context if self.base_url.startswith("https") else False,
+                )
+                self._session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self._session
+
+    async def _attempt(self, method: str, path: str, payload: Optional[Payload], timeout: float) -> dict:
+        if self.metrics is None:
+            return await self._send(method, path, payload, timeout)
+        with _instrumented(self.metrics, method, path):
+            return await self._send(method, path, payload, timeout)
+
+    async def request(self, method: str, path: str, payload: Optional[Payload] = None, *,
+                      timeout: float = 5) -> dict:
+        if self._plain:
+            return await self._attempt(method, path, payload, timeout)
+        attempts = self._attempts(method)
+        for attempt in range(attempts):
+            if self.breaker is not None:
+                self.breaker.before_request()
+            try:
+                if self._hedged(method):
+                    result = await self._hedged_get(path, timeout)
+                else:
+                    result = await self._attempt(method, path, payload, timeout)
+            except Exception as e:
+                delay = self._on_error(e, method, path, attempt, attempts)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Abgebrochen (CancelledError, KeyboardInterrupt): weder Erfolg noch Fehler
+                if self.breaker is not None:
+                    self.breaker.release()
+                raise
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+        raise AssertionError("unreachable")
+
+    async def _hedged_get(self, path: str, timeout: float) -> dict:
+        primary = asyncio.ensure_future(self._attempt("GET", path, None, timeout))
+        pending = {primary}
+        hedges = 0
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                can_hedge = hedges < self.hedge.max_hedges
+                done, pending = await asyncio.wait(pending, timeout=self.hedge.delay_s if can_hedge else None,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if hedges:
+                            self._count_hedge(path, won=task is not primary)
+                        return task.result()
+                    error = task.exception()
+                if not done and can_hedge:
+                    hedges += 1
+                    pending.add(asyncio.ensure_future(self._attempt("GET", path, None, timeout)))
+        finally:
+            # Anders als bei Threads lassen sich die Verlierer hier wirklich abbrechen
+            for task in pending:
+                task.cancel()
+        if hedges:
+            self._count_hedge(path, won=False)
+        raise error
+
+    async def _send(self, method: str, path: str, payload: Optional[Payload], timeout: float) -> dict:
+        session = await self._get_session()
+        async with session.request(method, self._url(path), timeout=aiohttp.ClientTimeout(total=timeout),
+                                   **_body(payload)) as r:
+            text = await r.text()
+            try:
+                body = await r.json(content_type=None) if text else None
+            except ValueError:
+                body = None
+            return _parse_response(r.status, body, text, path)
+
+    async def get(self, path: str, *, timeout: float = 5) -> dict:
+        return await self.request("GET", path, timeout=timeout)
+
+    async def put(self, path: str, payload: Payload, *, timeout: float = 5) -> dict:
+        return await self.request("PUT", path, payload, timeout=timeout)
 
-    def get(self, path: str, *, timeout: int = 5):
-        ...
+    async def post(self, path: str, payload: Payload, *, timeout: float = 5) -> dict:
+        return await self.request("POST", path, payload, timeout=timeout)
 
-    def put(self, path: str, payload: dict, *, timeout: int = 5):
-        ...
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
-    def post(self, path: str, payload: dict, *, timeout: int = 5):
-        ...
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
 
-    
\ No newline at end of file
+    async def __aexit__(self, *exc):
+        await self.close()
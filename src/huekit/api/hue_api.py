@@ -1,37 +1,230 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from huekit.api.batch import BatchItem, BatchResult, lanes, prepare, record
+from huekit.api.http_client import AsyncHttpClient, HttpClient, Payload
+from huekit.models.fast import decode_list
+from huekit.runtime.metrics import API_SECONDS, RATE_LIMIT_WAIT, MetricsSink
+from huekit.runtime.rate_limit import RateLimiter
+from huekit.runtime.trace import TraceRecorder, status_of
+
+
+class DeadlineExceeded(RuntimeError):
+    """Der Befehl wurde nicht gesendet: seine Deadline lief während des Wartens auf den Rate-Limiter ab."""
+
+    def __init__(self, rtype: str, rid: str, late_s: float):
+        self.late_s = late_s
+        super().__init__(f"deadline for {rtype}/{rid} passed {late_s * 1e3:.0f} ms ago while rate limited")
+
+
 class HueApi:
-    def __init__(self, http: HttpClient):
+    def __init__(self, http: HttpClient, limiter: Optional[RateLimiter] = None,
+                 metrics: Optional[MetricsSink] = None, recorder: Optional[TraceRecorder] = None):
         self.http = http
+        self.limiter = limiter
+        self.metrics = metrics
+        self.recorder = recorder
+
+    # Generisch (z.B. für zone, scene, ...) - alle anderen Methoden laufen hier durch
+    def list_resource(self, rtype: str) -> dict:
+        return self._call("list", rtype, rtype)
+    def get_resource(self, rtype: str, rid: str) -> dict:
+        return self._call("get", rtype, f"{rtype}/{rid}")
+    def put_resource(self, rtype: str, rid: str, payload: Payload, *,
+                     deadline: Optional[float] = None) -> dict:
+        if self.recorder is None:
+            return self._call("put", rtype, f"{rtype}/{rid}", payload, deadline)
+        started_at, t0, error = time.time(), time.perf_counter(), None
+        try:
+            return self._call("put", rtype, f"{rtype}/{rid}", payload, deadline)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.recorder.record(rtype, rid, payload, started_at=started_at,
+                                 latency_s=time.perf_counter() - t0, status=status_of(error))
+    def list_typed(self, rtype: str) -> list:
+        """Wie list_resource, aber als lazy, typisierte Views (models/fast.py)."""
+        return decode_list(self.list_resource(rtype), rtype)
+
+    def apply_many(self, items: Iterable[BatchItem], *, concurrency: int = 4) -> BatchResult:
+        """Viele PUTs mit begrenzter Parallelität; pro Ressource bleibt die Reihenfolge erhalten.
+
+        Fehler einzelner Befehle brechen den Batch nicht ab - siehe BatchResult.failed bzw.
+        raise_for_errors(). Der Rate-Limiter greift wie bei jedem put_resource.
+        """
+        items, result = prepare(items, concurrency)
+        start = time.perf_counter()
+
+        def run_lane(indices: list[int]):
+            for i in indices:
+                rtype, rid, payload = items[i]
+                t0 = time.perf_counter()
+                try:
+                    record(result.items[i], t0, response=self.put_resource(rtype, rid, payload))
+                except Exception as e:
+                    record(result.items[i], t0, error=e)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="hue-batch") as pool:
+            for future in [pool.submit(run_lane, lane) for lane in lanes(items)]:
+                future.result()
+        result.wall_s = time.perf_counter() - start
+        return result
+
+    def _call(self, op: str, rtype: str, path: str, payload: Optional[Payload] = None,
+              deadline: Optional[float] = None) -> dict:
+        metrics = self.metrics
+        start = time.perf_counter() if metrics is not None else 0.0
+        try:
+            if op == "put":
+                # Alle Schreibzugriffe laufen hier durch -> einziger Punkt fürs Throttling
+                if self.limiter is not None:
+                    waited = self.limiter.acquire(rtype, bridge=self.http.base_url)
+                    if metrics is not None:
+                        metrics.observe(RATE_LIMIT_WAIT, waited, {"rtype": rtype})
+                    # time.monotonic() wie CommandContext.deadline; während des Wartens abgelaufen?
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise DeadlineExceeded(rtype, path.rpartition("/")[2], time.monotonic() - deadline)
+                return self.http.put(path, payload)
+            return self.http.get(path)
+        finally:
+            if metrics is not None:
+                metrics.observe(API_SECONDS, time.perf_counter() - start, {"op": op, "rtype": rtype})
 
     # Light
     def list_lights(self) -> dict:
-        ...
+        return self.list_resource("light")
     def get_light(self, light_id: str) -> dict:
-        ...
-    def put_light(self, light_id: str, payload: dict) -> dict:
-        ...
+        return self.get_resource("light", light_id)
+    def put_light(self, light_id: str, payload: Payload) -> dict:
+        return self.put_resource("light", light_id, payload)
 
     # Group
     def list_groups(self) -> dict:
-        ...
+        return self.list_resource("grouped_light")
     def get_group(self, group_id: str) -> dict:
-        ...
-    def put_group(self, group_id: str, payload: dict) -> dict:
-        ...
+        return self.get_resource("grouped_light", group_id)
+    def put_group(self, group_id: str, payload: Payload) -> dict:
+        return self.put_resource("grouped_light", group_id, payload)
 
     # Room
     def list_rooms(self) -> dict:
-        ...
+        return self.list_resource("room")
     def get_room(self, room_id: str) -> dict:
-        ...
+        return self.get_resource("room", room_id)
 
     # Device
     def list_devices(self) -> dict:
-        ...
+        return self.list_resource("device")
     def get_device(self, device_id: str) -> dict:
-        ...
+        return self.get_resource("device", device_id)
 
     # Entertainment
     def list_entertainment(self) -> dict:
-        ...
-    def put_entertainment(self, ent_id: str, payload: dict) -> dict:
-        ...
\ No newline at end of file
+        return self.list_resource("entertainment_configuration")
+    def put_entertainment(self, ent_id: str, payload: Payload) -> dict:
+        return self.put_resource("entertainment_configuration", ent_id, payload)
+
+
+class AsyncHueApi:
+    def __init__(self, http: AsyncHttpClient, limiter: Optional[RateLimiter] = None,
+                 metrics: Optional[MetricsSink] = None, recorder: Optional[TraceRecorder] = None):
+        self.http = http
+        self.limiter = limiter
+        self.metrics = metrics
+        self.recorder = recorder
+
+    # Generisch (z.B. für zone, scene, ...) - alle anderen Methoden laufen hier durch
+    async def list_resource(self, rtype: str) -> dict:
+        return await self._call("list", rtype, rtype)
+    async def get_resource(self, rtype: str, rid: str) -> dict:
+        return await self._call("get", rtype, f"{rtype}/{rid}")
+    async def put_resource(self, rtype: str, rid: str, payload: Payload, *,
+                           deadline: Optional[float] = None) -> dict:
+        if self.recorder is None:
+            return await self._call("put", rtype, f"{rtype}/{rid}", payload, deadline)
+        started_at, t0, error = time.time(), time.perf_counter(), None
+        try:
+            return await self._call("put", rtype, f"{rtype}/{rid}", payload, deadline)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.recorder.record(rtype, rid, payload, started_at=started_at,
+                                 latency_s=time.perf_counter() - t0, status=status_of(error))
+    async def list_typed(self, rtype: str) -> list:
+        return decode_list(await self.list_resource(rtype), rtype)
+
+    async def apply_many(self, items: Iterable[BatchItem], *, concurrency: int = 4) -> BatchResult:
+        items, result = prepare(items, concurrency)
+        sem = asyncio.Semaphore(concurrency)
+        start = time.perf_counter()
+
+        async def run_lane(indices: list[int]):
+            for i in indices:
+                rtype, rid, payload = items[i]
+                async with sem:
+                    t0 = time.perf_counter()
+                    try:
+                        record(result.items[i], t0, response=await self.put_resource(rtype, rid, payload))
+                    except Exception as e:
+                        record(result.items[i], t0, error=e)
+
+        await asyncio.gather(*(run_lane(lane) for lane in lanes(items)))
+        result.wall_s = time.perf_counter() - start
+        return result
+
+    async def _call(self, op: str, rtype: str, path: str, payload: Optional[Payload] = None,
+                    deadline: Optional[float] = None) -> dict:
+        metrics = self.metrics
+        start = time.perf_counter() if metrics is not None else 0.0
+        try:
+            if op == "put":
+                if self.limiter is not None:
+                    waited = await self.limiter.acquire_async(rtype, bridge=self.http.base_url)
+                    if metrics is not None:
+                        metrics.observe(RATE_LIMIT_WAIT, waited, {"rtype": rtype})
+                    # time.monotonic() wie CommandContext.deadline; während des Wartens abgelaufen?
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise DeadlineExceeded(rtype, path.rpartition("/")[2], time.monotonic() - deadline)
+                return await self.http.put(path, payload)
+            return await self.http.get(path)
+        finally:
+            if metrics is not None:
+                metrics.observe(API_SECONDS, time.perf_counter() - start, {"op": op, "rtype": rtype})
+
+    # Light
+    async def list_lights(self) -> dict:
+        return await self.list_resource("light")
+    async def get_light(self, light_id: str) -> dict:
+        return await self.get_resource("light", light_id)
+    async def put_light(self, light_id: str, payload: Payload) -> dict:
+        return await self.put_resource("light", light_id, payload)
+
+    # Group
+    async def list_groups(self) -> dict:
+        return await self.list_resource("grouped_light")
+    async def get_group(self, group_id: str) -> dict:
+        return await self.get_resource("grouped_light", group_id)
+    async def put_group(self, group_id: str, payload: Payload) -> dict:
+        return await self.put_resource("grouped_light", group_id, payload)
+
+    # Room
+    async def list_rooms(self) -> dict:
+        return await self.list_resource("room")
+    async def get_room(self, room_id: str) -> dict:
+        return await self.get_resource("room", room_id)
+
+    # Device
+    async def list_devices(self) -> dict:
+        return await self.list_resource("device")
+    async def get_device(self, device_id: str) -> dict:
+        return await self.get_resource("device", device_id)
+
+    # Entertainment
+    async def list_entertainment(self) -> dict:
+        return await self.list_resource("entertainment_configuration")
+    async def put_entertainment(self, ent_id: str, payload: Payload) -> dict:
+        return await self.put_resource("entertainment_configuration", ent_id, payload)
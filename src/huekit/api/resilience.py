@@ -0,0 +1,125 @@
+"""Retry-, Hedging- und Circuit-Breaker-Policies für HttpClient/AsyncHttpClient.
+
+Alles ist optional: ohne Policies verhalten sich die Clients wie bisher (ein Versuch, kein Schutz).
+"""
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+import requests
+
+from huekit.runtime.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE, MetricsSink
+
+# Überlastung / kurzzeitige Störung der Bridge - ein späterer Versuch kann klappen
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+_TRANSPORT_ERRORS = (requests.ConnectionError, requests.Timeout, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def failure_reason(error: BaseException) -> Optional[str]:
+    """Kurzname, falls der Fehler auf eine ungesunde Bridge hindeutet, sonst None (z.B. 404)."""
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return str(status) if status in RETRYABLE_STATUSES else None
+    if isinstance(error, _TRANSPORT_ERRORS):
+        return "timeout" if isinstance(error, (requests.Timeout, asyncio.TimeoutError)) else "connection"
+    return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    backoff_initial_s: float = 0.05
+    backoff_max_s: float = 1.0
+    jitter: float = 0.5                          # Anteil der Wartezeit, der zufällig ist
+    methods: frozenset = frozenset({"GET", "PUT"})  # PUTs setzen absolute Zustände -> idempotent
+
+    def delay(self, attempt: int, rng: random.Random = random) -> float:
+        """Wartezeit vor Versuch `attempt + 1` (attempt zählt ab 0)."""
+        base = min(self.backoff_max_s, self.backoff_initial_s * (2 ** attempt))
+        return base * (1.0 - self.jitter) + base * self.jitter * rng.random()
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Dauert ein GET länger als `delay_s`, geht eine zweite Anfrage raus; die schnellere gewinnt."""
+    delay_s: float = 0.1
+    max_hedges: int = 1
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_in_s: float, state: str = "open"):
+        self.retry_in_s = retry_in_s
+        self.state = state
+        super().__init__(f"circuit for {name} is {state}, retry in {retry_in_s:.1f}s")
+
+
+class CircuitBreaker:
+    """closed -> (failure_threshold Fehler in Folge) -> open -> (reset_timeout_s) -> half-open.
+
+    Im half-open-Zustand darf genau ein Probe-Request durch; klappt er, ist der Kreis wieder zu.
+    Wird die Probe abgebrochen (Cancel, Timeout des Aufrufers), gibt `release` den Platz frei.
+    """
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+    STATE_NAMES = {CLOSED: "closed", HALF_OPEN: "half-open", OPEN: "open"}
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 5.0, *,
+                 name: str = "bridge", metrics: Optional[MetricsSink] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.name = name
+        self.metrics = metrics
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout_s - time.monotonic()
+                if remaining > 0:
+                    self._reject(remaining)
+                self._set_state(self.HALF_OPEN)
+            if self._probing:
+                self._reject(self.reset_timeout_s)
+            self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def release(self):
+        """Request endete ohne Ergebnis: Probe-Platz freigeben, Zustand unverändert."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self.state != self.OPEN:
+                    self._set_state(self.OPEN)
+
+    def _reject(self, retry_in_s: float):
+        self.rejected += 1
+        if self.metrics is not None:
+            self.metrics.inc(CIRCUIT_REJECTED, labels={"bridge": self.name})
+        raise CircuitOpenError(self.name, retry_in_s, self.STATE_NAMES[self.state])
+
+    def _set_state(self, state: int):
+        self.state = state
+        if self.metrics is not None:
+            self.metrics.set_gauge(CIRCUIT_STATE, state, {"bridge": self.name})
@@ -1,27 +1,42 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
+class HueCommand(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    def to_payload(self) -> dict:
+        # Feldnamen wie von der CLIP v2 API erwartet (z.B. "on", "duration")
+        return self.model_dump(by_alias=True, exclude_none=True)
+
+    def to_json(self) -> bytes:
+        # Direkt über den (pro Klasse gecachten) pydantic-core Serializer, ohne Umweg über dict
+        return self.__pydantic_serializer__.to_json(self, by_alias=True, exclude_none=True)
+
 class OnModel(BaseModel):
-    is_on: bool
+    model_config = ConfigDict(populate_by_name=True)
 
-class OnCommand(BaseModel):
+    is_on: bool = Field(..., alias="on")
+
+class OnCommand(HueCommand):
     on: OnModel
 
 class DynamicsModel(BaseModel):
-    duration_ms: Optional[int] = Field(..., ge=0)
-    speed: Optional[float] = Field(..., ge=0.0, le=1.0)
+    model_config = ConfigDict(populate_by_name=True)
+
+    duration_ms: Optional[int] = Field(None, ge=0, alias="duration")
+    speed: Optional[float] = Field(None, ge=0.0, le=1.0)
 
 class DimmingModel(BaseModel):
     brightness: float = Field(..., ge=0.0, le=100.0)
 
-class DimmingCommand(BaseModel):
+class DimmingCommand(HueCommand):
     dimming: DimmingModel
     dynamics: Optional[DynamicsModel] = None
 
 class ColorTemperatureModel(BaseModel):
     mirek: int = Field(..., ge=153, le=500)
 
-class ColorTemperatureCommand(BaseModel):
+class ColorTemperatureCommand(HueCommand):
     color_temperature: ColorTemperatureModel
     dynamics: Optional[DynamicsModel] = None
 
@@ -35,7 +50,25 @@ class ColorModel(BaseModel):
     xy: XYModel
 
 # Das "äußere" Päckchen
-class ColorCommand(BaseModel):
+class ColorCommand(HueCommand):
     color: ColorModel
     dynamics: Optional[DynamicsModel] = None
 
+
+def _dynamics(duration_ms: Optional[int]) -> Optional[DynamicsModel]:
+    return DynamicsModel(duration_ms=duration_ms) if duration_ms is not None else None
+
+def on_command(is_on: bool) -> OnCommand:
+    return OnCommand(on=OnModel(is_on=is_on))
+
+def dimming_command(level: float, duration_ms: Optional[int] = None) -> DimmingCommand:
+    level = max(0.0, min(float(level), 100.0))
+    return DimmingCommand(dimming=DimmingModel(brightness=level), dynamics=_dynamics(duration_ms))
+
+def color_command(xy: tuple[float, float], duration_ms: Optional[int] = None) -> ColorCommand:
+    x, y = xy
+    return ColorCommand(color=ColorModel(xy=XYModel(x=x, y=y)), dynamics=_dynamics(duration_ms))
+
+def color_temperature_command(mirek: int, duration_ms: Optional[int] = None) -> ColorTemperatureCommand:
+    return ColorTemperatureCommand(color_temperature=ColorTemperatureModel(mirek=mirek),
+                                   dynamics=_dynamics(duration_ms))
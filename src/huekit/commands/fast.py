@@ -0,0 +1,65 @@
+"""Schneller Pfad für interne, vertrauenswürdige Aufrufer (Effekt-Schleifen, Streaming-Fallback).
+
+Es wird nichts validiert: Werte müssen bereits im gültigen Bereich liegen. Öffentliche Aufrufe
+laufen weiter über die pydantic-Modelle in commands/base.py.
+"""
+from typing import Callable, Optional
+
+# Form = welche Felder gesetzt sind: (on, brightness, xy, mirek, duration)
+Shape = tuple[bool, bool, bool, bool, bool]
+
+_SERIALIZERS: dict[Shape, Callable[..., bytes]] = {}
+
+
+def _compile(shape: Shape) -> Callable[..., bytes]:
+    has_on, has_bri, has_xy, has_mirek, has_duration = shape
+    parts, args = [], []
+    if has_on:
+        parts.append('"on":{"on":%s}')
+        args.append("'true' if on else 'false'")
+    if has_bri:
+        parts.append('"dimming":{"brightness":%r}')
+        args.append("float(brightness)")
+    if has_xy:
+        parts.append('"color":{"xy":{"x":%r,"y":%r}}')
+        args.append("float(xy[0]), float(xy[1])")
+    if has_mirek:
+        parts.append('"color_temperature":{"mirek":%d}')
+        args.append("mirek")
+    if has_duration:
+        parts.append('"dynamics":{"duration":%d}')
+        args.append("duration_ms")
+    template = "{" + ",".join(parts) + "}"
+    src = (f"def serialize(on, brightness, xy, mirek, duration_ms):\n"
+           f"    return ({template!r} % ({', '.join(args)},)).encode()\n")
+    namespace: dict = {}
+    exec(src, namespace)
+    return namespace["serialize"]
+
+
+def encode_state(*, on: Optional[bool] = None,
+                 brightness: Optional[float] = None,
+                 xy: Optional[tuple[float, float]] = None,
+                 mirek: Optional[int] = None,
+                 duration_ms: Optional[int] = None) -> bytes:
+    """Baut den JSON-Body eines PUTs direkt als bytes; ein kompilierter Serializer pro Form."""
+    shape = (on is not None, brightness is not None, xy is not None, mirek is not None, duration_ms is not None)
+    if not any(shape):
+        raise ValueError("encode_state: no fields set")
+    serializer = _SERIALIZERS.get(shape)
+    if serializer is None:
+        serializer = _SERIALIZERS[shape] = _compile(shape)
+    return serializer(on, brightness, xy, mirek, duration_ms)
+
+
+def on_body(is_on: bool) -> bytes:
+    return b'{"on":{"on":true}}' if is_on else b'{"on":{"on":false}}'
+
+def dimming_body(brightness: float, duration_ms: Optional[int] = None) -> bytes:
+    return encode_state(brightness=brightness, duration_ms=duration_ms)
+
+def color_body(xy: tuple[float, float], duration_ms: Optional[int] = None) -> bytes:
+    return encode_state(xy=xy, duration_ms=duration_ms)
+
+def color_temperature_body(mirek: int, duration_ms: Optional[int] = None) -> bytes:
+    return encode_state(mirek=mirek, duration_ms=duration_ms)
@@ -0,0 +1,239 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from huekit.api.hue_api import HueApi
+from huekit.commands.fast import encode_state
+from huekit.effects.keyframes import Effect, Keyframe
+
+log = logging.getLogger(__name__)
+
+Target = tuple[str, str]  # (rtype, rid)
+# Wartender Keyframe: (keyframe, Zeitpunkt des nächsten Keyframes, letzter Keyframe des Effekts)
+Deferred = tuple[Keyframe, float, bool]
+
+
+def _body(keyframe: Keyframe, transition_s: float) -> bytes:
+    return encode_state(on=keyframe.on, brightness=keyframe.brightness, xy=keyframe.xy,
+                        mirek=keyframe.mirek, duration_ms=max(0, int(transition_s * 1000)))
+
+
+class EffectHandle:
+    """Ein laufender Effekt auf einem Ziel. `wait()` blockiert bis Ende oder Abbruch."""
+
+    def __init__(self, engine: "EffectEngine", target: Target, effect: Effect, start: float):
+        self.engine = engine
+        self.target = target
+        self.effect = effect
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.cancelled = False
+        self.done = threading.Event()
+        # Fortschritt: Keyframe-Index + Beginn des aktuellen Zyklus (absolut -> kein Drift)
+        self._offsets = effect.offsets
+        self._index = 0
+        self._cycle = 0
+        self._cycle_start = start
+        self._busy = False
+        self._deferred: Optional[Deferred] = None
+        self._ending = False  # letzter Keyframe ist raus, es läuft nur noch dessen Überblendung
+
+    def cancel(self):
+        self.engine.cancel(self)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+    @property
+    def keyframe(self) -> Keyframe:
+        return self.effect.keyframes[self._index]
+
+    def _due(self) -> float:
+        return self._cycle_start + self._offsets[self._index]
+
+    def _next_due(self) -> float:
+        return self._due() + self.keyframe.hold_s
+
+    def _advance(self) -> bool:
+        """Springt zum nächsten Keyframe; False, wenn der Effekt damit durch ist."""
+        self._index += 1
+        if self._index == len(self._offsets):
+            self._index = 0
+            self._cycle += 1
+            self._cycle_start += self.effect.cycle_s
+            if self.effect.repeats is not None and self._cycle >= self.effect.repeats:
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        return (f"EffectHandle({self.effect.name!r}, {self.target[0]}/{self.target[1]}, "
+                f"sent={self.sent}, dropped={self.dropped})")
+
+
+class EffectEngine:
+    """Spielt beliebig viele Effekte gleichzeitig auf einem gemeinsamen Scheduler-Thread ab.
+
+    Pro Keyframe geht genau ein PUT mit `dynamics.duration` raus, die Zwischenwerte interpoliert
+    die Bridge. Ist ein Ziel noch mit dem vorigen Request beschäftigt oder der Scheduler zu spät
+    dran, wird der Keyframe verworfen statt nachgeholt - der Effekt bleibt so im Takt.
+    """
+
+    def __init__(self, api: HueApi, *, max_in_flight: int = 4):
+        self.api = api
+        self._heap: list[tuple[float, int, EffectHandle]] = []
+        self._active: dict[Target, EffectHandle] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self.max_in_flight = max_in_flight
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    # ---- Effekte
+    def play(self, rtype: str, rid: str, effect: Effect, *, delay_s: float = 0.0) -> EffectHandle:
+        """Startet `effect` auf dem Ziel; ein dort bereits laufender Effekt wird ersetzt."""
+        target = (rtype, rid)
+        handle = EffectHandle(self, target, effect, time.perf_counter() + delay_s)
+        with self._cond:
+            previous = self._active.get(target)
+            if previous is not None:
+                self._finish(previous, cancelled=True)
+            self._active[target] = handle
+            heapq.heappush(self._heap, (handle._due(), next(self._seq), handle))
+            self._cond.notify()
+        return handle
+
+    def play_group(self, group_id: str, effect: Effect, **kwargs) -> EffectHandle:
+        return self.play("grouped_light", group_id, effect, **kwargs)
+
+    def play_light(self, light_id: str, effect: Effect, **kwargs) -> EffectHandle:
+        return self.play("light", light_id, effect, **kwargs)
+
+    def cancel(self, handle: EffectHandle):
+        with self._cond:
+            self._finish(handle, cancelled=True)
+
+    def cancel_all(self):
+        with self._cond:
+            for handle in list(self._active.values()):
+                self._finish(handle, cancelled=True)
+
+    @property
+    def active(self) -> list[EffectHandle]:
+        with self._cond:
+            return list(self._active.values())
+
+    # ---- Lifecycle
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = False
+        self._pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="hue-effect")
+        self._thread = threading.Thread(target=self._run, name="hue-effects", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self.cancel_all()
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> "EffectEngine":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- Scheduler
+    def _finish(self, handle: EffectHandle, cancelled: bool = False):
+        # Aufrufer hält self._cond; der Heap-Eintrag verfällt beim nächsten Pop
+        handle.cancelled = handle.cancelled or cancelled
+        if self._active.get(handle.target) is handle:
+            del self._active[handle.target]
+        handle.done.set()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.perf_counter()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+                _, _, handle = heapq.heappop(self._heap)
+                if handle.done.is_set():
+                    continue
+                self._fire(handle, time.perf_counter())
+                if not handle.done.is_set():
+                    heapq.heappush(self._heap, (handle._due(), next(self._seq), handle))
+
+    def _fire(self, handle: EffectHandle, now: float):
+        if handle._ending:
+            self._finish(handle)
+            return
+        # Verpasste Keyframes überspringen: nur der jüngste, dessen Startzeit vorbei ist, zählt
+        while handle._next_due() <= now:
+            handle.dropped += 1
+            if not handle._advance():
+                self._finish(handle)
+                return
+        keyframe = handle.keyframe
+        end = handle._next_due()
+        busy = handle._busy
+        if not busy:
+            # Überblendzeit um die Verspätung kürzen, damit der Zielwert pünktlich erreicht wird
+            handle._busy = True
+            self._pool.submit(self._send, handle, _body(keyframe, min(keyframe.transition, end - now)))
+        # Nach dem letzten Keyframe zeigt _due() auf das Ende des Zyklus -> dort abschließen
+        handle._ending = not handle._advance()
+        if busy:
+            # Voriger PUT für dieses Ziel läuft noch (Bridge/Rate-Limit langsamer als der Effekt):
+            # nur der jüngste Keyframe wartet, ältere wartende werden verworfen. Die Überblendzeit
+            # wird erst beim Senden berechnet (siehe _send).
+            if handle._deferred is not None:
+                handle.dropped += 1
+            handle._deferred = (keyframe, end, handle._ending)
+
+    def _send(self, handle: EffectHandle, body: Optional[bytes]):
+        rtype, rid = handle.target
+        while body is not None:
+            try:
+                self.api.put_resource(rtype, rid, body)
+                ok = True
+            except Exception as e:
+                ok = False
+                log.warning("effect %r on %s/%s failed: %s", handle.effect.name, rtype, rid, e)
+            with self._cond:
+                if ok:
+                    handle.sent += 1
+                else:
+                    handle.failed += 1
+                deferred, handle._deferred = handle._deferred, None
+                body = None
+                if deferred is not None and not handle.cancelled:
+                    keyframe, end, final = deferred
+                    left = end - time.perf_counter()
+                    if left > 0 or final:
+                        # Nur die Restzeit bis zum nächsten Keyframe überblenden; der letzte
+                        # Keyframe geht auch verspätet noch raus, damit der Endzustand stimmt
+                        body = _body(keyframe, min(keyframe.transition, max(0.0, left)))
+                    else:
+                        handle.dropped += 1
+                handle._busy = body is not None
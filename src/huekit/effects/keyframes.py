@@ -0,0 +1,121 @@
+"""Effekte als Keyframe-Folgen.
+
+Statt jeden Zwischenwert zu senden, wird pro Keyframe ein PUT mit `dynamics.duration` geschickt -
+die Bridge interpoliert selbst bis zum Zielwert. Ein Atmen-Effekt braucht so zwei Requests pro
+Periode statt 10-20.
+"""
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Optional
+
+import numpy as np
+
+from huekit.utils.color import hsv_to_xyb, mirek_to_xy
+
+
+@dataclass(frozen=True)
+class Keyframe:
+    hold_s: float                              # Abstand bis zum nächsten Keyframe
+    brightness: Optional[float] = None
+    xy: Optional[tuple[float, float]] = None
+    mirek: Optional[int] = None
+    on: Optional[bool] = None
+    transition_s: Optional[float] = None       # None = über die ganze hold_s-Zeit überblenden
+
+    def __post_init__(self):
+        if self.hold_s <= 0:
+            raise ValueError(f"'hold_s' must be > 0, got {self.hold_s}")
+        if self.xy is not None and self.mirek is not None:
+            raise ValueError("a keyframe can set either 'xy' or 'mirek', not both")
+
+    @property
+    def transition(self) -> float:
+        return self.hold_s if self.transition_s is None else min(self.transition_s, self.hold_s)
+
+
+@dataclass(frozen=True)
+class Effect:
+    name: str
+    keyframes: tuple[Keyframe, ...]
+    repeats: Optional[int] = None              # None = endlos
+
+    def __post_init__(self):
+        if not self.keyframes:
+            raise ValueError("an effect needs at least one keyframe")
+        if self.repeats is not None and self.repeats < 1:
+            raise ValueError(f"'repeats' must be >= 1, got {self.repeats}")
+
+    @property
+    def offsets(self) -> tuple[float, ...]:
+        """Startzeit jedes Keyframes relativ zum Zyklusbeginn."""
+        return (0.0, *accumulate(kf.hold_s for kf in self.keyframes[:-1]))
+
+    @property
+    def cycle_s(self) -> float:
+        return sum(kf.hold_s for kf in self.keyframes)
+
+    @property
+    def requests_per_s(self) -> float:
+        return len(self.keyframes) / self.cycle_s
+
+
+def pulse(period_s: float = 1.0, low: float = 10.0, high: float = 100.0, *,
+          ramp_s: float = 0.1, repeats: Optional[int] = None) -> Effect:
+    """Hartes Pulsieren zwischen zwei Helligkeiten mit kurzer Rampe (Nachfolger von pulse_brightness)."""
+    half = period_s / 2
+    return Effect("pulse", (
+        Keyframe(half, brightness=high, on=True, transition_s=ramp_s),
+        Keyframe(half, brightness=low, transition_s=ramp_s),
+    ), repeats)
+
+
+def breathe(period_s: float = 4.0, low: float = 5.0, high: float = 100.0, *,
+            repeats: Optional[int] = None) -> Effect:
+    """Weiches Auf- und Abblenden; die Bridge interpoliert über die halbe Periode."""
+    half = period_s / 2
+    return Effect("breathe", (
+        Keyframe(half, brightness=high, on=True),
+        Keyframe(half, brightness=low),
+    ), repeats)
+
+
+def color_loop(period_s: float = 30.0, *, steps: int = 6, saturation: float = 1.0,
+               brightness: Optional[float] = None, gamut: Optional[str] = None,
+               repeats: Optional[int] = None) -> Effect:
+    """Läuft einmal pro Periode durch den Farbkreis; `steps` Stützstellen reichen für weiche Übergänge."""
+    if steps < 3:
+        raise ValueError(f"'steps' must be >= 3, got {steps}")
+    hsv = np.stack([np.arange(steps) / steps, np.full(steps, saturation), np.ones(steps)], axis=-1)
+    xyb = hsv_to_xyb(hsv, gamut)
+    hold = period_s / steps
+    return Effect("color_loop", tuple(
+        Keyframe(hold, xy=(float(x), float(y)), brightness=brightness, on=True if i == 0 else None)
+        for i, (x, y, _) in enumerate(xyb)
+    ), repeats)
+
+
+def strobe(rate_hz: float = 2.0, *, brightness: float = 100.0, repeats: Optional[int] = None) -> Effect:
+    """An/Aus ohne Überblendung. Mehr als ~5 Hz schafft die Bridge pro Lampe nicht zuverlässig."""
+    half = 1.0 / rate_hz / 2
+    return Effect("strobe", (
+        Keyframe(half, on=True, brightness=brightness, transition_s=0.0),
+        Keyframe(half, on=False, transition_s=0.0),
+    ), repeats)
+
+
+def sunrise(duration_s: float = 900.0, *, end_mirek: int = 250, steps: int = 6) -> Effect:
+    """Einmaliger Sonnenaufgang: tiefrot und dunkel -> warmweiß -> neutralweiß bei voller Helligkeit."""
+    if steps < 2:
+        raise ValueError(f"'steps' must be >= 2, got {steps}")
+    # Erst rot/orange (unterhalb der Planck-Kurve), dann entlang der Farbtemperatur bis end_mirek
+    reds = [(0.675, 0.322), (0.600, 0.380)][:max(steps - 1, 1)]
+    whites = [(float(x), float(y)) for x, y in mirek_to_xy(np.linspace(end_mirek, 500, steps - len(reds))[::-1])]
+    points = reds + whites
+    hold = duration_s / (steps - 1)
+    # Startzustand sofort setzen, danach überblendet die Bridge jeweils bis zum nächsten Punkt
+    frames = [Keyframe(min(1.0, hold), xy=points[0], brightness=1.0, on=True, transition_s=0.0)]
+    for i in range(1, steps):
+        # Helligkeit wächst wie die empfundene Helligkeit (quadratisch), nicht linear
+        bri = max(1.0, 100.0 * (i / (steps - 1)) ** 2)
+        frames.append(Keyframe(hold, xy=points[i], brightness=round(bri, 1)))
+    return Effect("sunrise", tuple(frames), repeats=1)
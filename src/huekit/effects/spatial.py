@@ -0,0 +1,203 @@
+"""Räumliche Effekte über die Kanalpositionen einer Entertainment-Area.
+
+Ein Effekt bildet (t, positions) auf x, y, Helligkeit pro Kanal ab - als NumPy-Ausdruck über alle
+Kanäle zugleich, ohne Python-Schleife pro Lampe. Damit kostet eine Area mit hunderten
+Gradient-Segmenten kaum mehr als eine mit vier Lampen. `t` darf auch ein Array von Zeitpunkten
+sein; das Ergebnis hat dann die Form (Zeitpunkte, Kanäle, 3).
+
+Ausgabe wahlweise über den Streaming-Pfad (`stream_source` als Quelle für EntertainmentStream)
+oder über REST (`rest_items` -> BatchItems für HueApi.apply_many bzw. den Dispatcher).
+"""
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from huekit.api.batch import BatchItem
+from huekit.models.entertainment import EntertainmentConfiguration
+from huekit.repo.hue_repository import HueRepository
+
+XY = tuple[float, float]
+Vector = tuple[float, float, float]
+Time = Union[float, np.ndarray]
+
+WHITE: XY = (0.3127, 0.3290)   # D65
+# REST: mehr Punkte nimmt das gradient-Feld der Bridge nicht an
+MAX_GRADIENT_POINTS = 5
+
+
+def _unit(v: Vector) -> np.ndarray:
+    v = np.asarray(v, dtype=np.float64)
+    norm = np.linalg.norm(v)
+    if norm == 0:
+        raise ValueError("direction must not be the zero vector")
+    return v / norm
+
+
+def _xyb(xy: XY, brightness: float) -> np.ndarray:
+    return np.array([xy[0], xy[1], brightness], dtype=np.float64)
+
+
+def _blend(weight: np.ndarray, fg: np.ndarray, bg: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    # bg + w * (fg - bg), für beliebige Form von weight -> (..., 3)
+    result = np.multiply(weight[..., None], fg - bg, out=out)
+    result += bg
+    return result
+
+
+def _phase(t: Time, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Zeitpunkte gegen Kanäle aufspannen: t skalar -> (), t (T,) -> (T, 1)
+    t = np.asarray(t, dtype=np.float64)
+    return (t[..., None] if t.ndim else t), np.asarray(positions, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class LinearSweep:
+    """Ein Lichtband wandert entlang `direction` durch den Raum und beginnt danach von vorn."""
+    direction: Vector = (1.0, 0.0, 0.0)
+    speed: float = 0.5                  # Einheiten/s; die Area ist 2 Einheiten breit
+    width: float = 0.35                 # Halbwertsbreite des Bandes
+    color: XY = (0.17, 0.7)
+    brightness: float = 1.0
+    background: XY = WHITE
+    background_brightness: float = 0.0
+
+    def __call__(self, t: Time, positions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        t, positions = _phase(t, positions)
+        along = positions @ _unit(self.direction)
+        # Band läuft von -reach bis +reach, damit es vollständig aus- und wieder einläuft
+        reach = math.sqrt(3) + 2 * self.width
+        center = (self.speed * t) % (2 * reach) - reach
+        distance = (along - center) / self.width
+        weight = np.exp2(-distance * distance)
+        return _blend(weight, _xyb(self.color, self.brightness),
+                      _xyb(self.background, self.background_brightness), out)
+
+
+@dataclass(frozen=True)
+class RadialWave:
+    """Konzentrische Wellen, die sich von `center` aus ausbreiten."""
+    center: Vector = (0.0, 0.0, 0.0)
+    wavelength: float = 1.0
+    speed: float = 0.5
+    color: XY = (0.15, 0.06)
+    brightness: float = 1.0
+    background: XY = WHITE
+    background_brightness: float = 0.05
+
+    def __call__(self, t: Time, positions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        t, positions = _phase(t, positions)
+        radius = np.linalg.norm(positions - np.asarray(self.center, dtype=np.float64), axis=-1)
+        weight = 0.5 + 0.5 * np.cos((2 * math.pi / self.wavelength) * (radius - self.speed * t))
+        return _blend(weight, _xyb(self.color, self.brightness),
+                      _xyb(self.background, self.background_brightness), out)
+
+
+@dataclass(frozen=True)
+class Gradient:
+    """Farbverlauf entlang `axis` aus (Position, xy, Helligkeit)-Stützstellen.
+
+    Mit `scroll` != 0 wandert der Verlauf mit dieser Geschwindigkeit und wiederholt sich über
+    die Spanne der Stützstellen.
+    """
+    stops: tuple[tuple[float, XY, float], ...]
+    axis: Vector = (1.0, 0.0, 0.0)
+    scroll: float = 0.0
+
+    def __post_init__(self):
+        if len(self.stops) < 2:
+            raise ValueError("a gradient needs at least two stops")
+        if any(a[0] >= b[0] for a, b in zip(self.stops, self.stops[1:])):
+            raise ValueError("gradient stops must be sorted by strictly increasing position")
+
+    def __call__(self, t: Time, positions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        t, positions = _phase(t, positions)
+        where = np.array([s[0] for s in self.stops])
+        values = np.array([_xyb(xy, bri) for _, xy, bri in self.stops])
+        along = positions @ _unit(self.axis)
+        if self.scroll:
+            lo, span = where[0], where[-1] - where[0]
+            along = (along - self.scroll * t - lo) % span + lo
+        else:
+            along = np.broadcast_to(along, np.broadcast_shapes(along.shape, np.shape(t)))
+        result = out if out is not None else np.empty(along.shape + (3,))
+        for k in range(3):
+            result[..., k] = np.interp(along, where, values[:, k])
+        return result
+
+
+SpatialEffect = Callable[..., np.ndarray]   # (t, positions, out=None) -> (..., Kanäle, 3)
+
+
+def rainbow(axis: Vector = (1.0, 0.0, 0.0), *, scroll: float = 0.25, brightness: float = 1.0) -> Gradient:
+    """Regenbogen-Verlauf quer durch den Raum (Stützstellen im Gamut C)."""
+    colors = [(0.6915, 0.3083), (0.5, 0.44), (0.17, 0.7), (0.16, 0.3), (0.1532, 0.0475), (0.38, 0.16),
+              (0.6915, 0.3083)]
+    where = np.linspace(-1.0, 1.0, len(colors))
+    return Gradient(tuple((float(w), c, brightness) for w, c in zip(where, colors)), axis, scroll)
+
+
+# ---- Ausgabe: Streaming
+def stream_source(effect: SpatialEffect, positions: np.ndarray) -> Callable[[int, float], np.ndarray]:
+    """Frame-Quelle für EntertainmentStream; t zählt ab dem ersten Tick. Ein Puffer für alle Frames."""
+    positions = np.asarray(positions, dtype=np.float64)
+    buffer = np.empty((len(positions), 3))
+    start: list[float] = []
+
+    def source(index: int, due: float) -> np.ndarray:
+        if not start:
+            start.append(due)
+        effect(due - start[0], positions, out=buffer)
+        np.clip(buffer, 0.0, 1.0, out=buffer)
+        return buffer
+
+    return source
+
+
+# ---- Ausgabe: REST
+def light_resolver(repo: HueRepository) -> Callable[[str], Optional[str]]:
+    """entertainment-Service-ID -> ID der zugehörigen Lampe (über das gemeinsame Device)."""
+    def resolve(service_id: str) -> Optional[str]:
+        if repo.get("light", service_id) is not None:
+            return service_id
+        device = repo.topology.service_device(service_id)
+        if device is None:
+            return None
+        return next((rid for rtype, rid in repo.topology.device_services(device) if rtype == "light"), None)
+    return resolve
+
+
+def rest_items(config: EntertainmentConfiguration, values: np.ndarray,
+               light_of: Callable[[str], Optional[str]], *,
+               duration_ms: Optional[int] = None) -> list[BatchItem]:
+    """Ein PUT pro Lampe aus den Kanalwerten (x, y, Helligkeit 0..1).
+
+    Lampen mit mehreren Kanälen bzw. Segmenten (Gradient-Strips) bekommen ein `gradient` mit den
+    Segmentfarben in Member-Reihenfolge, die Helligkeit ist dann der Mittelwert der Segmente.
+    """
+    values = np.clip(np.asarray(values, dtype=np.float64), 0.0, 1.0)
+    segments: dict[str, list[tuple[int, int]]] = defaultdict(list)   # Lampe -> (Segment, Kanalzeile)
+    for row, channel in enumerate(config.channels):
+        for member in channel.members:
+            light_id = light_of(member.service.rid)
+            if light_id is not None:
+                segments[light_id].append((member.index, row))
+    dynamics = {"dynamics": {"duration": duration_ms}} if duration_ms is not None else {}
+    items: list[BatchItem] = []
+    for light_id, parts in segments.items():
+        rows = [row for _, row in sorted(parts)]
+        brightness = round(float(values[rows, 2].mean()) * 100.0, 2)
+        payload: dict = {"on": {"on": brightness > 0.0}, "dimming": {"brightness": brightness}}
+        if len(rows) == 1:
+            x, y = values[rows[0], :2]
+            payload["color"] = {"xy": {"x": round(float(x), 4), "y": round(float(y), 4)}}
+        else:
+            # Mehr Segmente als Gradient-Punkte: gleichmäßig ausdünnen
+            picks = np.linspace(0, len(rows) - 1, min(len(rows), MAX_GRADIENT_POINTS)).round().astype(int)
+            payload["gradient"] = {"points": [
+                {"color": {"xy": {"x": round(float(values[rows[i], 0]), 4), "y": round(float(values[rows[i], 1]), 4)}}}
+                for i in picks]}
+        items.append(("light", light_id, {**payload, **dynamics}))
+    return items
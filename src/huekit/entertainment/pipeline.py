@@ -0,0 +1,245 @@
+"""Ambilight-Pipeline: Video-Frames bzw. NumPy-Arrays -> Entertainment-Kanäle.
+
+    Quelle -> ChannelSampler -> ColorConverter -> Smoother -> EntertainmentStream
+
+Jede Stufe ist ein Generator über der vorherigen. Alle Zwischenergebnisse liegen in Puffern, die
+einmal beim ersten Frame angelegt und danach nur noch in-place überschrieben werden - eine Stufe
+liefert also bei jedem Schritt *dasselbe* Array-Objekt mit neuem Inhalt. Wer Werte aufheben will,
+muss kopieren.
+
+Kanalpositionen folgen dem Koordinatensystem der Bridge (x links/rechts, y hinten/vorne,
+z unten/oben, jeweils -1..1). Auf das Bild abgebildet werden x (Spalte) und die letzte Achse
+(Zeile, +1 = oben) - bei (n, 2)-Positionen also direkt die zweite Spalte.
+"""
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from huekit.models.entertainment import EntertainmentConfiguration
+from huekit.utils.color import ColorLUT
+
+Frame = np.ndarray  # (Höhe, Breite, 3) uint8 RGB
+
+
+def channel_positions(config: EntertainmentConfiguration) -> np.ndarray:
+    """(Kanäle, 3) x, y, z in der Reihenfolge von config.channel_ids."""
+    return np.array(config.positions, dtype=np.float64).reshape(len(config.channels), 3)
+
+
+# ---- Quellen
+def array_frames(frames: Iterable[np.ndarray], *, loop: bool = False) -> Iterator[Frame]:
+    """Frames aus einer Liste/einem (N, H, W, 3)-Array; mit `loop` endlos wiederholt."""
+    if not loop:
+        yield from frames
+        return
+    frames = frames if isinstance(frames, (list, tuple, np.ndarray)) else list(frames)
+    if len(frames) == 0:
+        return
+    while True:
+        yield from frames
+
+
+def video_frames(path: str, *, loop: bool = False) -> Iterator[Frame]:
+    """Frames einer Videodatei als RGB. Benötigt das optionale Paket `opencv-python`."""
+    try:
+        import cv2
+    except ImportError as e:
+        raise RuntimeError("video_frames requires 'opencv-python' (pip install opencv-python)") from e
+
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise RuntimeError(f"cannot open video '{path}'")
+    rgb: Optional[np.ndarray] = None
+    try:
+        while True:
+            ok, bgr = capture.read()
+            if not ok:
+                if loop and capture.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                    continue
+                return
+            if rgb is None or rgb.shape != bgr.shape:
+                rgb = np.empty_like(bgr)
+            yield cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+    finally:
+        capture.release()
+
+
+def video_fps(path: str) -> Optional[float]:
+    try:
+        import cv2
+    except ImportError:
+        return None
+    capture = cv2.VideoCapture(path)
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS)
+    finally:
+        capture.release()
+    return fps or None
+
+
+# ---- Stufen
+class ChannelSampler:
+    """Mittelt pro Kanal ein Raster aus samples x samples Pixeln rund um seine Bildposition.
+
+    Die Pixelindizes werden pro Bildgröße einmal vorberechnet; pro Frame bleibt ein np.take in einen
+    festen Puffer und ein Mittelwert in einen zweiten.
+    """
+
+    def __init__(self, positions: np.ndarray, *, radius: float = 0.15, samples: int = 8):
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.ndim != 2 or positions.shape[1] not in (2, 3):
+            raise ValueError(f"'positions' must have shape (channels, 2|3), got {positions.shape}")
+        self.positions = positions
+        self.radius = radius
+        self.samples = samples
+        self.rgb = np.zeros((len(positions), 3), dtype=np.float32)
+        self._shape: Optional[tuple[int, ...]] = None
+        self._index: Optional[np.ndarray] = None
+        self._picked: Optional[np.ndarray] = None
+
+    def _prepare(self, shape: tuple[int, ...]):
+        height, width = shape[:2]
+        col = (np.clip(self.positions[:, 0], -1, 1) + 1) / 2 * (width - 1)
+        row = (1 - np.clip(self.positions[:, -1], -1, 1)) / 2 * (height - 1)
+        offsets = np.linspace(-self.radius, self.radius, self.samples)
+        cols = np.clip(np.rint(col[:, None] + offsets * width), 0, width - 1).astype(np.intp)
+        rows = np.clip(np.rint(row[:, None] + offsets * height), 0, height - 1).astype(np.intp)
+        # (Kanäle, samples*samples) flache Pixelindizes
+        self._index = (rows[:, :, None] * width + cols[:, None, :]).reshape(len(self.positions), -1)
+        self._picked = np.empty(self._index.shape + (3,), dtype=np.uint8)
+        self._shape = shape
+
+    def sample(self, frame: Frame) -> np.ndarray:
+        if frame.shape != self._shape:
+            self._prepare(frame.shape)
+        pixels = np.ascontiguousarray(frame).reshape(-1, 3)
+        np.take(pixels, self._index, axis=0, out=self._picked)
+        np.mean(self._picked, axis=1, dtype=np.float32, out=self.rgb)
+        return self.rgb
+
+    def __call__(self, frames: Iterable[Frame]) -> Iterator[np.ndarray]:
+        for frame in frames:
+            yield self.sample(frame)
+
+
+class ColorConverter:
+    """RGB-Mittelwerte (0..255) -> x, y, Helligkeit über eine vorberechnete ColorLUT."""
+
+    def __init__(self, channels: int, *, gamut: Optional[str] = "C", lut: Optional[ColorLUT] = None):
+        self.lut = lut if lut is not None else ColorLUT(gamut)
+        self._rounded = np.empty((channels, 3), dtype=np.float32)
+        self._rgb8 = np.empty((channels, 3), dtype=np.uint8)
+        self.xyb = np.zeros((channels, 3), dtype=np.float32)
+
+    def convert(self, rgb: np.ndarray) -> np.ndarray:
+        np.rint(rgb, out=self._rounded)
+        np.copyto(self._rgb8, self._rounded, casting="unsafe")
+        return self.lut.lookup(self._rgb8, out=self.xyb)
+
+    def __call__(self, values: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        for rgb in values:
+            yield self.convert(rgb)
+
+
+class Smoother:
+    """Exponentielle Glättung über die Zeit, getrennt für Farbort und Helligkeit.
+
+    `alpha` 1.0 = keine Glättung; kleiner = ruhiger, aber träger. Helligkeit darf meist schneller
+    folgen als die Farbe (Schnitte im Video), daher ein eigener Faktor.
+    """
+
+    def __init__(self, channels: int, *, alpha: float = 0.35, brightness_alpha: Optional[float] = None):
+        for name, value in (("alpha", alpha), ("brightness_alpha", brightness_alpha)):
+            if value is not None and not 0 < value <= 1:
+                raise ValueError(f"'{name}' must be in (0, 1], got {value}")
+        self.alphas = np.array([alpha, alpha, brightness_alpha if brightness_alpha is not None else alpha],
+                               dtype=np.float32)
+        self.state = np.zeros((channels, 3), dtype=np.float32)
+        self._delta = np.empty((channels, 3), dtype=np.float32)
+        self._primed = False
+
+    def reset(self):
+        self._primed = False
+
+    def smooth(self, values: np.ndarray) -> np.ndarray:
+        if not self._primed:
+            np.copyto(self.state, values)
+            self._primed = True
+            return self.state
+        # state += alpha * (values - state)
+        np.subtract(values, self.state, out=self._delta)
+        np.multiply(self._delta, self.alphas, out=self._delta)
+        np.add(self.state, self._delta, out=self.state)
+        return self.state
+
+    def __call__(self, values: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        for v in values:
+            yield self.smooth(v)
+
+
+# ---- Zusammensetzen
+class FramePipeline:
+    """Verkettet Quelle und Stufen und liefert Kanalwerte (x, y, Helligkeit) als Frame-Quelle.
+
+    Als `source` an EntertainmentStream übergeben, zieht jeder Tick genau so viele Quell-Frames,
+    wie seit dem Start gemäß `source_fps` fällig sind (zu langsame Ticks überspringen Frames statt
+    hinterherzulaufen; ohne `source_fps` ein Frame pro Tick). Ist die Quelle erschöpft, bleibt der
+    letzte Wert stehen.
+    """
+
+    def __init__(self, frames: Iterable[Frame], positions: np.ndarray, *,
+                 source_fps: Optional[float] = None,
+                 gamut: Optional[str] = "C",
+                 alpha: float = 0.35,
+                 brightness_alpha: Optional[float] = None,
+                 radius: float = 0.15,
+                 samples: int = 8,
+                 lut: Optional[ColorLUT] = None):
+        self.sampler = ChannelSampler(positions, radius=radius, samples=samples)
+        channels = len(self.sampler.positions)
+        self.converter = ColorConverter(channels, gamut=gamut, lut=lut)
+        self.smoother = Smoother(channels, alpha=alpha, brightness_alpha=brightness_alpha)
+        self.source_fps = source_fps
+        self._frames = iter(frames)
+        self._stages = self.smoother(self.converter(self.sampler(self._frames)))
+        self.consumed = 0      # gezogene Quell-Frames, inkl. übersprungener
+        self.skipped = 0
+        self.exhausted = False
+        self._current = self.smoother.state
+        self._t0: Optional[float] = None
+
+    @classmethod
+    def for_config(cls, frames: Iterable[Frame], config: EntertainmentConfiguration, **kwargs) -> "FramePipeline":
+        """Pipeline mit den Kanalpositionen der Entertainment-Area."""
+        return cls(frames, channel_positions(config), **kwargs)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return self._stages
+
+    def _advance(self, count: int):
+        # Überzählige Frames nur dekodieren, nicht durch die Stufen schicken
+        for _ in range(count - 1):
+            if next(self._frames, None) is None:
+                self.exhausted = True
+                return
+            self.consumed += 1
+            self.skipped += 1
+        value = next(self._stages, None)
+        if value is None:
+            self.exhausted = True
+            return
+        self.consumed += 1
+        self._current = value
+
+    def __call__(self, index: int, due: float) -> np.ndarray:
+        if self.exhausted:
+            return self._current
+        if self.source_fps is None:
+            self._advance(1)
+            return self._current
+        if self._t0 is None:
+            self._t0 = due
+        wanted = int((due - self._t0) * self.source_fps) + 1
+        if wanted > self.consumed:
+            self._advance(wanted - self.consumed)
+        return self._current
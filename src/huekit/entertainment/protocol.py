@@ -0,0 +1,107 @@
+import struct
+from typing import Sequence
+
+import numpy as np
+
+# HueStream v2: https://developers.meethue.com -> Entertainment API
+PROTOCOL_NAME = b"HueStream"
+VERSION = (0x02, 0x00)
+COLOR_SPACE_RGB = 0x00
+COLOR_SPACE_XYB = 0x01
+MAX_CHANNELS = 20
+
+_HEADER = struct.Struct(">9sBBBHBB36s")  # Name, Version, Sequence, reserviert, Farbraum, reserviert, Config-ID
+HEADER_SIZE = _HEADER.size
+CHANNEL_SIZE = 7  # channel_id + 3x uint16
+_CHANNEL_DTYPE = np.dtype([("id", "u1"), ("a", ">u2"), ("b", ">u2"), ("c", ">u2")])  # gepackt, 7 Byte
+
+
+class HueStreamEncoder:
+    """Kodiert einen Frame für alle Kanäle in einen einmalig allozierten Puffer."""
+
+    def __init__(self, config_id: str, channel_ids: Sequence[int], color_space: int = COLOR_SPACE_XYB):
+        if len(config_id) != 36:
+            raise ValueError(f"'config_id' must be a 36 character UUID, got {config_id!r}")
+        if not 0 < len(channel_ids) <= MAX_CHANNELS:
+            raise ValueError(f"HueStream supports 1..{MAX_CHANNELS} channels, got {len(channel_ids)}")
+        self.config_id = config_id
+        self.channel_ids = list(channel_ids)
+        self.color_space = color_space
+        self.sequence = 0
+
+        n = len(self.channel_ids)
+        self.buffer = bytearray(HEADER_SIZE + n * CHANNEL_SIZE)
+        _HEADER.pack_into(self.buffer, 0, PROTOCOL_NAME, VERSION[0], VERSION[1], 0, 0, color_space, 0,
+                          config_id.encode("ascii"))
+        self._channels = struct.Struct(">" + "BHHH" * n)
+        # Argumentliste wird pro Frame nur an den Farbwert-Positionen überschrieben
+        self._args: list[int] = []
+        for cid in self.channel_ids:
+            self._args.extend((cid, 0, 0, 0))
+        self._view = memoryview(self.buffer)
+        # Strukturierte Sicht auf die Kanalblöcke im Puffer - für encode_array ohne struct.pack
+        self._records = np.frombuffer(self.buffer, dtype=_CHANNEL_DTYPE, count=n, offset=HEADER_SIZE)
+        self._records["id"] = self.channel_ids   # encode_array schreibt nur die Farbwerte
+        self._scaled = np.empty((n, 3), dtype=np.float64)
+
+    def encode(self, values: Sequence[Sequence[float]]) -> memoryview:
+        """values: pro Kanal drei Werte 0..1 (x, y, Helligkeit bzw. r, g, b)."""
+        args = self._args
+        for i, (a, b, c) in enumerate(values):
+            base = i * 4
+            args[base + 1] = _to_u16(a)
+            args[base + 2] = _to_u16(b)
+            args[base + 3] = _to_u16(c)
+        return self.encode_raw()
+
+    def encode_array(self, values: np.ndarray) -> memoryview:
+        """Wie encode(), aber vektorisiert für ein (Kanäle, 3)-Array - ohne Allokationen pro Frame.
+
+        Achtung: schreibt direkt in den Puffer; _args (encode_raw/set_channel) bleibt unberührt.
+        """
+        scaled = self._scaled
+        np.multiply(values, 0xFFFF, out=scaled)
+        np.clip(scaled, 0, 0xFFFF - 0.5, out=scaled)
+        # Wie _to_u16: kaufmännisch runden (rint rundet .5 auf die gerade Zahl)
+        np.add(scaled, 0.5, out=scaled)
+        np.floor(scaled, out=scaled)
+        records = self._records
+        records["a"] = scaled[:, 0]
+        records["b"] = scaled[:, 1]
+        records["c"] = scaled[:, 2]
+        self.sequence = (self.sequence + 1) & 0xFF
+        self.buffer[11] = self.sequence
+        return self._view
+
+    def encode_raw(self) -> memoryview:
+        """Schreibt die aktuellen Werte aus `_args` bzw. `set_channel` in den Puffer."""
+        self.sequence = (self.sequence + 1) & 0xFF
+        self.buffer[11] = self.sequence
+        self._channels.pack_into(self.buffer, HEADER_SIZE, *self._args)
+        return self._view
+
+    def set_channel(self, index: int, a: float, b: float, c: float):
+        base = index * 4
+        self._args[base + 1] = _to_u16(a)
+        self._args[base + 2] = _to_u16(b)
+        self._args[base + 3] = _to_u16(c)
+
+
+def _to_u16(v: float) -> int:
+    if v <= 0.0:
+        return 0
+    if v >= 1.0:
+        return 0xFFFF
+    return int(v * 0xFFFF + 0.5)
+
+
+def decode_frame(data: bytes) -> tuple[int, int, str, list[tuple[int, float, float, float]]]:
+    """Gegenstück zu encode() - z.B. für einen lokalen UDP-Stand-in der Bridge."""
+    name, _, _, sequence, _, color_space, _, config_id = _HEADER.unpack_from(data, 0)
+    if name != PROTOCOL_NAME:
+        raise ValueError("not a HueStream frame")
+    channels = []
+    for offset in range(HEADER_SIZE, len(data) - CHANNEL_SIZE + 1, CHANNEL_SIZE):
+        cid, a, b, c = struct.unpack_from(">BHHH", data, offset)
+        channels.append((cid, a / 0xFFFF, b / 0xFFFF, c / 0xFFFF))
+    return sequence, color_space, config_id.decode("ascii"), channels
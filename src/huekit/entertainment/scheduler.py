@@ -0,0 +1,121 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+log = logging.getLogger(__name__)
+
+# tick(frame_index, scheduled_time) - scheduled_time auf der perf_counter-Zeitachse
+TickFn = Callable[[int, float], None]
+ErrorFn = Callable[[BaseException], None]
+
+
+@dataclass
+class JitterStats:
+    frames: int = 0
+    dropped: int = 0
+    mean_lateness_s: float = 0.0
+    max_lateness_s: float = 0.0
+    _m2: float = 0.0
+
+    def record(self, lateness: float):
+        # Welford: laufender Mittelwert / Varianz ohne Historie
+        self.frames += 1
+        delta = lateness - self.mean_lateness_s
+        self.mean_lateness_s += delta / self.frames
+        self._m2 += delta * (lateness - self.mean_lateness_s)
+        self.max_lateness_s = max(self.max_lateness_s, lateness)
+
+    @property
+    def jitter_s(self) -> float:
+        return math.sqrt(self._m2 / self.frames) if self.frames > 1 else 0.0
+
+
+class FrameScheduler:
+    """Ruft `tick` mit fester Rate auf.
+
+    Die Sollzeiten werden absolut aus Startzeit + n * Periode berechnet, damit sich kein Drift
+    aufsummiert. Ist ein Frame um mehr als eine Periode zu spät, werden die verpassten Slots
+    verworfen statt nachgeholt.
+
+    Wirft `tick`, endet die Schleife: der Fehler landet in `error` und geht an `on_error`.
+    """
+
+    def __init__(self, tick: TickFn, rate_hz: float = 50.0, *, spin_s: float = 0.001,
+                 on_error: Optional[ErrorFn] = None):
+        if not 0 < rate_hz <= 120:
+            raise ValueError(f"'rate_hz' must be in (0, 120], got {rate_hz}")
+        self.tick = tick
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.spin_s = spin_s
+        self.on_error = on_error
+        self.stats = JitterStats()
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run_thread, name="hue-frame-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def _run_thread(self):
+        try:
+            self.run()
+        except Exception as e:
+            self.error = e
+            self._stop.set()
+            log.error("frame scheduler stopped after %d frames: %r", self.stats.frames, e)
+            if self.on_error is not None:
+                try:
+                    self.on_error(e)
+                except Exception:
+                    log.exception("frame scheduler on_error handler failed")
+
+    def run(self, max_frames: Optional[int] = None):
+        start = time.perf_counter()
+        index = 0
+        while not self._stop.is_set() and (max_frames is None or self.stats.frames < max_frames):
+            due = start + index * self.period
+            self._sleep_until(due)
+            if self._stop.is_set():
+                break
+            now = time.perf_counter()
+            lateness = now - due
+            if lateness > self.period:
+                missed = int(lateness // self.period)
+                self.stats.dropped += missed
+                index += missed
+                due = start + index * self.period
+                lateness = now - due
+            self.stats.record(lateness)
+            self.tick(index, due)
+            index += 1
+
+    def _sleep_until(self, due: float):
+        # Grob schlafen, die letzte Millisekunde aktiv warten (time.sleep ist zu ungenau)
+        while True:
+            remaining = due - time.perf_counter()
+            if remaining <= 0:
+                return
+            if remaining > self.spin_s:
+                if self._stop.wait(remaining - self.spin_s):
+                    return
+            else:
+                time.sleep(0)
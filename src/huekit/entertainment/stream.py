@@ -0,0 +1,109 @@
+import logging
+import threading
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+
+from huekit.api.hue_api import HueApi
+from huekit.entertainment.protocol import COLOR_SPACE_XYB, HueStreamEncoder
+from huekit.entertainment.scheduler import ErrorFn, FrameScheduler
+from huekit.entertainment.transport import FrameTransport
+from huekit.models.entertainment import EntertainmentConfiguration
+
+# source(frame_index, scheduled_time) -> pro Kanal (x, y, bri) bzw. (r, g, b), jeweils 0..1;
+# als (Kanäle, 3)-Array geht der Frame ohne Python-Schleife in den Puffer (z.B. FramePipeline)
+FrameSource = Callable[[int, float], Union[Sequence[Sequence[float]], np.ndarray]]
+
+log = logging.getLogger(__name__)
+
+SEND_ERROR_LOG_EVERY = 500
+
+
+class EntertainmentStream:
+    """Streamt eine Entertainment-Area mit fester Framerate - ein Paket pro Tick für alle Kanäle.
+
+    Sendefehler des Transports (OSError, z.B. ICMP "port unreachable") kosten nur den Frame, er
+    zählt als verworfen. Jeder andere Fehler im Tick - etwa aus `source` - beendet den Stream;
+    er steht danach in `error`, `running` ist False und `on_error` wird aufgerufen.
+    """
+
+    def __init__(self, api: HueApi, config: EntertainmentConfiguration, transport: FrameTransport, *,
+                 rate_hz: float = 50.0,
+                 color_space: int = COLOR_SPACE_XYB,
+                 source: Optional[FrameSource] = None,
+                 on_error: Optional[ErrorFn] = None):
+        self.api = api
+        self.config = config
+        self.transport = transport
+        self.source = source
+        self.encoder = HueStreamEncoder(config.id, config.channel_ids, color_space)
+        self.scheduler = FrameScheduler(self._tick, rate_hz, on_error=on_error)
+        self._index = {cid: i for i, cid in enumerate(config.channel_ids)}
+        self._lock = threading.Lock()
+        self.frames_sent = 0
+        self.send_errors = 0
+
+    @property
+    def stats(self):
+        return self.scheduler.stats
+
+    @property
+    def running(self) -> bool:
+        return self.scheduler.running
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self.scheduler.error
+
+    def set_channel(self, channel_id: int, a: float, b: float, c: float):
+        with self._lock:
+            self.encoder.set_channel(self._index[channel_id], a, b, c)
+
+    def set_all(self, a: float, b: float, c: float):
+        with self._lock:
+            for i in range(len(self._index)):
+                self.encoder.set_channel(i, a, b, c)
+
+    def start(self):
+        self.api.put_entertainment(self.config.id, {"action": "start"})
+        try:
+            self.transport.open()
+        except Exception:
+            self.api.put_entertainment(self.config.id, {"action": "stop"})
+            raise
+        self.scheduler.start()
+
+    def stop(self):
+        self.scheduler.stop()
+        try:
+            self.transport.close()
+        finally:
+            self.api.put_entertainment(self.config.id, {"action": "stop"})
+
+    def __enter__(self) -> "EntertainmentStream":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _tick(self, index: int, due: float):
+        with self._lock:
+            if self.source is not None:
+                values = self.source(index, due)
+                if isinstance(values, np.ndarray):
+                    frame = self.encoder.encode_array(values)
+                else:
+                    frame = self.encoder.encode(values)
+            else:
+                frame = self.encoder.encode_raw()
+            try:
+                self.transport.send(frame)
+            except OSError as e:
+                self.send_errors += 1
+                self.scheduler.stats.dropped += 1
+                # Bei 50 Hz nicht jeden Frame loggen
+                if self.send_errors == 1 or self.send_errors % SEND_ERROR_LOG_EVERY == 0:
+                    log.warning("entertainment frame %d not sent (%d failed so far): %s", index, self.send_errors, e)
+                return
+        self.frames_sent += 1
@@ -0,0 +1,82 @@
+import socket
+from typing import Optional, Protocol, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+ENTERTAINMENT_PORT = 2100
+
+
+class FrameTransport(Protocol):
+    def open(self): ...
+    def send(self, frame: Buffer): ...
+    def close(self): ...
+
+
+class UdpTransport:
+    """Unverschlüsseltes UDP - für lokale Stand-ins und Tests, die echte Bridge verlangt DTLS."""
+
+    def __init__(self, host: str, port: int = ENTERTAINMENT_PORT):
+        self.address = (host, port)
+        self._sock: Optional[socket.socket] = None
+
+    def open(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.connect(self.address)
+
+    def send(self, frame: Buffer):
+        self._sock.send(frame)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class DtlsTransport:
+    """DTLS 1.2 mit PSK (TLS_PSK_WITH_AES_128_GCM_SHA256), wie von der Bridge verlangt.
+
+    Benötigt das optionale Paket `python-mbedtls`.
+    """
+
+    def __init__(self, host: str, app_key: str, client_key: str, port: int = ENTERTAINMENT_PORT,
+                 handshake_timeout_s: float = 5.0):
+        self.address = (host, port)
+        self.identity = app_key
+        self.psk = bytes.fromhex(client_key)
+        self.handshake_timeout_s = handshake_timeout_s
+        self._sock = None
+
+    def open(self):
+        try:
+            from mbedtls import tls
+        except ImportError as e:
+            raise RuntimeError("DtlsTransport requires 'python-mbedtls' (pip install python-mbedtls)") from e
+
+        conf = tls.DTLSConfiguration(
+            pre_shared_key=(self.identity, self.psk),
+            ciphers=["TLS-PSK-WITH-AES-128-GCM-SHA256"],
+            lowest_supported_version=tls.DTLSVersion.DTLSv1_2,
+            highest_supported_version=tls.DTLSVersion.DTLSv1_2,
+            validate_certificates=False,
+            handshake_timeout_max=self.handshake_timeout_s,
+        )
+        raw = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock = tls.ClientContext(conf).wrap_socket(raw, server_hostname=None)
+        sock.connect(self.address)
+        while True:
+            try:
+                sock.do_handshake()
+                break
+            except tls.WantReadError:
+                continue
+        self._sock = sock
+
+    def send(self, frame: Buffer):
+        self._sock.send(frame)
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ResourceIdentifier(BaseModel):
+    rid: str
+    rtype: str
+
+class DeviceMetadata(BaseModel):
+    name: str
+    archetype: Optional[str] = None
+
+class DeviceModel(BaseModel):
+    id: str
+    metadata: DeviceMetadata
+    services: list[ResourceIdentifier] = []
+
+    def service_ids(self, rtype: str) -> list[str]:
+        return [s.rid for s in self.services if s.rtype == rtype]
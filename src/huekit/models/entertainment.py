@@ -0,0 +1,40 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from huekit.models.device import ResourceIdentifier
+
+
+class ChannelMember(BaseModel):
+    service: ResourceIdentifier
+    index: int = 0
+
+class ChannelPosition(BaseModel):
+    # Koordinaten der Bridge, jeweils -1..1: x links/rechts, y hinten/vorne, z unten/oben
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+
+class EntertainmentChannel(BaseModel):
+    channel_id: int
+    position: Optional[ChannelPosition] = None
+    members: list[ChannelMember] = []
+
+class EntertainmentMetadata(BaseModel):
+    name: str
+
+class EntertainmentConfiguration(BaseModel):
+    id: str
+    metadata: EntertainmentMetadata
+    configuration_type: Optional[str] = None  # "screen", "music", "3dspace", ...
+    status: Optional[str] = None              # "active" | "inactive"
+    channels: list[EntertainmentChannel] = []
+
+    @property
+    def channel_ids(self) -> list[int]:
+        return [c.channel_id for c in self.channels]
+
+    @property
+    def positions(self) -> list[tuple[float, float, float]]:
+        """(x, y, z) pro Kanal in Reihenfolge von channel_ids; ohne Position der Ursprung."""
+        return [(p.x, p.y, p.z) if (p := c.position) is not None else (0.0, 0.0, 0.0) for c in self.channels]
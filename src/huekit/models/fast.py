@@ -0,0 +1,140 @@
+"""Schneller, lazy Lesepfad für große List-Responses (hunderte Lampen/Devices).
+
+Statt jede Ressource komplett per pydantic zu validieren, wird pro Modell einmal eine View-Klasse
+mit `__slots__` generiert. Eine View hält nur das rohe dict; Felder werden erst beim ersten Zugriff
+gelesen, verschachtelte Modelle erst dann als View erzeugt und anschließend gecacht. Validiert wird
+nichts - wer ein vollständig geprüftes Modell braucht, holt es sich per `to_model()`.
+"""
+import types
+import typing
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel
+
+from huekit.models.device import DeviceModel, ResourceIdentifier
+from huekit.models.group import GroupModel
+from huekit.models.light import LightModel
+from huekit.models.room import RoomModel
+
+_VIEWS: dict[type[BaseModel], type] = {}
+_UNSET = object()  # Cache-Slot noch nicht befüllt (None ist ein gültiger Feldwert)
+
+
+def _unwrap(annotation: Any) -> tuple[str, Any]:
+    """Annotation -> ("model" | "models" | "value", Modellklasse bzw. None)."""
+    origin = typing.get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return _unwrap(args[0]) if len(args) == 1 else ("value", None)
+    if origin is list:
+        (item,) = typing.get_args(annotation) or (Any,)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return "models", item
+        return "value", None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return "model", annotation
+    return "value", None
+
+
+def _compile(model: type[BaseModel]) -> type:
+    slots: list[str] = []
+    lines: list[str] = []
+    namespace: dict[str, Any] = {"_Base": _ViewBase, "_UNSET": _UNSET}
+    for name, info in model.model_fields.items():
+        key = info.alias or name
+        kind, sub = _unwrap(info.annotation)
+        if info.is_required():
+            read = f"self._raw[{key!r}]"
+        else:
+            namespace[f"_d_{name}"] = info.get_default(call_default_factory=True)
+            read = f"self._raw.get({key!r}, _d_{name})"
+        # Properties ohne Setter: Views sind von außen unveränderlich
+        if kind == "value":
+            # Skalare: kein Cache nötig, ein dict-Zugriff ist schon am billigsten
+            lines.append(f"    @property\n    def {name}(self):\n        return {read}\n")
+            continue
+        slots.append(f"_c_{name}")
+        namespace[f"_V_{name}"] = view_class(sub)
+        build = f"_V_{name}(v)" if kind == "model" else f"tuple([_V_{name}(i) for i in v])"
+        lines.append(
+            f"    @property\n    def {name}(self):\n"
+            f"        v = self._c_{name}\n"
+            f"        if v is _UNSET:\n"
+            f"            v = {read}\n"
+            f"            v = self._c_{name} = None if v is None else {build}\n"
+            f"        return v\n")
+    init = "        self._raw = raw\n"
+    if slots:
+        init += "        self." + " = self.".join(slots) + " = _UNSET\n"
+    src = (f"class {model.__name__}View(_Base):\n"
+           f"    __slots__ = {tuple(slots)!r}\n"
+           f"    def __init__(self, raw):\n{init}"
+           + "".join(lines))
+    exec(src, namespace)
+    cls = namespace[f"{model.__name__}View"]
+    cls._model = model
+    # Eigene Hilfsmethoden der Modelle (z.B. DeviceModel.service_ids) funktionieren auch auf Views
+    for attr, value in vars(model).items():
+        if callable(value) and not attr.startswith("_") and attr not in model.model_fields:
+            setattr(cls, attr, value)
+    return cls
+
+
+class _ViewBase:
+    __slots__ = ("_raw",)
+    _model: type[BaseModel]
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and other._raw == self._raw
+
+    def __hash__(self):
+        return hash(self._raw.get("id")) if isinstance(self._raw, dict) else id(self)
+
+    def __repr__(self) -> str:
+        ident = self._raw.get("id") or self._raw.get("rid") or ""
+        return f"{type(self).__name__}({ident!r})"
+
+    @property
+    def raw(self) -> dict:
+        return self._raw
+
+    def to_model(self) -> BaseModel:
+        """Vollständig validiertes pydantic-Modell aus denselben Rohdaten."""
+        return self._model.model_validate(self._raw)
+
+
+def view_class(model: type[BaseModel]) -> type:
+    """Generierte View-Klasse für `model` (pro Modell nur einmal kompiliert)."""
+    cls = _VIEWS.get(model)
+    if cls is None:
+        cls = _VIEWS[model] = _compile(model)
+    return cls
+
+
+# Ressourcentyp -> Modell; room und zone teilen sich RoomModel
+MODELS: dict[str, type[BaseModel]] = {
+    "light": LightModel,
+    "device": DeviceModel,
+    "room": RoomModel,
+    "zone": RoomModel,
+    "grouped_light": GroupModel,
+}
+
+
+def decode_list(body: dict, model: Union[type[BaseModel], str]) -> list:
+    """`data` einer List-Response als lazy Views; `model` als Klasse oder Ressourcentyp."""
+    if isinstance(model, str):
+        model = MODELS[model]
+    view = view_class(model)
+    return [view(raw) for raw in body.get("data", [])]
+
+
+def decode_one(raw: Optional[dict], model: type[BaseModel]):
+    return view_class(model)(raw) if raw is not None else None
+
+
+ResourceIdentifierView = view_class(ResourceIdentifier)
+LightView = view_class(LightModel)
+DeviceView = view_class(DeviceModel)
+RoomView = view_class(RoomModel)
+GroupView = view_class(GroupModel)
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from huekit.commands.base import DimmingModel, OnModel
+from huekit.models.device import ResourceIdentifier
+
+
+class GroupModel(BaseModel):
+    # grouped_light: owner zeigt auf room, zone oder bridge_home
+    id: str
+    owner: ResourceIdentifier
+    on: Optional[OnModel] = None
+    dimming: Optional[DimmingModel] = None
@@ -1,13 +1,25 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
+from huekit.commands.base import ColorModel, DimmingModel, OnModel
+from huekit.models.device import ResourceIdentifier
+
+
 class LightMetadata(BaseModel):
     name: str
     archetype: str # z.B. "sultans_bulb"
 
+class LightColorTemperature(BaseModel):
+    # Im xy-Modus liefert die Bridge "mirek": null
+    mirek: Optional[int] = None
+    mirek_valid: bool = True
+
 class LightModel(BaseModel):
     id: str
+    owner: Optional[ResourceIdentifier] = None
     metadata: LightMetadata
     on: OnModel
-    dimming: DimmingModel
-    color_temperature: ColorTemperatureModel
-    color: ColorModel
+    dimming: Optional[DimmingModel] = None
+    color_temperature: Optional[LightColorTemperature] = None
+    color: Optional[ColorModel] = None
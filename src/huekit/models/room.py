@@ -0,0 +1,21 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from huekit.models.device import ResourceIdentifier
+
+
+class RoomMetadata(BaseModel):
+    name: str
+    archetype: Optional[str] = None
+
+class RoomModel(BaseModel):
+    # Gilt für "room" und "zone" - beide haben children + services
+    id: str
+    type: str = "room"
+    metadata: RoomMetadata
+    children: list[ResourceIdentifier] = []
+    services: list[ResourceIdentifier] = []
+
+    def child_ids(self, rtype: str) -> list[str]:
+        return [c.rid for c in self.children if c.rtype == rtype]
@@ -0,0 +1,91 @@
+"""Optionaler Festplatten-Cache der Bridge-Ressourcen für schnelle Starts.
+
+Pro Bridge-Adresse eine gzip-komprimierte JSON-Datei. Gültig ist sie nur für dieselbe Bridge
+(bridge_id) mit derselben Firmware (software_version) - nach einem Update kann sich das Schema
+der Ressourcen ändern.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from huekit.api.hue_api import HueApi
+
+log = logging.getLogger(__name__)
+
+CACHE_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class BridgeIdentity:
+    bridge_id: str
+    swversion: str
+
+
+@dataclass
+class CacheEntry:
+    identity: BridgeIdentity
+    resources: dict[str, dict[str, dict]]
+    saved_at: float
+
+    @property
+    def age_s(self) -> float:
+        return time.time() - self.saved_at
+
+
+def fetch_identity(api: HueApi) -> BridgeIdentity:
+    """bridge_id + Firmware-Stand; zwei kleine GETs statt aller Collections."""
+    bridge = api.list_resource("bridge")["data"][0]
+    device = api.get_device(bridge["owner"]["rid"])["data"][0]
+    return BridgeIdentity(bridge["bridge_id"], device.get("product_data", {}).get("software_version", ""))
+
+
+class TopologyCache:
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def path_for(self, base_url: str) -> Path:
+        digest = hashlib.sha1(base_url.rstrip("/").encode()).hexdigest()[:16]
+        return self.directory / f"hue-{digest}.json.gz"
+
+    def load(self, base_url: str) -> Optional[CacheEntry]:
+        path = self.path_for(base_url)
+        try:
+            with gzip.open(path, "rb") as f:
+                raw = json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            # EOFError: abgeschnittene gzip-Datei
+            log.warning("ignoring unreadable cache file %s: %s", path, e)
+            return None
+        if not isinstance(raw, dict) or raw.get("format") != CACHE_FORMAT:
+            return None
+        try:
+            return CacheEntry(BridgeIdentity(raw["bridge_id"], raw["swversion"]), raw["resources"], raw["saved_at"])
+        except KeyError as e:
+            log.warning("ignoring incomplete cache file %s: missing %s", path, e)
+            return None
+
+    def save(self, base_url: str, identity: BridgeIdentity, resources: dict[str, dict[str, dict]]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(base_url)
+        body = json.dumps({"format": CACHE_FORMAT, "bridge_id": identity.bridge_id,
+                           "swversion": identity.swversion, "saved_at": time.time(),
+                           "resources": resources}, separators=(",", ":")).encode()
+        # Erst in eine temporäre Datei, dann atomar ersetzen - ein Absturz hinterlässt nie halbe Dateien
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, "wb", compresslevel=6) as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+    def invalidate(self, base_url: str):
+        try:
+            self.path_for(base_url).unlink()
+        except FileNotFoundError:
+            pass
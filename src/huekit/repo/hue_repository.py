@@ -1,12 +1,253 @@
+import logging
+import threading
+from typing import Iterable, Optional
+
+from huekit.api.event_stream import EventStream
+from huekit.api.hue_api import HueApi
+from huekit.models.device import DeviceModel
+from huekit.models.light import LightModel
+from huekit.models.room import RoomModel
+from huekit.repo.cache import BridgeIdentity, TopologyCache, fetch_identity
+from huekit.repo.topology import TOPOLOGY_FIELDS, TopologyIndex
+from huekit.runtime.resolve import NAME_FIELDS, NameIndex, NameMatch
+
+log = logging.getLogger(__name__)
+
+RESOURCE_TYPES = ("light", "grouped_light", "room", "zone", "device", "entertainment_configuration")
+
+
+def _merge(target: dict, patch: dict):
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
 class HueRepository:
-    def __init__(self, api: HueApi):
+    """In-Memory-Spiegel aller Bridge-Ressourcen, aktuell gehalten über den Event-Stream."""
+
+    def __init__(self, api: HueApi, cache: Optional[TopologyCache] = None):
         self.api = api
+        self.cache = cache
+        self.identity: Optional[BridgeIdentity] = None
+        self.from_cache = False
+        self._resources: dict[str, dict[str, dict]] = {rtype: {} for rtype in RESOURCE_TYPES}
+        self.topology = TopologyIndex()
+        self.names = NameIndex()
+        self._lock = threading.RLock()
+        # Ein Sync zur Zeit - sonst tauschen sich zwei Syncs gegenseitig den Event-Puffer weg
+        self._sync_lock = threading.Lock()
+        self._stream: Optional[EventStream] = None
+        # Events, die während eines Resyncs eintreffen, werden danach nachgespielt
+        self._pending: Optional[list[dict]] = None
+        self.synced = threading.Event()
+        self.stream_connected = threading.Event()
+        # Letzter Sync lief, bevor der Event-Stream stand -> beim ersten Connect nachholen
+        self._synced_unconnected = False
+        self.resyncs = 0
+        self.events_applied = 0
+
+    # ---- Lifecycle
+    def sync(self):
+        """Lädt alle Collections komplett neu (Erstbefüllung bzw. Resync nach einer Lücke).
+
+        Gleichzeitige Aufrufe (Reconnect, Cache-Refresh, BridgePool.sync) laufen nacheinander.
+        """
+        with self._sync_lock:
+            self._sync()
+
+    def _sync(self):
+        with self._lock:
+            if self._pending is None:   # start() puffert ggf. schon seit dem Öffnen des Streams
+                self._pending = []
+            unconnected = not self.stream_connected.is_set()
+        try:
+            fresh = {rtype: {r["id"]: r for r in self.api.list_resource(rtype).get("data", [])}
+                     for rtype in RESOURCE_TYPES}
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        if self.cache is not None:
+            self._save_cache(fresh)
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._resources = fresh
+            self.topology.load(fresh)
+            self.names.load(fresh)
+            self._apply(pending)
+            self.resyncs += 1
+            self.from_cache = False
+            self._synced_unconnected = unconnected
+        self.synced.set()
+
+    def start(self, stream: Optional[EventStream] = None):
+        """Befüllt den Cache einmalig und hält ihn dann über /eventstream/clip/v2 aktuell.
+
+        Der Stream wird zuerst geöffnet und seine Events gepuffert, erst dann laufen die GETs - so
+        geht keine Änderung zwischen Abfrage und Verbindungsaufbau verloren. Steht der Stream nach
+        `connect_timeout` noch nicht, wird trotzdem geladen und beim ersten Connect neu synchronisiert.
+        Mit `cache` wird sofort aus der Datei bedient; Abgleich mit der Bridge läuft im Hintergrund.
+        """
+        cached = self.load_cached() if self.cache is not None else None
+        self.stream_connected.clear()
+        self._stream = stream or EventStream(self.api.http, self.apply_events, on_connect=self._on_connect)
+        if cached is None:
+            with self._lock:
+                self._pending = []
+        self._stream.start()
+        if cached is None:
+            self._await_stream()
+            self.sync()
+        else:
+            threading.Thread(target=self._refresh, args=(cached,), name="hue-cache-refresh", daemon=True).start()
+
+    def _await_stream(self):
+        if self._stream is None or self._stream.on_connect != self._on_connect:
+            return   # fremder Stream ohne unseren Connect-Hook
+        if not self.stream_connected.wait(getattr(self._stream, "connect_timeout", 5.0)):
+            log.warning("event stream not connected yet, loading anyway and resyncing on connect")
+
+    def load_cached(self) -> Optional[BridgeIdentity]:
+        """Übernimmt den Stand aus dem Festplatten-Cache; gibt dessen Schlüssel zurück (oder None)."""
+        entry = self.cache.load(self.api.http.base_url)
+        if entry is None:
+            return None
+        resources = {rtype: entry.resources.get(rtype, {}) for rtype in RESOURCE_TYPES}
+        with self._lock:
+            self._resources = resources
+            self.topology.load(resources)
+            self.names.load(resources)
+            self.from_cache = True
+        self.synced.set()
+        log.info("serving %s resources from cache (%.0fs old)", sum(map(len, resources.values())), entry.age_s)
+        return entry.identity
+
+    def _refresh(self, cached: BridgeIdentity):
+        try:
+            self.identity = fetch_identity(self.api)
+            if self.identity != cached:
+                # Andere Bridge unter derselben Adresse oder neue Firmware: nichts Altes mehr ausliefern
+                log.info("cache key changed (%s -> %s), discarding cached resources", cached, self.identity)
+                self.synced.clear()
+                with self._lock:
+                    self._resources = {rtype: {} for rtype in RESOURCE_TYPES}
+                    self.topology.load(self._resources)
+                    self.names.load(self._resources)
+            # Auch bei passendem Schlüssel: Änderungen aus der Zeit, in der wir nicht liefen, nachholen
+            self._await_stream()
+            self.sync()
+        except Exception as e:
+            log.warning("background refresh of cached resources failed: %s", e)
+
+    def _save_cache(self, resources: dict[str, dict[str, dict]]):
+        try:
+            if self.identity is None:
+                self.identity = fetch_identity(self.api)
+            self.cache.save(self.api.http.base_url, self.identity, resources)
+        except Exception as e:
+            log.warning("could not write resource cache: %s", e)
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+
+    def _on_connect(self, reconnected: bool):
+        self.stream_connected.set()
+        if reconnected:
+            log.info("event stream reconnected, resyncing")
+            self.sync()
+        elif self._synced_unconnected:
+            log.info("event stream connected after initial load, resyncing")
+            self.sync()
+
+    # ---- Event-Verarbeitung
+    def apply_events(self, events: list[dict]):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(events)
+                return
+            self._apply(events)
+
+    def _apply(self, events: list[dict]):
+        for event in events:
+            kind = event.get("type")
+            for res in event.get("data", []):
+                rtype, rid = res.get("type"), res.get("id")
+                bucket = self._resources.get(rtype)
+                if bucket is None or rid is None:
+                    continue
+                if kind == "delete":
+                    bucket.pop(rid, None)
+                    self.topology.remove(rtype, rid)
+                    self.names.remove(rtype, rid)
+                elif kind == "add":
+                    bucket[rid] = res
+                    self.topology.upsert(res)
+                    self.names.upsert(res)
+                elif kind == "update" and rid in bucket:
+                    _merge(bucket[rid], res)
+                    if TOPOLOGY_FIELDS & res.keys():
+                        self.topology.upsert(bucket[rid])
+                    if NAME_FIELDS & res.keys():
+                        self.names.upsert(bucket[rid])
+                self.events_applied += 1
+
+    # ---- Lesezugriffe (keine Netzwerk-Roundtrips)
+    def get(self, rtype: str, rid: str) -> Optional[dict]:
+        with self._lock:
+            return self._resources.get(rtype, {}).get(rid)
+
+    def all(self, rtype: str) -> list[dict]:
+        with self._lock:
+            return list(self._resources.get(rtype, {}).values())
+
+    def resolve_name(self, query: str, *, rtypes: Optional[Iterable[str]] = None,
+                     limit: int = 5) -> list[NameMatch]:
+        """Kandidaten für einen Namen aus Chat/Sprache, bester zuerst (siehe NameIndex)."""
+        with self._lock:
+            return self.names.resolve(query, rtypes=rtypes, limit=limit)
+
+    def resolve_group(self, query: str) -> str:
+        """grouped_light-ID zu einem Raum-, Zonen- oder Gruppennamen."""
+        with self._lock:
+            match = self.names.best(query, rtypes=("grouped_light", "room", "zone"))
+        if match is None or match.group is None:
+            raise KeyError(f"no room, zone or group matches '{query}'")
+        return match.group
+
+    def get_light(self, light_id: str) -> Optional[LightModel]:
+        raw = self.get("light", light_id)
+        return LightModel.model_validate(raw) if raw else None
+
+    def resolve_group_room(self, group_id: str) -> Optional[RoomModel]:
+        with self._lock:
+            owner = self.topology.group_owner(group_id)
+            if owner is None:
+                raise KeyError(f"unknown grouped_light '{group_id}'")
+            raw = self._resources.get(owner[0], {}).get(owner[1]) if owner[0] in ("room", "zone") else None
+        return RoomModel.model_validate(raw) if raw else None
 
-    def resolve_group_room(self, group_id: str) -> Room:
-        ...
+    def get_group_lights(self, group_id: str) -> dict[str, LightModel]:
+        with self._lock:
+            if group_id not in self._resources["grouped_light"]:
+                raise KeyError(f"unknown grouped_light '{group_id}'")
+            lights = self._resources["light"]
+            raws = [lights[lid] for lid in self.topology.group_lights(group_id) if lid in lights]
+        return {raw["id"]: LightModel.model_validate(raw) for raw in raws}
 
-    def get_group_lights(self, group_id: str) -> dict[str, Light]:
-        ...
+    def group_memberships(self) -> dict[str, frozenset[str]]:
+        """grouped_light-ID -> IDs der Lampen, die ein Gruppenbefehl erreicht."""
+        with self._lock:
+            return self.topology.groups()
 
-    def get_room_devices(self, room_id: str) -> list[Device]:
-        ...
\ No newline at end of file
+    def get_room_devices(self, room_id: str) -> list[DeviceModel]:
+        with self._lock:
+            room = self._resources["room"].get(room_id) or self._resources["zone"].get(room_id)
+            if room is None:
+                raise KeyError(f"unknown room '{room_id}'")
+            devices = self._resources["device"]
+            raws = [devices[did] for did in self.topology.container_devices(room_id) if did in devices]
+        return [DeviceModel.model_validate(raw) for raw in raws]
@@ -0,0 +1,190 @@
+from collections import defaultdict
+from typing import Optional
+
+Ref = tuple[str, str]  # (rtype, rid)
+
+_EMPTY: frozenset = frozenset()
+
+# Felder, deren Änderung die Topologie betrifft - alles andere ist reiner Zustand
+TOPOLOGY_FIELDS = {"services", "children", "owner"}
+
+
+def _refs(items: list[dict]) -> set[Ref]:
+    return {(i["rtype"], i["rid"]) for i in items if "rtype" in i and "rid" in i}
+
+
+class TopologyIndex:
+    """Bidirektionaler Index room/zone <-> device <-> light <-> grouped_light.
+
+    Alle Lookups sind Dict-Zugriffe. Änderungen an einer Ressource berechnen nur die betroffenen
+    Container (Raum, Zonen, bridge_home) neu, nie den ganzen Index.
+    """
+
+    def __init__(self):
+        self._lights: set[str] = set()
+        self._device_services: dict[str, set[Ref]] = {}
+        self._service_device: dict[str, str] = {}
+        self._container_children: dict[str, set[Ref]] = {}
+        self._container_type: dict[str, str] = {}
+        self._child_containers: dict[str, set[str]] = defaultdict(set)   # device/room/light -> room/zone
+        self._group_owner: dict[str, Ref] = {}
+        self._owner_group: dict[str, str] = {}
+        # Abgeleitet: Container -> Lampen und zurück
+        self._container_lights: dict[str, frozenset[str]] = {}
+        self._light_containers: dict[str, set[str]] = defaultdict(set)
+
+    # ---- Aufbau / inkrementelle Updates
+    def load(self, resources: dict[str, dict[str, dict]]):
+        self.__init__()
+        for rtype in ("light", "device", "room", "zone", "grouped_light"):
+            for res in resources.get(rtype, {}).values():
+                self.upsert(res)
+
+    def upsert(self, res: dict):
+        rtype, rid = res.get("type"), res.get("id")
+        if rid is None:
+            return
+        if rtype == "light":
+            if rid not in self._lights:
+                self._lights.add(rid)
+                self._refresh_bridge_home()
+        elif rtype == "device" and "services" in res:
+            self._set_device_services(rid, _refs(res["services"]))
+        elif rtype in ("room", "zone") and "children" in res:
+            self._set_container_children(rid, rtype, _refs(res["children"]))
+        elif rtype == "grouped_light" and "owner" in res:
+            self._set_group_owner(rid, (res["owner"]["rtype"], res["owner"]["rid"]))
+
+    def remove(self, rtype: str, rid: str):
+        if rtype == "light":
+            self._lights.discard(rid)
+            self._refresh_bridge_home()
+        elif rtype == "device":
+            self._set_device_services(rid, set())
+            self._device_services.pop(rid, None)
+        elif rtype in ("room", "zone"):
+            self._set_container_children(rid, rtype, set())
+            self._container_children.pop(rid, None)
+            self._container_type.pop(rid, None)
+            self._set_lights(rid, _EMPTY)
+            self._container_lights.pop(rid, None)
+        elif rtype == "grouped_light":
+            owner = self._group_owner.pop(rid, None)
+            if owner is not None and self._owner_group.get(owner[1]) == rid:
+                del self._owner_group[owner[1]]
+
+    def _set_device_services(self, device_id: str, services: set[Ref]):
+        old = self._device_services.get(device_id, set())
+        for _, sid in old - services:
+            self._service_device.pop(sid, None)
+        for _, sid in services:
+            self._service_device[sid] = device_id
+        self._device_services[device_id] = services
+        if {s for s in old ^ services if s[0] == "light"}:
+            self._refresh(self._child_containers.get(device_id, set()))
+
+    def _set_container_children(self, cid: str, ctype: str, children: set[Ref]):
+        old = self._container_children.get(cid, set())
+        for _, child in old - children:
+            self._child_containers[child].discard(cid)
+        for _, child in children:
+            self._child_containers[child].add(cid)
+        self._container_children[cid] = children
+        self._container_type[cid] = ctype
+        self._refresh({cid})
+
+    def _set_group_owner(self, group_id: str, owner: Ref):
+        old = self._group_owner.get(group_id)
+        if old is not None and self._owner_group.get(old[1]) == group_id:
+            del self._owner_group[old[1]]
+        self._group_owner[group_id] = owner
+        self._owner_group[owner[1]] = group_id
+        if owner[0] == "bridge_home":
+            self._container_type[owner[1]] = "bridge_home"
+            self._refresh_bridge_home()
+
+    def _refresh_bridge_home(self):
+        homes = {cid for cid, ctype in self._container_type.items() if ctype == "bridge_home"}
+        for cid in homes:
+            self._set_lights(cid, frozenset(self._lights))
+
+    def _compute_lights(self, cid: str) -> frozenset[str]:
+        lights: set[str] = set()
+        for rtype, rid in self._container_children.get(cid, ()):
+            if rtype == "light":
+                lights.add(rid)
+            elif rtype == "device":
+                lights.update(sid for stype, sid in self._device_services.get(rid, ()) if stype == "light")
+            elif rtype == "room":
+                lights.update(self._container_lights.get(rid, _EMPTY))
+        return frozenset(lights)
+
+    def _refresh(self, containers: set[str]):
+        # Räume zuerst, dann Zonen, die diese Räume enthalten
+        todo = list(containers)
+        seen: set[str] = set()
+        while todo:
+            cid = todo.pop(0)
+            if cid in seen:
+                continue
+            seen.add(cid)
+            self._set_lights(cid, self._compute_lights(cid))
+            todo.extend(self._child_containers.get(cid, ()))
+
+    def _set_lights(self, cid: str, lights: frozenset[str]):
+        old = self._container_lights.get(cid, _EMPTY)
+        for lid in old - lights:
+            self._light_containers[lid].discard(cid)
+        for lid in lights - old:
+            self._light_containers[lid].add(cid)
+        self._container_lights[cid] = lights
+
+    # ---- Lookups
+    def group_lights(self, group_id: str) -> frozenset[str]:
+        owner = self._group_owner.get(group_id)
+        return self._container_lights.get(owner[1], _EMPTY) if owner else _EMPTY
+
+    def group_owner(self, group_id: str) -> Optional[Ref]:
+        return self._group_owner.get(group_id)
+
+    def owner_group(self, owner_id: str) -> Optional[str]:
+        return self._owner_group.get(owner_id)
+
+    def container_lights(self, container_id: str) -> frozenset[str]:
+        return self._container_lights.get(container_id, _EMPTY)
+
+    def container_devices(self, container_id: str) -> frozenset[str]:
+        return frozenset(rid for rtype, rid in self._container_children.get(container_id, ()) if rtype == "device")
+
+    def light_device(self, light_id: str) -> Optional[str]:
+        return self._service_device.get(light_id)
+
+    def service_device(self, service_id: str) -> Optional[str]:
+        return self._service_device.get(service_id)
+
+    def device_services(self, device_id: str) -> frozenset[Ref]:
+        return frozenset(self._device_services.get(device_id, ()))
+
+    def light_room(self, light_id: str) -> Optional[str]:
+        for cid in self._light_containers.get(light_id, ()):
+            if self._container_type.get(cid) == "room":
+                return cid
+        return None
+
+    def light_zones(self, light_id: str) -> frozenset[str]:
+        return frozenset(cid for cid in self._light_containers.get(light_id, ())
+                         if self._container_type.get(cid) == "zone")
+
+    def light_groups(self, light_id: str) -> frozenset[str]:
+        """Alle grouped_lights, die diese Lampe erreichen (Raum, Zonen, bridge_home)."""
+        return frozenset(gid for cid in self._light_containers.get(light_id, ())
+                         if (gid := self._owner_group.get(cid)) is not None)
+
+    def device_room(self, device_id: str) -> Optional[str]:
+        for cid in self._child_containers.get(device_id, ()):
+            if self._container_type.get(cid) == "room":
+                return cid
+        return None
+
+    def groups(self) -> dict[str, frozenset[str]]:
+        return {gid: self.group_lights(gid) for gid in self._group_owner}
@@ -0,0 +1,251 @@
+import copy
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Iterable, Optional
+
+from huekit.models.group import GroupModel
+from huekit.models.light import LightModel
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.snapshot import BRIGHTNESS_TOLERANCE, XY_TOLERANCE
+
+Ref = tuple[str, str]  # (rtype, rid)
+
+
+class Priority(IntEnum):
+    # Kleiner = wichtiger; der Dispatcher arbeitet immer zuerst die wichtigste Stufe ab
+    INTERACTIVE = 0   # direkte Nutzeraktion ("Licht aus")
+    NORMAL = 1
+    BACKGROUND = 2    # Effekte, Automationen, Slider-Zwischenwerte
+
+
+@dataclass(frozen=True)
+class CommandContext:
+    priority: Priority = Priority.NORMAL
+    deadline: Optional[float] = None   # time.monotonic(); danach ist der Befehl wertlos
+
+    @classmethod
+    def interactive(cls, timeout_s: Optional[float] = None) -> "CommandContext":
+        return cls(Priority.INTERACTIVE, _deadline(timeout_s))
+
+    @classmethod
+    def background(cls, timeout_s: Optional[float] = None) -> "CommandContext":
+        return cls(Priority.BACKGROUND, _deadline(timeout_s))
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return self.deadline is not None and (time.monotonic() if now is None else now) > self.deadline
+
+
+def _deadline(timeout_s: Optional[float]) -> Optional[float]:
+    return None if timeout_s is None else time.monotonic() + timeout_s
+
+
+DEFAULT_CONTEXT = CommandContext()
+
+
+# ---- Optimistischer Zustand (read-your-writes)
+# Felder eines PUT-Bodys, die einen Zustand beschreiben - "dynamics" ist nur die Art des Übergangs
+_TRANSIENT_FIELDS = {"dynamics"}
+_TOLERANCES = {"brightness": BRIGHTNESS_TOLERANCE, "x": XY_TOLERANCE, "y": XY_TOLERANCE}
+
+
+def _confirmed(patch: dict, actual: Optional[dict]) -> bool:
+    """True, wenn `actual` alle Werte aus `patch` schon trägt (Zahlen mit Toleranz)."""
+    if actual is None:
+        return False
+    for key, want in patch.items():
+        have = actual.get(key)
+        if isinstance(want, dict):
+            if not isinstance(have, dict) or not _confirmed(want, have):
+                return False
+        elif isinstance(want, (int, float)) and not isinstance(want, bool) and isinstance(have, (int, float)):
+            if abs(want - have) > _TOLERANCES.get(key, 0):
+                return False
+        elif want != have:
+            return False
+    return True
+
+
+def _paths(patch: dict, prefix: tuple = ()) -> set[tuple]:
+    """Blattpfade eines Patches, z.B. {("dimming", "brightness"), ("on", "on")}."""
+    out: set[tuple] = set()
+    for key, value in patch.items():
+        if isinstance(value, dict) and value:
+            out |= _paths(value, prefix + (key,))
+        else:
+            out.add(prefix + (key,))
+    return out
+
+
+def _without(patch: dict, paths: set[tuple], prefix: tuple = ()) -> dict:
+    """Kopie von `patch` ohne die Blätter aus `paths`; leere Teilbäume fallen weg."""
+    out = {}
+    for key, value in patch.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            rest = _without(value, paths, path)
+            if rest:
+                out[key] = rest
+        elif path not in paths:
+            out[key] = value
+    return out
+
+
+def _overlay(target: dict, patch: dict):
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _overlay(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+@dataclass(eq=False)
+class PendingWrite:
+    rtype: str
+    rid: str
+    patch: dict
+    targets: tuple[Ref, ...]            # die Ressource selbst, bei Gruppen zusätzlich die Lampen
+    created_at: float
+    acked_at: Optional[float] = None    # Bridge hat den PUT angenommen
+    # Pro Ziel die Felder, die ein späterer, schon bestätigter Write überholt hat
+    masked: dict[Ref, set[tuple]] = field(default_factory=dict)
+
+
+class OptimisticState:
+    """Vorhergesagter Zustand direkt nach einem Befehl, bis die Bridge ihn bestätigt.
+
+    `begin` legt die Vorhersage über den Stand des HueRepository, Lesezugriffe sehen sie sofort.
+    Abgeglichen wird beim Lesen: bestätigt der Event-Stream die Werte, fällt die Vorhersage weg;
+    ein angenommener PUT, dessen Werte nach `settle_s` nicht angekommen sind, verliert gegen die
+    Bridge (jemand anderes hat geschaltet). Schlägt der PUT fehl, wird per `rollback` zurückgenommen.
+    """
+
+    def __init__(self, repo: HueRepository, *, settle_s: float = 2.0, ttl_s: float = 10.0):
+        self.repo = repo
+        self.settle_s = settle_s
+        self.ttl_s = ttl_s
+        self._writes: dict[Ref, list[PendingWrite]] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(map(len, self._writes.values()))
+
+    # ---- Schreibseite
+    def begin(self, rtype: str, rid: str, payload: dict) -> PendingWrite:
+        patch = {k: v for k, v in payload.items() if k not in _TRANSIENT_FIELDS}
+        targets = [(rtype, rid)]
+        if rtype == "grouped_light":
+            # Ein Gruppenbefehl landet auf jeder Lampe der Gruppe
+            targets += [("light", lid) for lid in sorted(self.repo.group_memberships().get(rid, ()))]
+        now = time.monotonic()
+        write = PendingWrite(rtype, rid, patch, tuple(targets), now)
+        with self._lock:
+            if now - self._last_sweep > self.ttl_s:
+                self._sweep(now)
+            for ref in write.targets:
+                self._writes.setdefault(ref, []).append(write)
+        return write
+
+    def confirm(self, write: PendingWrite):
+        write.acked_at = time.monotonic()
+
+    def rollback(self, write: PendingWrite):
+        with self._lock:
+            for ref in write.targets:
+                writes = self._writes.get(ref)
+                if writes is not None and write in writes:
+                    writes.remove(write)
+                    if not writes:
+                        del self._writes[ref]
+
+    def settle(self, writes: Iterable[PendingWrite], oks: Iterable[bool]):
+        """Batch-Variante: bestätigt bzw. nimmt zurück, passend zu den Einzelergebnissen."""
+        for write, ok in zip(writes, oks):
+            self.confirm(write) if ok else self.rollback(write)
+
+    @contextmanager
+    def track(self, rtype: str, rid: str, payload: dict):
+        write = self.begin(rtype, rid, payload)
+        try:
+            yield write
+        except BaseException:
+            self.rollback(write)
+            raise
+        self.confirm(write)
+
+    # ---- Leseseite
+    def get(self, rtype: str, rid: str) -> Optional[dict]:
+        """Rohdaten wie HueRepository.get, mit allen noch offenen Vorhersagen darüber."""
+        raw = self.repo.get(rtype, rid)
+        with self._lock:
+            patches = self._reconcile((rtype, rid), raw, time.monotonic())
+        if not patches:
+            return raw
+        state = copy.deepcopy(raw) if raw is not None else {"id": rid, "type": rtype}
+        for patch in patches:
+            _overlay(state, patch)
+        return state
+
+    def get_light(self, light_id: str) -> Optional[LightModel]:
+        raw = self.get("light", light_id)
+        return LightModel.model_validate(raw) if raw else None
+
+    def get_group(self, group_id: str) -> Optional[GroupModel]:
+        raw = self.get("grouped_light", group_id)
+        return GroupModel.model_validate(raw) if raw else None
+
+    def is_pending(self, rtype: str, rid: str) -> bool:
+        raw = self.repo.get(rtype, rid)
+        with self._lock:
+            return bool(self._reconcile((rtype, rid), raw, time.monotonic()))
+
+    def _reconcile(self, ref: Ref, actual: Optional[dict], now: float) -> list[dict]:
+        """Gleicht die offenen Writes auf `ref` ab und liefert die Patches, die noch darüber gehören.
+
+        Ist ein Write bestätigt, ist alles, was *vorher* auf dieselben Felder geschrieben wurde,
+        überholt - auch wenn es selbst noch nicht bestätigt ist (30 -> 70, Bridge meldet 70).
+        Ältere Writes verlieren deshalb dauerhaft (pro Ziel) die Felder jedes späteren bestätigten
+        Writes, ganz überdeckte fallen weg.
+        """
+        writes = self._writes.get(ref)
+        if not writes:
+            return []
+        keep: list[PendingWrite] = []
+        patches: list[dict] = []
+        covered: set[tuple] = set()
+        # Von neu nach alt: `covered` sammelt die Felder der bisher gesehenen bestätigten Writes
+        for w in reversed(writes):
+            if _confirmed(w.patch, actual):
+                covered |= _paths(w.patch)
+                continue
+            if now - w.created_at > self.ttl_s or (w.acked_at is not None and now - w.acked_at > self.settle_s):
+                continue
+            if covered:
+                w.masked.setdefault(ref, set()).update(covered)
+            mask = w.masked.get(ref)
+            patch = _without(w.patch, mask) if mask else w.patch
+            if not patch:
+                continue
+            keep.append(w)
+            patches.append(patch)
+        if keep:
+            keep.reverse()
+            patches.reverse()
+            self._writes[ref] = keep
+        else:
+            del self._writes[ref]
+        return patches
+
+    def _sweep(self, now: float):
+        self._last_sweep = now
+        for ref in list(self._writes):
+            writes = [w for w in self._writes[ref]
+                      if now - w.created_at <= self.ttl_s and (w.acked_at is None or now - w.acked_at <= self.settle_s)]
+            if writes:
+                self._writes[ref] = writes
+            else:
+                del self._writes[ref]
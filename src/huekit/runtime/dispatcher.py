@@ -0,0 +1,318 @@
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from huekit.api.hue_api import DeadlineExceeded, HueApi
+from huekit.commands.base import HueCommand
+from huekit.runtime.context import DEFAULT_CONTEXT, CommandContext, Priority
+from huekit.runtime.metrics import (DISPATCH_EXPIRED, DISPATCH_LANE_DEPTH, DISPATCH_MERGED, DISPATCH_QUEUE_DEPTH,
+                                    DISPATCH_QUEUE_SECONDS, MetricsSink)
+
+log = logging.getLogger(__name__)
+
+Target = tuple[str, str]  # (rtype, rid), z.B. ("grouped_light", "<uuid>")
+ErrorHandler = Callable[[Target, dict, Exception], None]
+
+# color und color_temperature schließen sich gegenseitig aus - der spätere Modus gewinnt
+_EXCLUSIVE = {"color": "color_temperature", "color_temperature": "color"}
+
+
+# Felder, die keinen Zustand beschreiben, sondern wie er erreicht wird
+_TRANSIENT = frozenset({"dynamics"})
+
+
+def _fields(payload: dict) -> set[str]:
+    return set(payload) - _TRANSIENT
+
+
+def can_merge(older: dict, newer: dict) -> bool:
+    """Zwei Payloads sind kompatibel, wenn das Zusammenlegen keine Übergangszeit verfälscht."""
+    if older.get("dynamics") == newer.get("dynamics"):
+        return True
+    # Unterschiedliche dynamics sind nur ok, wenn der neuere Befehl alle Felder des älteren ersetzt
+    return _fields(older) <= _fields(newer)
+
+
+def merge_payloads(older: dict, newer: dict) -> dict:
+    # dynamics beschreibt nur den Übergang zum neuesten Wert - ohne eigene dynamics ist er sofort
+    merged = {k: v for k, v in older.items() if k not in _TRANSIENT}
+    for key, value in newer.items():
+        other = _EXCLUSIVE.get(key)
+        if other is not None:
+            merged.pop(other, None)
+        merged[key] = value
+    return merged
+
+
+@dataclass
+class QueuedCommand:
+    target: Target
+    payload: dict
+    enqueued_at: float  # Zeitpunkt des ältesten Befehls, der in diesem Payload steckt
+    context: CommandContext = DEFAULT_CONTEXT
+
+
+@dataclass
+class DispatcherStats:
+    submitted: int = 0
+    merged: int = 0
+    superseded: int = 0
+    expired: int = 0
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0    # beim Anhalten ohne drain verworfen
+
+
+class Dispatcher:
+    """Queue + Worker-Threads, die ausstehende Befehle pro Ziel zusammenlegen (last-writer-wins).
+
+    Ziele werden pro Prioritätsstufe reihum bedient; ein Ziel steht in der Stufe seines
+    wichtigsten ausstehenden Befehls. Befehle mit abgelaufener Deadline werden verworfen.
+
+    Mit `workers > 1` gehört jedes Ziel über den Hash seiner ID fest zu einer Lane mit eigenem
+    Worker: Befehle an dieselbe Lampe/Gruppe bleiben streng geordnet, unabhängige Ziele laufen
+    parallel.
+    """
+
+    def __init__(self, api: HueApi, *, on_error: Optional[ErrorHandler] = None,
+                 metrics: Optional[MetricsSink] = None, workers: int = 1):
+        if workers < 1:
+            raise ValueError(f"'workers' must be >= 1, got {workers}")
+        self.api = api
+        self.on_error = on_error
+        self.metrics = metrics if metrics is not None else getattr(api, "metrics", None)
+        self.workers = workers
+        self.stats = DispatcherStats()
+        # Ziel -> ausstehende Befehle (in Reihenfolge); meist genau einer dank Coalescing
+        self._pending: dict[Target, list[QueuedCommand]] = {}
+        # Pro Lane und Priorität die Ziele mit ausstehenden Befehlen, in Round-Robin-Reihenfolge
+        self._ready: list[dict[Priority, "OrderedDict[Target, None]"]] = [
+            {p: OrderedDict() for p in Priority} for _ in range(workers)]
+        self._level: dict[Target, Priority] = {}
+        self._depth = 0
+        self._lane_depth = [0] * workers
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)   # flush() wartet hierauf
+        self._lane_conds = [threading.Condition(self._lock) for _ in range(workers)]
+        self._stop = False
+        self._threads: list[threading.Thread] = []
+
+    # ---- Producer-Seite
+    def submit(self, rtype: str, rid: str, command: Union[HueCommand, dict],
+               context: CommandContext = DEFAULT_CONTEXT):
+        payload = command.to_payload() if isinstance(command, HueCommand) else dict(command)
+        target = (rtype, rid)
+        lane = self.lane_of(target)
+        with self._cond:
+            self.stats.submitted += 1
+            queued = self._pending.get(target)
+            if queued is not None and can_merge(queued[-1].payload, payload):
+                last = queued[-1]
+                last.payload = merge_payloads(last.payload, payload)
+                # Der neueste Wert bestimmt die Deadline, die Priorität kann nur steigen
+                last.context = CommandContext(min(last.context.priority, context.priority), context.deadline)
+                self.stats.merged += 1
+                if self.metrics is not None:
+                    self.metrics.inc(DISPATCH_MERGED, labels={"rtype": rtype})
+                self._schedule(target, queued)
+                return
+            entry = QueuedCommand(target, payload, time.monotonic(), context)
+            if queued is None:
+                queued = self._pending[target] = [entry]
+            else:
+                # Ältere Befehle, deren Felder der neue komplett überschreibt, müssen nicht mehr raus
+                fields = _fields(payload)
+                kept = [e for e in queued if not _fields(e.payload) <= fields]
+                self.stats.superseded += len(queued) - len(kept)
+                self._count(lane, len(kept) - len(queued))
+                queued[:] = kept + [entry]
+            self._count(lane, 1)
+            self._schedule(target, queued)
+            self._lane_conds[lane].notify()
+
+    def submit_group(self, group_id: str, command: Union[HueCommand, dict],
+                     context: CommandContext = DEFAULT_CONTEXT):
+        self.submit("grouped_light", group_id, command, context)
+
+    def submit_light(self, light_id: str, command: Union[HueCommand, dict],
+                     context: CommandContext = DEFAULT_CONTEXT):
+        self.submit("light", light_id, command, context)
+
+    def lane_of(self, target: Target) -> int:
+        # crc32 statt hash(): über Prozessgrenzen stabil, gleiche ID -> gleiche Lane
+        return zlib.crc32(target[1].encode()) % self.workers if self.workers > 1 else 0
+
+    def _schedule(self, target: Target, queued: list[QueuedCommand]):
+        # Aufrufer hält self._cond; Ziel in die Stufe seines wichtigsten Befehls einsortieren
+        level = min(e.context.priority for e in queued)
+        current = self._level.get(target)
+        if current == level:
+            return
+        ready = self._ready[self.lane_of(target)]
+        if current is not None:
+            del ready[current][target]
+        ready[level][target] = None
+        self._level[target] = level
+
+    def _count(self, lane: int, delta: int):
+        # Aufrufer hält self._cond
+        self._depth += delta
+        self._lane_depth[lane] += delta
+        if self.metrics is not None and delta:
+            self.metrics.set_gauge(DISPATCH_QUEUE_DEPTH, self._depth)
+            if self.workers > 1:
+                self.metrics.set_gauge(DISPATCH_LANE_DEPTH, self._lane_depth[lane], {"lane": str(lane)})
+
+    @property
+    def queue_depth(self) -> int:
+        with self._cond:
+            return self._depth
+
+    @property
+    def lane_depths(self) -> list[int]:
+        """Backlog pro Lane - eine dauerhaft volle Lane deutet auf ein heißes Ziel hin."""
+        with self._cond:
+            return list(self._lane_depth)
+
+    # ---- Lifecycle
+    def start(self):
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop = False
+        self._threads = [threading.Thread(target=self._run, args=(lane,), daemon=True,
+                                          name="hue-dispatcher" if self.workers == 1 else f"hue-dispatcher-{lane}")
+                         for lane in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, drain: bool = True, timeout: float = 10.0):
+        """Hält die Worker an. Mit `drain` wird vorher alles Ausstehende gesendet (höchstens `timeout`).
+
+        Was danach noch in der Queue steht, wird verworfen und in `stats.dropped` gezählt; laufende
+        Requests werden noch zu Ende geführt.
+        """
+        deadline = time.monotonic() + timeout
+        if drain:
+            self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._drop_pending()
+            for cond in self._lane_conds:
+                cond.notify_all()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wartet, bis alle ausstehenden Befehle gesendet sind."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _drop_pending(self):
+        # Aufrufer hält self._cond
+        dropped = sum(map(len, self._pending.values()))
+        if not dropped:
+            return
+        self.stats.dropped += dropped
+        log.info("dispatcher stopped, dropping %d queued commands", dropped)
+        self._pending.clear()
+        self._level.clear()
+        for ready in self._ready:
+            for targets in ready.values():
+                targets.clear()
+        for lane, depth in enumerate(self._lane_depth):
+            self._count(lane, -depth)
+
+    # ---- Worker
+    def _next(self, lane: int) -> Optional[QueuedCommand]:
+        ready = self._ready[lane]
+        with self._cond:
+            while True:
+                while not self._lane_depth[lane] and not self._stop:
+                    self._lane_conds[lane].wait()
+                if self._stop:
+                    return None
+                entry = self._pop(ready, lane)
+                if not entry.context.expired():
+                    self._in_flight += 1
+                    return entry
+                # Zu spät ist schlimmer als gar nicht (z.B. veralteter Slider-Wert)
+                self._count_expired(entry.target)
+                self._cond.notify_all()
+
+    def _pop(self, ready: dict[Priority, "OrderedDict[Target, None]"], lane: int) -> QueuedCommand:
+        # Aufrufer hält self._cond und hat geprüft, dass in der Lane etwas aussteht
+        level = next(p for p in Priority if ready[p])
+        target, _ = ready[level].popitem(last=False)
+        del self._level[target]
+        queued = self._pending[target]
+        entry = queued.pop(0)
+        if queued:
+            # Rest hinten anstellen, damit andere Ziele derselben Stufe nicht verhungern
+            self._schedule(target, queued)
+        else:
+            del self._pending[target]
+        self._count(lane, -1)
+        if self.metrics is not None:
+            self.metrics.observe(DISPATCH_QUEUE_SECONDS, time.monotonic() - entry.enqueued_at,
+                                 {"rtype": target[0], "priority": entry.context.priority.name.lower()})
+        return entry
+
+    def _run(self, lane: int):
+        while True:
+            entry = self._next(lane)
+            if entry is None:
+                return
+            target, payload = entry.target, entry.payload
+            ok = expired = False
+            try:
+                self._send(target, payload, entry.context.deadline)
+                ok = True
+            except DeadlineExceeded as e:
+                # Beim Warten auf den Rate-Limiter abgelaufen - wie beim Dequeue verwerfen
+                expired = True
+                log.debug("%s", e)
+            except Exception as e:
+                log.warning("command for %s/%s failed: %s", target[0], target[1], e)
+                if self.on_error is not None:
+                    # Ein fehlerhafter Handler darf den Worker nicht mitreißen
+                    try:
+                        self.on_error(target, payload, e)
+                    except Exception:
+                        log.exception("on_error handler failed for %s/%s", target[0], target[1])
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    if ok:
+                        self.stats.sent += 1
+                    elif expired:
+                        self._count_expired(target)
+                    else:
+                        self.stats.failed += 1
+                    self._cond.notify_all()
+
+    def _count_expired(self, target: Target):
+        # Aufrufer hält self._cond
+        self.stats.expired += 1
+        if self.metrics is not None:
+            self.metrics.inc(DISPATCH_EXPIRED, labels={"rtype": target[0]})
+
+    def _send(self, target: Target, payload: dict, deadline: Optional[float] = None):
+        rtype, rid = target
+        if deadline is None:
+            self.api.put_resource(rtype, rid, payload)
+        else:
+            # Die API prüft die Deadline nach dem Rate-Limit-Warten noch einmal
+            self.api.put_resource(rtype, rid, payload, deadline=deadline)
@@ -0,0 +1,237 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Optional, Protocol
+
+Labels = Optional[dict[str, str]]
+LabelKey = tuple[tuple[str, str], ...]
+
+# Latenz-Buckets in Sekunden
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Metriknamen, die huekit selbst schreibt
+HTTP_SECONDS = "hue_http_request_seconds"
+HTTP_IN_FLIGHT = "hue_http_in_flight"
+HTTP_ERRORS = "hue_http_errors_total"
+HTTP_RETRIES = "hue_http_retries_total"
+HTTP_HEDGED = "hue_http_hedged_total"
+HTTP_HEDGE_WINS = "hue_http_hedge_wins_total"
+CIRCUIT_STATE = "hue_circuit_state"            # 0 = closed, 1 = half-open, 2 = open
+CIRCUIT_REJECTED = "hue_circuit_rejected_total"
+API_SECONDS = "hue_api_call_seconds"
+RATE_LIMIT_WAIT = "hue_rate_limit_wait_seconds"
+SERVICE_SECONDS = "hue_service_call_seconds"
+DISPATCH_QUEUE_SECONDS = "hue_dispatch_queue_seconds"
+DISPATCH_QUEUE_DEPTH = "hue_dispatch_queue_depth"
+DISPATCH_LANE_DEPTH = "hue_dispatch_lane_depth"
+DISPATCH_MERGED = "hue_dispatch_merged_total"
+DISPATCH_EXPIRED = "hue_dispatch_expired_total"
+
+
+class MetricsSink(Protocol):
+    def observe(self, name: str, value: float, labels: Labels = None): ...
+    def inc(self, name: str, amount: float = 1.0, labels: Labels = None): ...
+    def add_gauge(self, name: str, delta: float, labels: Labels = None): ...
+    def set_gauge(self, name: str, value: float, labels: Labels = None): ...
+
+
+def _key(labels: Labels) -> LabelKey:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # letzter Eintrag = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Obere Bucket-Grenze, unter der der Anteil q der Werte liegt (grobe Schätzung)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class InMemorySink:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms: dict[str, dict[LabelKey, Histogram]] = {}
+        self.counters: dict[str, dict[LabelKey, float]] = {}
+        self.gauges: dict[str, dict[LabelKey, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, labels: Labels = None):
+        key = _key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(self.buckets)
+            hist.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, labels: Labels = None):
+        key = _key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def add_gauge(self, name: str, delta: float, labels: Labels = None):
+        key = _key(labels)
+        with self._lock:
+            series = self.gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + delta
+
+    def set_gauge(self, name: str, value: float, labels: Labels = None):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_key(labels)] = value
+
+    def histogram(self, name: str, labels: Labels = None) -> Optional[Histogram]:
+        return self.histograms.get(name, {}).get(_key(labels))
+
+    def counter(self, name: str, labels: Labels = None) -> float:
+        return self.counters.get(name, {}).get(_key(labels), 0.0)
+
+    def gauge(self, name: str, labels: Labels = None) -> float:
+        return self.gauges.get(name, {}).get(_key(labels), 0.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[tuple[str, str]] = None) -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra is not None:
+        parts.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    return "+Inf" if v == float("inf") else repr(float(v))
+
+
+class PrometheusSink(InMemorySink):
+    """In-Memory-Sink, der zusätzlich das Prometheus-Textformat (0.0.4) rendern kann."""
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{_fmt_labels(k)} {_fmt_value(v)}" for k, v in series.items())
+            for name, series in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{_fmt_labels(k)} {_fmt_value(v)}" for k, v in series.items())
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for k, hist in series.items():
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets + (float("inf"),), hist.counts):
+                        cumulative += n
+                        lines.append(f"{name}_bucket{_fmt_labels(k, ('le', _fmt_value(bound)))} {cumulative}")
+                    lines.append(f"{name}_sum{_fmt_labels(k)} {_fmt_value(hist.sum)}")
+                    lines.append(f"{name}_count{_fmt_labels(k)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetrySink:
+    """Leitet an ein OpenTelemetry-`Meter` (oder etwas mit derselben API) weiter."""
+
+    def __init__(self, meter: Any):
+        self.meter = meter
+        self._instruments: dict[tuple[str, str], Any] = {}
+        self._gauge_values: dict[tuple[str, LabelKey], float] = {}
+        self._lock = threading.Lock()
+
+    def _instrument(self, kind: str, name: str):
+        inst = self._instruments.get((kind, name))
+        if inst is None:
+            with self._lock:
+                inst = self._instruments.get((kind, name))
+                if inst is None:
+                    factory = getattr(self.meter, f"create_{kind}")
+                    inst = self._instruments[(kind, name)] = factory(name, unit="s" if name.endswith("_seconds") else "1")
+        return inst
+
+    def observe(self, name: str, value: float, labels: Labels = None):
+        self._instrument("histogram", name).record(value, attributes=labels or {})
+
+    def inc(self, name: str, amount: float = 1.0, labels: Labels = None):
+        self._instrument("counter", name).add(amount, attributes=labels or {})
+
+    def add_gauge(self, name: str, delta: float, labels: Labels = None):
+        self._instrument("up_down_counter", name).add(delta, attributes=labels or {})
+
+    def set_gauge(self, name: str, value: float, labels: Labels = None):
+        # Ohne synchrones Gauge-Instrument als Differenz auf einen UpDownCounter abbilden
+        key = (name, _key(labels))
+        with self._lock:
+            delta = value - self._gauge_values.get(key, 0.0)
+            self._gauge_values[key] = value
+        self.add_gauge(name, delta, labels)
+
+
+class MultiSink:
+    def __init__(self, *sinks: MetricsSink):
+        self.sinks = sinks
+
+    def observe(self, name: str, value: float, labels: Labels = None):
+        for s in self.sinks:
+            s.observe(name, value, labels)
+
+    def inc(self, name: str, amount: float = 1.0, labels: Labels = None):
+        for s in self.sinks:
+            s.inc(name, amount, labels)
+
+    def add_gauge(self, name: str, delta: float, labels: Labels = None):
+        for s in self.sinks:
+            s.add_gauge(name, delta, labels)
+
+    def set_gauge(self, name: str, value: float, labels: Labels = None):
+        for s in self.sinks:
+            s.set_gauge(name, value, labels)
+
+
+def timed(name: str, **labels: str):
+    """Dekorator für Methoden von Objekten mit `self.metrics`; ohne Sink nur ein Attribut-Check."""
+    def decorate(fn):
+        op_labels = {**labels, "op": fn.__name__}
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(self, *args, **kwargs):
+                sink = self.metrics
+                if sink is None:
+                    return await fn(self, *args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await fn(self, *args, **kwargs)
+                finally:
+                    sink.observe(name, time.perf_counter() - start, op_labels)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            sink = self.metrics
+            if sink is None:
+                return fn(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                sink.observe(name, time.perf_counter() - start, op_labels)
+        return wrapper
+    return decorate
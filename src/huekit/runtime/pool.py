@@ -0,0 +1,203 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Union
+
+from huekit.api.http_client import HttpClient, Payload
+from huekit.api.hue_api import HueApi
+from huekit.commands.base import HueCommand
+from huekit.repo.cache import TopologyCache
+from huekit.repo.hue_repository import RESOURCE_TYPES, HueRepository
+from huekit.runtime.context import DEFAULT_CONTEXT, CommandContext
+from huekit.runtime.dispatcher import Dispatcher
+from huekit.runtime.metrics import MetricsSink
+from huekit.runtime.rate_limit import Budget, RateLimiter
+
+log = logging.getLogger(__name__)
+
+Target = tuple[str, str]                    # (rtype, rid)
+PoolCommand = tuple[str, str, Payload]      # (rtype, rid, payload)
+
+
+@dataclass
+class Bridge:
+    """Alles, was zu genau einer Bridge gehört: Verbindung, Rate-Limiter, Cache, Dispatcher."""
+    name: str
+    http: HttpClient
+    api: HueApi
+    repo: HueRepository
+    dispatcher: Dispatcher
+
+    def home_group(self) -> Optional[str]:
+        """grouped_light der bridge_home - ein PUT darauf erreicht alle Lampen dieser Bridge."""
+        for group in self.repo.all("grouped_light"):
+            if group.get("owner", {}).get("rtype") == "bridge_home":
+                return group["id"]
+        return None
+
+
+@dataclass
+class PoolResult:
+    sent: int = 0
+    failed: list[tuple[Target, Exception]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+class BridgePool:
+    """Mehrere Bridges hinter einer Fassade: Befehle werden anhand der Ressourcen-ID automatisch
+    an die besitzende Bridge geroutet und pro Bridge parallel abgearbeitet.
+
+    Jede Bridge hat ihr eigenes Befehlsbudget - N Bridges kosten deshalb nur so viel Wall-Time wie
+    die langsamste, nicht die Summe.
+    """
+
+    def __init__(self, *, metrics: Optional[MetricsSink] = None, cache: Optional[TopologyCache] = None,
+                 dispatch_workers: int = 1):
+        self.metrics = metrics
+        self.cache = cache
+        self.dispatch_workers = dispatch_workers   # Lanes pro Bridge-Dispatcher
+        self.bridges: dict[str, Bridge] = {}
+        self._owner: dict[str, str] = {}    # Ressourcen-ID -> Bridge-Name
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ---- Aufbau
+    def add_bridge(self, name: str, base_url: str, headers: dict[str, str], *,
+                   budgets: Optional[dict[str, Budget]] = None) -> Bridge:
+        http = HttpClient(base_url, headers, metrics=self.metrics)
+        return self.add_api(name, HueApi(http, RateLimiter(budgets), metrics=self.metrics))
+
+    def add_api(self, name: str, api: HueApi) -> Bridge:
+        if name in self.bridges:
+            raise ValueError(f"bridge '{name}' is already part of the pool")
+        bridge = Bridge(name, api.http, api, HueRepository(api, self.cache),
+                        Dispatcher(api, workers=self.dispatch_workers))
+        with self._lock:
+            self.bridges[name] = bridge
+            self._reset_executor()
+        return bridge
+
+    def _reset_executor(self):
+        # Ein Worker pro Bridge: innerhalb einer Bridge bleibt die Reihenfolge erhalten
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self.bridges), 1),
+                                            thread_name_prefix="hue-pool")
+
+    # ---- Lifecycle
+    def sync(self):
+        """Lädt die Caches aller Bridges parallel und baut die ID -> Bridge Zuordnung neu auf."""
+        self._each(lambda b: b.repo.sync())
+        self._rebuild_owners()
+
+    def start(self):
+        self._each(lambda b: b.repo.start())
+        self._rebuild_owners()
+        for bridge in self.bridges.values():
+            bridge.dispatcher.start()
+
+    def stop(self, drain: bool = True):
+        for bridge in self.bridges.values():
+            bridge.dispatcher.stop(drain=drain)
+            bridge.repo.stop()
+
+    def close(self):
+        self.stop()
+        for bridge in self.bridges.values():
+            bridge.http.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "BridgePool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _each(self, fn):
+        futures = [self._executor.submit(fn, bridge) for bridge in self.bridges.values()]
+        for future in futures:
+            future.result()
+
+    # ---- Routing
+    def _rebuild_owners(self):
+        owners = {}
+        for name, bridge in self.bridges.items():
+            for rtype in RESOURCE_TYPES:
+                for res in bridge.repo.all(rtype):
+                    owners[res["id"]] = name
+        with self._lock:
+            self._owner = owners
+
+    def bridge_for(self, rid: str) -> Bridge:
+        name = self._owner.get(rid)
+        if name is None:
+            # Neu angelegte Ressource (per Event nachgeladen) -> in den Caches suchen
+            for bridge in self.bridges.values():
+                if any(bridge.repo.get(rtype, rid) is not None for rtype in RESOURCE_TYPES):
+                    name = bridge.name
+                    with self._lock:
+                        self._owner[rid] = name
+                    break
+            else:
+                raise KeyError(f"resource '{rid}' does not belong to any bridge in the pool")
+        return self.bridges[name]
+
+    # ---- Befehle
+    def put_resource(self, rtype: str, rid: str, payload: Payload, *,
+                     deadline: Optional[float] = None) -> dict:
+        return self.bridge_for(rid).api.put_resource(rtype, rid, payload, deadline=deadline)
+
+    def submit(self, rtype: str, rid: str, command: Union[HueCommand, dict],
+               context: CommandContext = DEFAULT_CONTEXT):
+        """Fire-and-forget über den Dispatcher der besitzenden Bridge (mit Coalescing)."""
+        self.bridge_for(rid).dispatcher.submit(rtype, rid, command, context)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return all(bridge.dispatcher.flush(timeout) for bridge in self.bridges.values())
+
+    def apply(self, commands: Iterable[PoolCommand]) -> PoolResult:
+        """Sendet Befehle blockierend: pro Bridge der Reihe nach, alle Bridges gleichzeitig."""
+        shards: dict[str, list[PoolCommand]] = {}
+        for rtype, rid, payload in commands:
+            shards.setdefault(self.bridge_for(rid).name, []).append((rtype, rid, payload))
+
+        def run(name: str, batch: list[PoolCommand]) -> PoolResult:
+            api = self.bridges[name].api
+            result = PoolResult()
+            for rtype, rid, payload in batch:
+                try:
+                    api.put_resource(rtype, rid, payload)
+                    result.sent += 1
+                except Exception as e:
+                    log.warning("command for %s/%s on bridge %s failed: %s", rtype, rid, name, e)
+                    result.failed.append(((rtype, rid), e))
+            return result
+
+        total = PoolResult()
+        futures = [self._executor.submit(run, name, batch) for name, batch in shards.items()]
+        for future in futures:
+            part = future.result()
+            total.sent += part.sent
+            total.failed.extend(part.failed)
+        return total
+
+    def set_all(self, payload: Union[HueCommand, dict]) -> PoolResult:
+        """Ein Gruppen-PUT pro Bridge (bridge_home), alle parallel - z.B. "ganzer Standort aus"."""
+        body = payload.to_payload() if isinstance(payload, HueCommand) else payload
+        commands = []
+        for bridge in self.bridges.values():
+            group_id = bridge.home_group()
+            if group_id is None:
+                raise KeyError(f"bridge '{bridge.name}' has no bridge_home grouped_light")
+            commands.append(("grouped_light", group_id, body))
+        return self.apply(commands)
+
+    def all_off(self) -> PoolResult:
+        return self.set_all({"on": {"on": False}})
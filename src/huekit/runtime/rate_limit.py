@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+
+@dataclass(frozen=True)
+class Budget:
+    rate: float          # Befehle pro Sekunde
+    burst: float = 1.0   # Bucket-Größe
+
+
+# Grobe Richtwerte der Bridge: ~10 light-Befehle/s, ~1 grouped_light-Befehl/s
+DEFAULT_BUDGETS: dict[str, Budget] = {
+    "light": Budget(rate=10.0, burst=10.0),
+    "grouped_light": Budget(rate=1.0, burst=1.0),
+}
+DEFAULT_BUDGET = Budget(rate=10.0, burst=10.0)
+
+
+class TokenBucket:
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self._tokens = budget.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.budget.burst, self._tokens + (now - self._updated) * self.budget.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Nimmt Tokens nur, wenn sie sofort verfügbar sind."""
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserviert Tokens und gibt zurück, wie lange der Aufrufer noch warten muss.
+
+        Der Bucket darf negativ werden - so bekommen wartende Aufrufer ihre Slots in Reihenfolge.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.budget.rate
+
+    def set_budget(self, budget: Budget):
+        """Wechselt das Budget, ohne den Füllstand zu verlieren.
+
+        Bis jetzt wird noch mit der alten Rate aufgefüllt; der Stand wird auf den neuen Burst gekappt,
+        Schulden (negativer Stand durch Reservierungen) bleiben erhalten.
+        """
+        with self._lock:
+            self._refill()
+            self.budget = budget
+            self._tokens = min(self._tokens, budget.burst)
+
+
+@dataclass
+class RateLimitStats:
+    acquired: int = 0
+    waited: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    @property
+    def mean_wait_s(self) -> float:
+        return self.total_wait_s / self.acquired if self.acquired else 0.0
+
+
+@dataclass
+class _Slot:
+    bucket: TokenBucket
+    stats: RateLimitStats = field(default_factory=RateLimitStats)
+
+
+class RateLimiter:
+    """Token-Buckets pro (Bridge, Ressourcentyp), nutzbar aus Threads und aus asyncio."""
+
+    def __init__(self, budgets: Optional[dict[str, Budget]] = None, default: Budget = DEFAULT_BUDGET):
+        self.budgets = dict(DEFAULT_BUDGETS if budgets is None else budgets)
+        self.default = default
+        self._slots: dict[tuple[str, str], _Slot] = {}
+        self._lock = threading.Lock()
+
+    def set_budget(self, rtype: str, budget: Budget):
+        with self._lock:
+            self.budgets[rtype] = budget
+            for (bridge, slot_rtype), slot in self._slots.items():
+                if slot_rtype == rtype:
+                    slot.bucket.set_budget(budget)
+
+    def costs(self, rtypes: Iterable[str] = ("light", "grouped_light")) -> dict[str, float]:
+        """Sekunden pro Befehl bei Dauerlast (1 / rate) - Kostenmodell für plan_fanout."""
+        return {rtype: 1.0 / self.budgets.get(rtype, self.default).rate for rtype in rtypes}
+
+    def _slot(self, bridge: str, rtype: str) -> _Slot:
+        key = (bridge, rtype)
+        slot = self._slots.get(key)
+        if slot is None:
+            with self._lock:
+                slot = self._slots.setdefault(key, _Slot(TokenBucket(self.budgets.get(rtype, self.default))))
+        return slot
+
+    def _reserve(self, bridge: str, rtype: str, tokens: float) -> float:
+        slot = self._slot(bridge, rtype)
+        wait = slot.bucket.reserve(tokens)
+        with self._lock:
+            stats = slot.stats
+            stats.acquired += 1
+            if wait > 0:
+                stats.waited += 1
+                stats.total_wait_s += wait
+                stats.max_wait_s = max(stats.max_wait_s, wait)
+        return wait
+
+    def acquire(self, rtype: str, bridge: str = "default", tokens: float = 1.0) -> float:
+        """Blockiert, bis ein Slot frei ist; gibt die Wartezeit in Sekunden zurück."""
+        wait = self._reserve(bridge, rtype, tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, rtype: str, bridge: str = "default", tokens: float = 1.0) -> float:
+        wait = self._reserve(bridge, rtype, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> dict[tuple[str, str], RateLimitStats]:
+        with self._lock:
+            return {key: RateLimitStats(**vars(slot.stats)) for key, slot in self._slots.items()}
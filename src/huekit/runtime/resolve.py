@@ -0,0 +1,267 @@
+import bisect
+import heapq
+import json
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Iterable, Mapping, Optional
+
+Ref = tuple[str, str]  # (rtype, rid)
+
+
+@dataclass(frozen=True)
+class PlannedCommand:
+    rtype: str
+    rid: str
+    payload: dict = field(hash=False, compare=False)
+
+
+@dataclass
+class FanOutPlan:
+    commands: list[PlannedCommand]
+    naive_count: int          # PUTs ohne Planer (eine pro Lampe)
+    groups_used: int = 0
+    overrides: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.naive_count - len(self.commands)
+
+
+def _key(payload: dict) -> str:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+def _overrides(group_payload: dict, light_payload: dict) -> bool:
+    # Eine Einzel-Korrektur nach dem Gruppenbefehl muss alle Felder des Gruppenbefehls überschreiben
+    return set(group_payload) - {"dynamics"} <= set(light_payload) - {"dynamics"}
+
+
+def _compatible(group_payload: dict, state: dict) -> bool:
+    # Ein Gruppenbefehl schadet einer Lampe nicht, wenn er nur Werte setzt, die sie ohnehin haben soll
+    return all(state.get(key) == value for key, value in group_payload.items() if key != "dynamics")
+
+
+def plan_fanout(desired: dict[str, dict], groups: dict[str, frozenset[str]],
+                flexible: Optional[dict[str, dict]] = None,
+                costs: Optional[Mapping[str, float]] = None) -> FanOutPlan:
+    """Wählt eine günstige Mischung aus grouped_light- und light-PUTs für (Lampe -> Payload).
+
+    `costs` bewertet einen PUT pro Ressourcentyp (z.B. RateLimiter.costs(): Sekunden pro Befehl);
+    ohne zählt jeder PUT gleich. Bei den Standard-Budgets (grouped_light 1/s, light 10/s) lohnt
+    eine Gruppe erst, wenn sie mehr als zehn Einzel-PUTs ersetzt.
+
+    Greedy: nimm immer die Gruppe mit der größten Ersparnis. Eine Gruppe kommt nur in Frage, wenn
+    alle ihre Lampen Teil der Anfrage und noch nicht verplant sind, und wenn jede abweichende Lampe
+    per Einzel-PUT danach vollständig korrigiert werden kann.
+
+    `flexible` sind Lampen, die nichts brauchen, aber (Lampe -> Zielzustand als Payload) einen
+    Gruppenbefehl vertragen, der nur ihren Zielzustand bestätigt - z.B. beim Restore einer Szene.
+    """
+    flexible = flexible or {}
+    costs = costs or {}
+    light_cost, group_cost = costs.get("light", 1.0), costs.get("grouped_light", 1.0)
+    keys = {lid: _key(payload) for lid, payload in desired.items()}
+    unassigned = set(desired)
+    group_cmds: list[PlannedCommand] = []
+    overrides: list[PlannedCommand] = []
+
+    candidates = {gid: lights for gid, lights in groups.items() if len(lights) > 1}
+    while True:
+        best = None  # (Ersparnis, -Overrides, gid, payload-key)
+        for gid, lights in candidates.items():
+            wanted = lights & desired.keys()
+            if not wanted or not wanted <= unassigned or not lights - wanted <= flexible.keys():
+                continue
+            counts = Counter(keys[lid] for lid in wanted)
+            key, hits = counts.most_common(1)[0]
+            payload = desired[next(lid for lid in wanted if keys[lid] == key)]
+            misses = [lid for lid in wanted if keys[lid] != key]
+            if any(not _overrides(payload, desired[lid]) for lid in misses):
+                continue
+            if any(not _compatible(payload, flexible[lid]) for lid in lights - wanted):
+                continue
+            # n Einzel-PUTs werden zu 1 Gruppen-PUT + Korrekturen für die Abweichler
+            saving = hits * light_cost - group_cost
+            if saving > 0 and (best is None or (saving, -len(misses)) > best[:2]):
+                best = (saving, -len(misses), gid, key)
+        if best is None:
+            break
+        _, _, gid, key = best
+        wanted = candidates.pop(gid) & desired.keys()
+        group_payload = desired[next(lid for lid in wanted if keys[lid] == key)]
+        group_cmds.append(PlannedCommand("grouped_light", gid, group_payload))
+        for lid in sorted(wanted):
+            if keys[lid] != key:
+                overrides.append(PlannedCommand("light", lid, desired[lid]))
+        unassigned -= wanted
+
+    singles = [PlannedCommand("light", lid, desired[lid]) for lid in sorted(unassigned)]
+    # Gruppenbefehle zuerst, damit die Korrekturen danach greifen
+    return FanOutPlan(commands=group_cmds + overrides + singles,
+                      naive_count=len(desired),
+                      groups_used=len(group_cmds),
+                      overrides=len(overrides))
+
+
+# ---- Namensauflösung (Chat-/Sprach-Frontends lösen bei jeder Nachricht Namen auf)
+NAMED_TYPES = ("light", "grouped_light", "room", "zone")
+NAME_FIELDS = {"metadata", "owner"}
+
+EXACT, PREFIX, FUZZY = "exact", "prefix", "fuzzy"
+_MIN_SIMILARITY = 0.3
+
+
+def normalize_name(name: str) -> str:
+    """Kleinschreibung, ohne Akzente/Umlaut-Punkte, nur Buchstaben/Ziffern durch einfache Leerzeichen."""
+    name = unicodedata.normalize("NFKD", name.casefold().replace("ß", "ss"))
+    out = "".join(ch if ch.isalnum() else " " for ch in name if not unicodedata.combining(ch))
+    return " ".join(out.split())
+
+
+def _trigrams(norm: str) -> set[str]:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    rtype: str
+    rid: str
+    name: str
+    score: float                    # 1.0 = exakt; Präfix- und Fuzzy-Treffer darunter
+    kind: str                       # EXACT | PREFIX | FUZZY
+    group: Optional[str] = None     # grouped_light, das die Ressource schaltet (room/zone/grouped_light)
+
+
+class NameIndex:
+    """Vorberechneter Namensindex über light, grouped_light, room und zone.
+
+    Exakt ist ein Dict-Zugriff, Präfixe laufen per bisect über eine sortierte Liste aller Namen und
+    Namensworte, unscharf wird über gemeinsame Trigramme gesucht. Wie TopologyIndex wird der Index
+    pro Ressource inkrementell gepflegt; Locking übernimmt der Besitzer (HueRepository).
+    """
+
+    def __init__(self):
+        self._names: dict[Ref, tuple[str, str, int]] = {}    # ref -> (Anzeigename, normalisiert, #Trigramme)
+        self._exact: dict[str, set[Ref]] = defaultdict(set)
+        self._prefix: list[tuple[str, int, Ref]] = []        # (Schlüssel, Wortposition, ref), sortiert
+        self._trigrams: dict[str, set[Ref]] = defaultdict(set)
+        self._owner_group: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # ---- Aufbau / inkrementelle Updates
+    def load(self, resources: dict[str, dict[str, dict]]):
+        self.__init__()
+        for rtype in NAMED_TYPES:
+            for res in resources.get(rtype, {}).values():
+                self.upsert(res)
+
+    def upsert(self, res: dict):
+        rtype, rid = res.get("type"), res.get("id")
+        if rtype not in NAMED_TYPES or rid is None:
+            return
+        if rtype == "grouped_light" and "owner" in res:
+            self._owner_group[res["owner"]["rid"]] = rid
+        name = ((res.get("metadata") or {}).get("name") or "").strip()
+        current = self._names.get((rtype, rid))
+        if current is not None and current[0] == name:
+            return
+        self._drop((rtype, rid))
+        norm = normalize_name(name)
+        if not norm:
+            return
+        ref = (rtype, rid)
+        grams = _trigrams(norm)
+        self._names[ref] = (name, norm, len(grams))
+        self._exact[norm].add(ref)
+        for key, pos in self._keys(norm):
+            bisect.insort(self._prefix, (key, pos, ref))
+        for gram in grams:
+            self._trigrams[gram].add(ref)
+
+    def remove(self, rtype: str, rid: str):
+        self._drop((rtype, rid))
+        if rtype == "grouped_light":
+            self._owner_group = {o: g for o, g in self._owner_group.items() if g != rid}
+        else:
+            self._owner_group.pop(rid, None)
+
+    def _drop(self, ref: Ref):
+        entry = self._names.pop(ref, None)
+        if entry is None:
+            return
+        norm = entry[1]
+        _discard(self._exact, norm, ref)
+        for key, pos in self._keys(norm):
+            i = bisect.bisect_left(self._prefix, (key, pos, ref))
+            if i < len(self._prefix) and self._prefix[i] == (key, pos, ref):
+                del self._prefix[i]
+        for gram in _trigrams(norm):
+            _discard(self._trigrams, gram, ref)
+
+    @staticmethod
+    def _keys(norm: str) -> list[tuple[str, int]]:
+        # Ganzer Name und jedes Restwort-Suffix: "wohnzimmer decke" findet man auch mit "deck"
+        words = norm.split(" ")
+        return [(" ".join(words[i:]), i) for i in range(len(words))]
+
+    # ---- Lookups
+    def resolve(self, query: str, *, rtypes: Optional[Iterable[str]] = None, limit: int = 5) -> list[NameMatch]:
+        """Nach Score absteigend sortierte Kandidaten; exakte vor Präfix-Treffern, Fuzzy nur ohne beide."""
+        norm = normalize_name(query)
+        if not norm:
+            return []
+        allowed = set(rtypes) if rtypes is not None else None
+        scores: dict[Ref, tuple[float, str]] = {}
+
+        def offer(ref: Ref, score: float, kind: str):
+            if allowed is not None and ref[0] not in allowed:
+                return
+            if ref not in scores or score > scores[ref][0]:
+                scores[ref] = (score, kind)
+
+        for ref in self._exact.get(norm, ()):
+            offer(ref, 1.0, EXACT)
+        i = bisect.bisect_left(self._prefix, (norm,))
+        while i < len(self._prefix) and self._prefix[i][0].startswith(norm):
+            key, pos, ref = self._prefix[i]
+            # Je mehr vom Namen getippt wurde, desto besser; Wortanfänge im Namensinneren etwas schlechter
+            coverage = len(norm) / len(self._names[ref][1])
+            offer(ref, (0.8 if pos == 0 else 0.7) + 0.19 * coverage, PREFIX)
+            i += 1
+        if not scores:
+            # Unscharf nur als Rückfall - bei Tippfehlern, nicht wenn schon ein Name passt
+            grams = _trigrams(norm)
+            n, names = len(grams), self._names
+            shared = Counter(chain.from_iterable(self._trigrams.get(gram, ()) for gram in grams))
+            # Dice-Koeffizient über die Trigramm-Mengen
+            fuzzy = [(2 * hits / (n + names[ref][2]), ref) for ref, hits in shared.items()
+                     if allowed is None or ref[0] in allowed]
+            best = heapq.nlargest(limit, (c for c in fuzzy if c[0] >= _MIN_SIMILARITY),
+                                  key=lambda c: c[0])
+            return [self._match(ref, 0.69 * similarity, FUZZY) for similarity, ref in best]
+
+        ranked = heapq.nsmallest(limit, scores.items(),
+                                 key=lambda item: (-item[1][0], self._names[item[0]][1], item[0]))
+        return [self._match(ref, score, kind) for ref, (score, kind) in ranked]
+
+    def best(self, query: str, *, rtypes: Optional[Iterable[str]] = None) -> Optional[NameMatch]:
+        matches = self.resolve(query, rtypes=rtypes, limit=1)
+        return matches[0] if matches else None
+
+    def _match(self, ref: Ref, score: float, kind: str) -> NameMatch:
+        rtype, rid = ref
+        group = rid if rtype == "grouped_light" else self._owner_group.get(rid)
+        return NameMatch(rtype, rid, self._names[ref][0], round(score, 4), kind, group)
+
+
+def _discard(index: dict[str, set[Ref]], key: str, ref: Ref):
+    refs = index.get(key)
+    if refs is not None:
+        refs.discard(ref)
+        if not refs:
+            del index[key]
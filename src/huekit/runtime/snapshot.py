@@ -0,0 +1,113 @@
+"""Szenen-Snapshots: Zustand von Lampen festhalten und später mit möglichst wenigen PUTs zurückspielen."""
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Optional
+
+from huekit.models.light import LightModel
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.resolve import FanOutPlan, plan_fanout
+
+# Unterhalb dieser Abweichungen ist kein Unterschied sichtbar (bzw. die Bridge rundet ohnehin)
+BRIGHTNESS_TOLERANCE = 0.5
+XY_TOLERANCE = 0.0005
+
+
+@dataclass(frozen=True)
+class LightState:
+    on: bool
+    brightness: Optional[float] = None
+    xy: Optional[tuple[float, float]] = None
+    mirek: Optional[int] = None        # gesetzt = Farbtemperatur-Modus, dann ist xy None
+
+    @classmethod
+    def from_model(cls, light: LightModel) -> "LightState":
+        brightness = light.dimming.brightness if light.dimming is not None else None
+        ct = light.color_temperature
+        # Im xy-Modus meldet die Bridge mirek = null -> daran erkennt man den aktiven Farbmodus
+        if ct is not None and ct.mirek is not None and ct.mirek_valid:
+            return cls(light.on.is_on, brightness, mirek=ct.mirek)
+        xy = (light.color.xy.x, light.color.xy.y) if light.color is not None else None
+        return cls(light.on.is_on, brightness, xy=xy)
+
+    def to_payload(self) -> dict:
+        """Vollständiger Zielzustand als PUT-Body."""
+        return self.diff(None)
+
+    def diff(self, current: Optional["LightState"]) -> dict:
+        """PUT-Body mit genau den Feldern, in denen `current` von diesem Zustand abweicht."""
+        payload: dict = {}
+        if current is None or current.on != self.on:
+            payload["on"] = {"on": self.on}
+        if self.brightness is not None and (
+                current is None or current.brightness is None
+                or abs(current.brightness - self.brightness) > BRIGHTNESS_TOLERANCE):
+            payload["dimming"] = {"brightness": self.brightness}
+        if self.mirek is not None:
+            if current is None or current.mirek != self.mirek:
+                payload["color_temperature"] = {"mirek": self.mirek}
+        elif self.xy is not None and (
+                current is None or current.xy is None
+                or abs(current.xy[0] - self.xy[0]) > XY_TOLERANCE
+                or abs(current.xy[1] - self.xy[1]) > XY_TOLERANCE):
+            payload["color"] = {"xy": {"x": self.xy[0], "y": self.xy[1]}}
+        return payload
+
+
+@dataclass
+class Snapshot:
+    lights: dict[str, LightState]
+    taken_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        # Kompakt: light-ID -> [on, brightness, x, y, mirek]
+        return {
+            "taken_at": self.taken_at,
+            "lights": {lid: [s.on, s.brightness, *(s.xy or (None, None)), s.mirek]
+                       for lid, s in self.lights.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Snapshot":
+        lights = {}
+        for lid, (on, brightness, x, y, mirek) in data["lights"].items():
+            lights[lid] = LightState(on, brightness, (x, y) if x is not None else None, mirek)
+        return cls(lights, data.get("taken_at", 0.0))
+
+
+def take_snapshot(repo: HueRepository, *, lights: Iterable[str] = (),
+                  groups: Iterable[str] = ()) -> Snapshot:
+    """Hält den aktuellen (gecachten) Zustand fest; Gruppen werden zu ihren Lampen aufgelöst."""
+    states: dict[str, LightState] = {}
+    for group_id in groups:
+        for lid, light in repo.get_group_lights(group_id).items():
+            states[lid] = LightState.from_model(light)
+    for lid in lights:
+        light = repo.get_light(lid)
+        if light is None:
+            raise KeyError(f"unknown light '{lid}'")
+        states[lid] = LightState.from_model(light)
+    return Snapshot(states)
+
+
+def restore_plan(repo: HueRepository, snapshot: Snapshot, *,
+                 duration_ms: Optional[int] = None,
+                 costs: Optional[Mapping[str, float]] = None) -> FanOutPlan:
+    """Vergleicht den Snapshot mit dem bekannten Zustand und plant nur die nötigen Änderungen.
+
+    Lampen ohne Abweichung werden nicht angefasst, dürfen aber in einem Gruppen-PUT stecken,
+    solange der nur Werte setzt, die sie ohnehin haben sollen.
+    """
+    desired: dict[str, dict] = {}
+    unchanged: dict[str, dict] = {}
+    for lid, target in snapshot.lights.items():
+        light = repo.get_light(lid)
+        if light is None:
+            continue  # inzwischen gelöscht
+        payload = target.diff(LightState.from_model(light))
+        if payload:
+            if duration_ms is not None:
+                payload["dynamics"] = {"duration": duration_ms}
+            desired[lid] = payload
+        else:
+            unchanged[lid] = target.to_payload()
+    return plan_fanout(desired, repo.group_memberships(), flexible=unchanged, costs=costs)
@@ -0,0 +1,121 @@
+"""Kompakte, append-only Binärtraces aller gesendeten Befehle (für Lasttests per Replay).
+
+Dateiformat: 8 Byte Magic, danach Records aus festem Kopf + variablen Teilen
+
+    t (f64, Unix-Zeit)  latency_s (f32)  status (u16)  len(rtype) (u8)  len(rid) (u8)  len(payload) (u32)
+    rtype  rid  payload (kompaktes JSON bzw. die rohen Bytes eines vorkodierten Bodys)
+
+status ist der HTTP-Status (200 bei Erfolg, 0 bei Transportfehlern). Ein abgeschnittener letzter
+Record (Absturz beim Schreiben) wird beim Lesen ignoriert.
+"""
+import json
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Union
+
+MAGIC = b"HUETRC1\n"
+_HEADER = struct.Struct("<dfHBBI")
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    t: float
+    rtype: str
+    rid: str
+    payload: bytes
+    latency_s: float
+    status: int
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Form des Payloads (Top-Level-Felder), z.B. ("dimming", "dynamics")."""
+        try:
+            return tuple(sorted(json.loads(self.payload)))
+        except ValueError:
+            return ()
+
+    def to_payload(self) -> Union[dict, bytes]:
+        try:
+            return json.loads(self.payload)
+        except ValueError:
+            return self.payload
+
+
+def _encode(payload: Union[dict, bytes, None]) -> bytes:
+    if payload is None:
+        return b""
+    if isinstance(payload, (bytes, bytearray)):
+        return bytes(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+class TraceRecorder:
+    """Hängt jeden PUT als Record an eine Trace-Datei an (Hook für HueApi/AsyncHueApi).
+
+    Geschrieben wird gepuffert; `flush()`/`close()` bzw. der Context-Manager bringen alles auf die
+    Platte. Thread-safe, die Kosten pro Befehl sind ein struct.pack und ein write in den Puffer.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], *, buffer_size: int = 64 * 1024):
+        self.path = os.fspath(path)
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file: Optional[BinaryIO] = open(self.path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def record(self, rtype: str, rid: str, payload: Union[dict, bytes, None], *,
+               started_at: float, latency_s: float, status: int):
+        rtype_b, rid_b, body = rtype.encode(), rid.encode(), _encode(payload)
+        data = _HEADER.pack(started_at, latency_s, status, len(rtype_b), len(rid_b), len(body)) + rtype_b + rid_b + body
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(data)
+            self.records += 1
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def status_of(error: Optional[BaseException]) -> int:
+    if error is None:
+        return 200
+    status = getattr(error, "status", None)
+    return status if isinstance(status, int) else 0
+
+
+def read_trace(path: Union[str, os.PathLike]) -> Iterator[TraceRecord]:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{os.fspath(path)} is not a hue-kit trace")
+        while True:
+            head = f.read(_HEADER.size)
+            if len(head) < _HEADER.size:
+                return
+            t, latency_s, status, n_rtype, n_rid, n_body = _HEADER.unpack(head)
+            rest = f.read(n_rtype + n_rid + n_body)
+            if len(rest) < n_rtype + n_rid + n_body:
+                return
+            yield TraceRecord(t, rest[:n_rtype].decode(), rest[n_rtype:n_rtype + n_rid].decode(),
+                              rest[n_rtype + n_rid:], latency_s, status)
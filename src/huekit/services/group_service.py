@@ -1,18 +1,96 @@
+from typing import Iterable, Optional, Union
+
+from huekit.api.batch import BatchResult
+from huekit.api.hue_api import AsyncHueApi, HueApi
+from huekit.commands.base import HueCommand, color_command, color_temperature_command, dimming_command, on_command
+from huekit.runtime.context import OptimisticState
+from huekit.runtime.metrics import SERVICE_SECONDS, timed
+
+
 class GroupService:
-    def __init__(self, api: HueApi):
+    def __init__(self, api: HueApi, state: Optional[OptimisticState] = None):
         self.api = api
+        self.metrics = api.metrics
+        self.state = state
 
+    @timed(SERVICE_SECONDS, service="group")
     def turn_on(self, group_id: str):
-        ...
+        return self._put(group_id, on_command(True).to_payload())
 
+    @timed(SERVICE_SECONDS, service="group")
     def turn_off(self, group_id: str):
-        ...
+        return self._put(group_id, on_command(False).to_payload())
 
+    @timed(SERVICE_SECONDS, service="group")
     def set_brightness(self, group_id: str, level: int, duration_ms: int = 500):
-        ...
+        return self._put(group_id, dimming_command(level, duration_ms).to_payload())
 
+    @timed(SERVICE_SECONDS, service="group")
     def set_color(self, group_id: str, xy: tuple[float, float], duration_ms: int = 50):
-        ...
+        return self._put(group_id, color_command(xy, duration_ms).to_payload())
 
+    @timed(SERVICE_SECONDS, service="group")
     def set_color_temp(self, group_id: str, mirek: int):
-        ...
\ No newline at end of file
+        return self._put(group_id, color_temperature_command(mirek).to_payload())
+
+    @timed(SERVICE_SECONDS, service="group")
+    def apply_many(self, commands: Iterable[tuple[str, Union[HueCommand, dict]]], *,
+                   concurrency: int = 4) -> BatchResult:
+        """Ein Befehl pro Gruppe, parallel mit begrenzter Concurrency (siehe HueApi.apply_many)."""
+        items = [("grouped_light", group_id, c.to_payload() if isinstance(c, HueCommand) else c) for group_id, c in commands]
+        if self.state is None:
+            return self.api.apply_many(items, concurrency=concurrency)
+        writes = [self.state.begin(*item) for item in items]
+        result = self.api.apply_many(items, concurrency=concurrency)
+        self.state.settle(writes, (item.ok for item in result.items))
+        return result
+
+    def _put(self, group_id: str, payload: dict):
+        if self.state is None:
+            return self.api.put_group(group_id, payload)
+        with self.state.track("grouped_light", group_id, payload):
+            return self.api.put_group(group_id, payload)
+
+
+class AsyncGroupService:
+    def __init__(self, api: AsyncHueApi, state: Optional[OptimisticState] = None):
+        self.api = api
+        self.metrics = api.metrics
+        self.state = state
+
+    @timed(SERVICE_SECONDS, service="group")
+    async def turn_on(self, group_id: str):
+        return await self._put(group_id, on_command(True).to_payload())
+
+    @timed(SERVICE_SECONDS, service="group")
+    async def turn_off(self, group_id: str):
+        return await self._put(group_id, on_command(False).to_payload())
+
+    @timed(SERVICE_SECONDS, service="group")
+    async def set_brightness(self, group_id: str, level: int, duration_ms: int = 500):
+        return await self._put(group_id, dimming_command(level, duration_ms).to_payload())
+
+    @timed(SERVICE_SECONDS, service="group")
+    async def set_color(self, group_id: str, xy: tuple[float, float], duration_ms: int = 50):
+        return await self._put(group_id, color_command(xy, duration_ms).to_payload())
+
+    @timed(SERVICE_SECONDS, service="group")
+    async def set_color_temp(self, group_id: str, mirek: int):
+        return await self._put(group_id, color_temperature_command(mirek).to_payload())
+
+    @timed(SERVICE_SECONDS, service="group")
+    async def apply_many(self, commands: Iterable[tuple[str, Union[HueCommand, dict]]], *,
+                         concurrency: int = 4) -> BatchResult:
+        items = [("grouped_light", group_id, c.to_payload() if isinstance(c, HueCommand) else c) for group_id, c in commands]
+        if self.state is None:
+            return await self.api.apply_many(items, concurrency=concurrency)
+        writes = [self.state.begin(*item) for item in items]
+        result = await self.api.apply_many(items, concurrency=concurrency)
+        self.state.settle(writes, (item.ok for item in result.items))
+        return result
+
+    async def _put(self, group_id: str, payload: dict):
+        if self.state is None:
+            return await self.api.put_group(group_id, payload)
+        with self.state.track("grouped_light", group_id, payload):
+            return await self.api.put_group(group_id, payload)
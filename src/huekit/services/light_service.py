@@ -1,18 +1,167 @@
+import asyncio
+from typing import Iterable, Optional, Union
+
+from huekit.api.batch import BatchResult
+from huekit.api.hue_api import AsyncHueApi, HueApi
+from huekit.commands.base import (HueCommand, color_command, color_temperature_command, dimming_command,
+                                  on_command)
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.context import OptimisticState
+from huekit.runtime.metrics import SERVICE_SECONDS, timed
+from huekit.runtime.resolve import FanOutPlan, plan_fanout
+from huekit.runtime.snapshot import Snapshot, restore_plan, take_snapshot
+
+
+def _costs(api: Union[HueApi, AsyncHueApi]) -> Optional[dict[str, float]]:
+    # Mit Rate-Limiter sind Gruppen-PUTs teurer als Einzel-PUTs - der Planer soll das wissen
+    return api.limiter.costs() if api.limiter is not None else None
+
+
+def _plan(desired: dict[str, Union[HueCommand, dict]], repo: Optional[HueRepository],
+          costs: Optional[dict[str, float]] = None) -> FanOutPlan:
+    payloads = {lid: c.to_payload() if isinstance(c, HueCommand) else c for lid, c in desired.items()}
+    groups = repo.group_memberships() if repo is not None else {}
+    return plan_fanout(payloads, groups, costs=costs)
+
+
+def _require_repo(repo: Optional[HueRepository]) -> HueRepository:
+    if repo is None:
+        raise ValueError("snapshots need a HueRepository (LightService(api, repo))")
+    return repo
+
+
 class LightService:
-    def __init__(self, api: HueApi):
+    def __init__(self, api: HueApi, repo: Optional[HueRepository] = None,
+                 state: Optional[OptimisticState] = None):
         self.api = api
+        self.metrics = api.metrics
+        self.repo = repo
+        self.state = state
+
+    @timed(SERVICE_SECONDS, service="light")
+    def turn_on(self, light_id: str):
+        return self._put("light", light_id, on_command(True).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    def turn_off(self, light_id: str):
+        return self._put("light", light_id, on_command(False).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    def set_brightness(self, light_id: str, level: int, duration_ms: int = 500):
+        return self._put("light", light_id, dimming_command(level, duration_ms).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    def set_color(self, light_id: str, xy: tuple[float, float], duration_ms: int = 50):
+        return self._put("light", light_id, color_command(xy, duration_ms).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    def set_color_temp(self, light_id: str, mirek: int):
+        return self._put("light", light_id, color_temperature_command(mirek).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    def apply_many(self, commands: Iterable[tuple[str, Union[HueCommand, dict]]], *,
+                   concurrency: int = 4) -> BatchResult:
+        """Ein Befehl pro Lampe, parallel mit begrenzter Concurrency (siehe HueApi.apply_many)."""
+        items = [("light", light_id, c.to_payload() if isinstance(c, HueCommand) else c) for light_id, c in commands]
+        if self.state is None:
+            return self.api.apply_many(items, concurrency=concurrency)
+        writes = [self.state.begin(*item) for item in items]
+        result = self.api.apply_many(items, concurrency=concurrency)
+        self.state.settle(writes, (item.ok for item in result.items))
+        return result
+
+    @timed(SERVICE_SECONDS, service="light")
+    def set_states(self, desired: dict[str, Union[HueCommand, dict]]) -> FanOutPlan:
+        """Setzt viele Lampen auf einmal; deckungsgleiche Räume/Zonen gehen als ein Gruppen-PUT raus."""
+        plan = _plan(desired, self.repo, _costs(self.api))
+        self._execute(plan)
+        return plan
+
+    def snapshot(self, light_ids: Iterable[str] = (), group_ids: Iterable[str] = ()) -> Snapshot:
+        return take_snapshot(_require_repo(self.repo), lights=light_ids, groups=group_ids)
+
+    @timed(SERVICE_SECONDS, service="light")
+    def restore(self, snapshot: Snapshot, duration_ms: Optional[int] = None) -> FanOutPlan:
+        """Spielt einen Snapshot zurück - nur abweichende Felder, so gebündelt wie möglich."""
+        plan = restore_plan(_require_repo(self.repo), snapshot, duration_ms=duration_ms,
+                            costs=_costs(self.api))
+        self._execute(plan)
+        return plan
+
+    def _execute(self, plan: FanOutPlan):
+        for cmd in plan.commands:
+            self._put(cmd.rtype, cmd.rid, cmd.payload)
+
+    def _put(self, rtype: str, rid: str, payload: dict):
+        if self.state is None:
+            return self.api.put_resource(rtype, rid, payload)
+        with self.state.track(rtype, rid, payload):
+            return self.api.put_resource(rtype, rid, payload)
+
+
+class AsyncLightService:
+    def __init__(self, api: AsyncHueApi, repo: Optional[HueRepository] = None,
+                 state: Optional[OptimisticState] = None):
+        self.api = api
+        self.metrics = api.metrics
+        self.repo = repo
+        self.state = state
+
+    @timed(SERVICE_SECONDS, service="light")
+    async def turn_on(self, light_id: str):
+        return await self._put("light", light_id, on_command(True).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    async def turn_off(self, light_id: str):
+        return await self._put("light", light_id, on_command(False).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    async def set_brightness(self, light_id: str, level: int, duration_ms: int = 500):
+        return await self._put("light", light_id, dimming_command(level, duration_ms).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    async def set_color(self, light_id: str, xy: tuple[float, float], duration_ms: int = 50):
+        return await self._put("light", light_id, color_command(xy, duration_ms).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    async def set_color_temp(self, light_id: str, mirek: int):
+        return await self._put("light", light_id, color_temperature_command(mirek).to_payload())
+
+    @timed(SERVICE_SECONDS, service="light")
+    async def apply_many(self, commands: Iterable[tuple[str, Union[HueCommand, dict]]], *,
+                         concurrency: int = 4) -> BatchResult:
+        items = [("light", light_id, c.to_payload() if isinstance(c, HueCommand) else c) for light_id, c in commands]
+        if self.state is None:
+            return await self.api.apply_many(items, concurrency=concurrency)
+        writes = [self.state.begin(*item) for item in items]
+        result = await self.api.apply_many(items, concurrency=concurrency)
+        self.state.settle(writes, (item.ok for item in result.items))
+        return result
 
-    def turn_on(self, group_id: str):
-        ...
+    @timed(SERVICE_SECONDS, service="light")
+    async def set_states(self, desired: dict[str, Union[HueCommand, dict]]) -> FanOutPlan:
+        plan = _plan(desired, self.repo, _costs(self.api))
+        await self._execute(plan)
+        return plan
 
-    def turn_off(self, group_id: str):
-        ...
+    def snapshot(self, light_ids: Iterable[str] = (), group_ids: Iterable[str] = ()) -> Snapshot:
+        return take_snapshot(_require_repo(self.repo), lights=light_ids, groups=group_ids)
 
-    def set_brightness(self, group_id: str, level: int, duration_ms: int = 500):
-        ...
+    @timed(SERVICE_SECONDS, service="light")
+    async def restore(self, snapshot: Snapshot, duration_ms: Optional[int] = None) -> FanOutPlan:
+        plan = restore_plan(_require_repo(self.repo), snapshot, duration_ms=duration_ms,
+                            costs=_costs(self.api))
+        await self._execute(plan)
+        return plan
 
-    def set_color(self, group_id: str, xy: tuple[float, float], duration_ms: int = 50):
-        ...
+    async def _execute(self, plan: FanOutPlan):
+        # Gruppenbefehle müssen vor den Einzel-Korrekturen ankommen
+        group_cmds, rest = plan.commands[:plan.groups_used], plan.commands[plan.groups_used:]
+        await asyncio.gather(*(self._put(c.rtype, c.rid, c.payload) for c in group_cmds))
+        await asyncio.gather(*(self._put(c.rtype, c.rid, c.payload) for c in rest))
 
-    def set_color_temp(self, group_id: str, mirek: int):
-        ...
\ No newline at end of file
+    async def _put(self, rtype: str, rid: str, payload: dict):
+        if self.state is None:
+            return await self.api.put_resource(rtype, rid, payload)
+        with self.state.track(rtype, rid, payload):
+            return await self.api.put_resource(rtype, rid, payload)
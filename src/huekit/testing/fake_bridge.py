@@ -0,0 +1,366 @@
+"""Lokale Fake-Bridge (CLIP v2 über http) für Tests und Benchmarks ohne echte Hardware."""
+import json
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from huekit.runtime.rate_limit import Budget, TokenBucket
+
+RESOURCE_PREFIX = "/clip/v2/resource/"
+EVENTSTREAM_PATH = "/eventstream/clip/v2"
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Abgebrochene Verbindungen gehören zum normalen Betrieb, nur echte Fehler ausgeben
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _merge(target: dict, patch: dict):
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+@dataclass
+class FakeBridgeConfig:
+    latency_s: float = 0.0           # feste Verzögerung pro Request
+    jitter_s: float = 0.0            # zusätzlich gleichverteilt 0..jitter_s
+    rate_limits: dict[str, Budget] = field(default_factory=dict)  # rtype -> Budget, nur für PUT
+    rate_limit_mode: str = "reject"  # "reject" -> 429, "queue" -> Anfrage verzögern wie die echte Bridge
+    error_rate: float = 0.0          # Anteil zufälliger 503-Antworten
+    app_key: Optional[str] = None    # wenn gesetzt, wird hue-application-key geprüft
+    seed: int = 0
+
+
+@dataclass
+class FakeBridgeStats:
+    requests: int = 0
+    puts: int = 0
+    gets: int = 0
+    rate_limited: int = 0
+    injected_errors: int = 0
+    by_rtype: dict[str, int] = field(default_factory=dict)
+
+
+def generate_resources(rooms: int = 3, lights_per_room: int = 4, zones: int = 1,
+                       seed: int = 0) -> dict[str, dict[str, dict]]:
+    """Erzeugt eine konsistente Topologie: device -> light, room -> device, grouped_light je Owner."""
+    rng = random.Random(seed)
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    res: dict[str, dict[str, dict]] = {t: {} for t in
+                                        ("light", "device", "room", "zone", "grouped_light",
+                                         "entertainment_configuration", "bridge_home", "bridge")}
+
+    def add(rtype: str, body: dict) -> dict:
+        body = {"id": new_id(), "type": rtype, **body}
+        res[rtype][body["id"]] = body
+        return body
+
+    def grouped_light(owner: dict) -> dict:
+        gl = add("grouped_light", {"owner": {"rid": owner["id"], "rtype": owner["type"]},
+                                   "on": {"on": False}, "dimming": {"brightness": 0.0}})
+        owner.setdefault("services", []).append({"rid": gl["id"], "rtype": "grouped_light"})
+        return gl
+
+    all_lights = []
+    room_list = []
+    for r in range(rooms):
+        devices = []
+        for n in range(lights_per_room):
+            device = add("device", {"metadata": {"name": f"Room {r + 1} Light {n + 1}", "archetype": "sultan_bulb"},
+                                    "services": []})
+            light = add("light", {
+                "owner": {"rid": device["id"], "rtype": "device"},
+                "metadata": {"name": f"Room {r + 1} Light {n + 1}", "archetype": "sultan_bulb"},
+                "on": {"on": False},
+                "dimming": {"brightness": 50.0},
+                "color_temperature": {"mirek": None, "mirek_valid": False},
+                "color": {"xy": {"x": 0.3, "y": 0.3}, "gamut_type": "C"},
+            })
+            device["services"].append({"rid": light["id"], "rtype": "light"})
+            devices.append(device)
+            all_lights.append(light)
+        room = add("room", {"metadata": {"name": f"Room {r + 1}", "archetype": "living_room"},
+                            "children": [{"rid": d["id"], "rtype": "device"} for d in devices],
+                            "services": []})
+        grouped_light(room)
+        room_list.append(room)
+
+    for z in range(zones):
+        members = all_lights[z::2]
+        zone = add("zone", {"metadata": {"name": f"Zone {z + 1}", "archetype": "other"},
+                            "children": [{"rid": light["id"], "rtype": "light"} for light in members],
+                            "services": []})
+        grouped_light(zone)
+
+    home = add("bridge_home", {"children": [{"rid": r["id"], "rtype": "room"} for r in room_list], "services": []})
+    grouped_light(home)
+
+    channels = [{"channel_id": i,
+                 "position": {"x": rng.uniform(-1, 1), "y": rng.uniform(-1, 1), "z": 0.0},
+                 "members": [{"service": {"rid": light["id"], "rtype": "entertainment"}, "index": 0}]}
+                for i, light in enumerate(all_lights[:20])]
+    add("entertainment_configuration", {"metadata": {"name": "Fake Area"}, "configuration_type": "screen",
+                                        "status": "inactive", "channels": channels})
+
+    bridge_device = add("device", {"metadata": {"name": "Fake Bridge", "archetype": "bridge_v2"},
+                                   "product_data": {"model_id": "BSB002", "software_version": "1.66.1966060010"},
+                                   "services": []})
+    bridge = add("bridge", {"owner": {"rid": bridge_device["id"], "rtype": "device"},
+                            "bridge_id": f"001788fffe{rng.getrandbits(24):06x}"})
+    bridge_device["services"].append({"rid": bridge["id"], "rtype": "bridge"})
+    return res
+
+
+class FakeBridge:
+    """CLIP v2 Fake mit einstellbarer Latenz, Rate-Limits, Fehlerinjektion und Event-Stream."""
+
+    def __init__(self, resources: Optional[dict[str, dict[str, dict]]] = None,
+                 config: Optional[FakeBridgeConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeBridgeConfig()
+        self.resources = resources if resources is not None else generate_resources(seed=self.config.seed)
+        self.stats = FakeBridgeStats()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._buckets = {rtype: TokenBucket(b) for rtype, b in self.config.rate_limits.items()}
+        self._subscribers: list[queue.Queue] = []
+        self._fail_next: list[int] = []
+        self._event_seq = 0
+        self._server = _Server((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/clip/v2/resource"
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"hue-application-key": self.config.app_key or "fake"}
+
+    def start(self) -> "FakeBridge":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-bridge", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            for q in self._subscribers:
+                q.put(None)
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeBridge":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- Steuerung aus Tests
+    def fail_next(self, count: int = 1, status: int = 503):
+        with self._lock:
+            self._fail_next.extend([status] * count)
+
+    def disconnect_streams(self):
+        """Beendet alle offenen Event-Streams (simuliert einen Verbindungsabbruch)."""
+        with self._lock:
+            for q in self._subscribers:
+                q.put(None)
+
+    def emit(self, kind: str, data: list[dict]):
+        """Schickt ein Event an alle Stream-Clients (type: add | update | delete)."""
+        with self._lock:
+            self._event_seq += 1
+            event = {"creationtime": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                     "id": str(uuid.uuid4()), "type": kind, "data": data}
+            event_id = f"{int(time.time())}:{self._event_seq}"
+            for q in self._subscribers:
+                q.put((event_id, [event]))
+
+    # ---- Request-Verarbeitung
+    def _gate(self, method: str, rtype: str) -> Optional[tuple[int, str]]:
+        """Latenz, Fehlerinjektion und Rate-Limit; gibt (status, beschreibung) bei Fehler zurück."""
+        cfg = self.config
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_rtype[rtype] = self.stats.by_rtype.get(rtype, 0) + 1
+            forced = self._fail_next.pop(0) if self._fail_next else None
+            roll = self._rng.random()
+            jitter = self._rng.uniform(0, cfg.jitter_s) if cfg.jitter_s else 0.0
+        delay = cfg.latency_s + jitter
+        if delay > 0:
+            time.sleep(delay)
+        if forced is not None or roll < cfg.error_rate:
+            with self._lock:
+                self.stats.injected_errors += 1
+            return forced or 503, "service unavailable (injected)"
+        bucket = self._buckets.get(rtype) if method == "PUT" else None
+        if bucket is not None:
+            if cfg.rate_limit_mode == "queue":
+                wait = bucket.reserve()
+                if wait > 0:
+                    time.sleep(wait)
+            elif not bucket.try_acquire():
+                with self._lock:
+                    self.stats.rate_limited += 1
+                return 429, "rate limit exceeded"
+        return None
+
+    def _get(self, rtype: str, rid: Optional[str]) -> tuple[int, dict]:
+        with self._lock:
+            bucket = self.resources.get(rtype)
+            if bucket is None:
+                return 404, {"errors": [{"description": f"unknown resource type '{rtype}'"}], "data": []}
+            if rid is None:
+                return 200, {"errors": [], "data": json.loads(json.dumps(list(bucket.values())))}
+            if rid not in bucket:
+                return 404, {"errors": [{"description": f"resource '{rtype}/{rid}' not found"}], "data": []}
+            return 200, {"errors": [], "data": [json.loads(json.dumps(bucket[rid]))]}
+
+    def _put(self, rtype: str, rid: str, body: dict) -> tuple[int, dict]:
+        with self._lock:
+            target = self.resources.get(rtype, {}).get(rid)
+            if target is None:
+                return 404, {"errors": [{"description": f"resource '{rtype}/{rid}' not found"}], "data": []}
+            self.stats.puts += 1
+            patch = {k: v for k, v in body.items() if k not in ("dynamics", "action")}
+            if rtype == "entertainment_configuration" and "action" in body:
+                patch["status"] = "active" if body["action"] == "start" else "inactive"
+            _merge(target, patch)
+            updates = [{"id": rid, "type": rtype, **patch}]
+            if rtype == "grouped_light":
+                # Wie die echte Bridge: ein Gruppenbefehl ändert alle Lampen der Gruppe
+                light_patch = {k: v for k, v in patch.items() if k in ("on", "dimming", "color", "color_temperature")}
+                for lid in self._group_lights(target):
+                    _merge(self.resources["light"][lid], light_patch)
+                    updates.append({"id": lid, "type": "light", **light_patch})
+        self.emit("update", updates)
+        return 200, {"errors": [], "data": [{"rid": rid, "rtype": rtype}]}
+
+    def _group_lights(self, group: dict) -> list[str]:
+        owner = group.get("owner", {})
+        pending = [(owner.get("rtype"), owner.get("rid"))]
+        lights = []
+        while pending:
+            rtype, rid = pending.pop()
+            if rtype == "light":
+                lights.append(rid)
+                continue
+            res = self.resources.get(rtype, {}).get(rid)
+            if res is None:
+                continue
+            # room -> device -> light, zone -> light, bridge_home -> room
+            refs = res.get("services", []) if rtype == "device" else res.get("children", [])
+            pending.extend((ref["rtype"], ref["rid"]) for ref in refs)
+        return lights
+
+    def _handler_class(self):
+        bridge = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # sonst 40 ms Delayed-ACK zwischen Header und Body
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    # Client ist schon weg (verlorener Hedge, Cancel, Replay-Ende) - kein Traceback
+                    self.close_connection = True
+
+            def _authorized(self) -> bool:
+                key = bridge.config.app_key
+                if key is not None and self.headers.get("hue-application-key") != key:
+                    self._reply(403, {"errors": [{"description": "unauthorized user"}], "data": []})
+                    return False
+                return True
+
+            def _route(self) -> tuple[Optional[str], Optional[str]]:
+                if not self.path.startswith(RESOURCE_PREFIX):
+                    return None, None
+                parts = self.path[len(RESOURCE_PREFIX):].strip("/").split("/")
+                return parts[0], (parts[1] if len(parts) > 1 else None)
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path.startswith(EVENTSTREAM_PATH):
+                    return self._stream()
+                rtype, rid = self._route()
+                if rtype is None:
+                    return self._reply(404, {"errors": [{"description": "not found"}], "data": []})
+                failure = bridge._gate("GET", rtype)
+                if failure:
+                    return self._reply(failure[0], {"errors": [{"description": failure[1]}], "data": []})
+                with bridge._lock:
+                    bridge.stats.gets += 1
+                self._reply(*bridge._get(rtype, rid))
+
+            def do_PUT(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                if not self._authorized():
+                    return
+                rtype, rid = self._route()
+                if rtype is None or rid is None:
+                    return self._reply(405, {"errors": [{"description": "method not allowed"}], "data": []})
+                failure = bridge._gate("PUT", rtype)
+                if failure:
+                    return self._reply(failure[0], {"errors": [{"description": failure[1]}], "data": []})
+                try:
+                    body = json.loads(raw or b"{}")
+                except ValueError:
+                    return self._reply(400, {"errors": [{"description": "body contains invalid json"}], "data": []})
+                self._reply(*bridge._put(rtype, rid, body))
+
+            def _stream(self):
+                q: queue.Queue = queue.Queue()
+                with bridge._lock:
+                    bridge._subscribers.append(q)
+                self.close_connection = True
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+                    self.wfile.write(b": hi\n\n")
+                    self.wfile.flush()
+                    while True:
+                        item = q.get()
+                        if item is None:
+                            return
+                        event_id, events = item
+                        self.wfile.write(f"id: {event_id}\ndata: {json.dumps(events)}\n\n".encode())
+                        self.wfile.flush()
+                except OSError:
+                    pass
+                finally:
+                    with bridge._lock:
+                        bridge._subscribers.remove(q)
+
+        return Handler
@@ -0,0 +1,161 @@
+"""Spielt aufgezeichnete Traces (runtime/trace.py) gegen die Fake-Bridge ab.
+
+Jeder Record geht über den vollen Schreibpfad - Dispatcher (Coalescing, Prioritäten, Lanes),
+HueApi mit Rate-Limiter, HttpClient - zu einer lokalen FakeBridge. So lässt sich messen, wie sich
+Queueing und Throttling bei echten Lastmustern (Szenen-Stürme am Abend, Chat-Bursts) verhalten.
+IDs aus dem Trace werden pro Ressourcentyp stabil auf Ressourcen der Fake-Bridge abgebildet.
+"""
+import math
+import time
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional, Union
+
+from huekit.api.http_client import HttpClient
+from huekit.api.hue_api import HueApi
+from huekit.runtime.dispatcher import Dispatcher, DispatcherStats
+from huekit.runtime.metrics import API_SECONDS, DISPATCH_QUEUE_SECONDS, RATE_LIMIT_WAIT, Histogram, InMemorySink
+from huekit.runtime.rate_limit import Budget, RateLimiter
+from huekit.runtime.trace import TraceRecord, TraceRecorder, read_trace
+from huekit.testing.fake_bridge import FakeBridge, FakeBridgeConfig, FakeBridgeStats, generate_resources
+
+LIGHTS_PER_ROOM = 4
+
+
+def _merged(sink: InMemorySink, name: str) -> Histogram:
+    """Ein Histogramm über alle Label-Kombinationen hinweg."""
+    total = Histogram(sink.buckets)
+    for hist in sink.histograms.get(name, {}).values():
+        total.counts = [a + b for a, b in zip(total.counts, hist.counts)]
+        total.sum += hist.sum
+        total.count += hist.count
+    return total
+
+
+@dataclass
+class ReplayReport:
+    records: int
+    skipped: int                # Records ohne JSON-Body (nicht über den Dispatcher abspielbar)
+    speed: Optional[float]      # None = so schnell wie möglich
+    trace_span_s: float
+    wall_s: float
+    max_lag_s: float            # wie weit das Einspeisen hinter dem Zeitplan des Traces lag
+    dispatcher: DispatcherStats
+    bridge: FakeBridgeStats
+    metrics: InMemorySink
+
+    def summary(self) -> dict:
+        def quantiles(name: str) -> dict:
+            hist = _merged(self.metrics, name)
+            out = {"count": hist.count, "mean_ms": round(hist.sum / hist.count * 1e3, 3) if hist.count else 0.0}
+            for label, q in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                # Bucket-Obergrenze; None = über dem größten Bucket
+                value = hist.quantile(q)
+                out[label] = None if math.isinf(value) else value * 1e3
+            return out
+
+        return {
+            "records": self.records,
+            "skipped": self.skipped,
+            "speed": self.speed if self.speed is not None else "max",
+            "trace_span_s": round(self.trace_span_s, 3),
+            "wall_s": round(self.wall_s, 3),
+            "max_lag_ms": round(self.max_lag_s * 1e3, 3),
+            "dispatcher": asdict(self.dispatcher),
+            "bridge": {"requests": self.bridge.requests, "puts": self.bridge.puts,
+                       "rate_limited": self.bridge.rate_limited},
+            "queue": quantiles(DISPATCH_QUEUE_SECONDS),
+            "rate_limit_wait": quantiles(RATE_LIMIT_WAIT),
+            "api": quantiles(API_SECONDS),
+        }
+
+
+class Replayer:
+    def __init__(self, records: Iterable[TraceRecord]):
+        self.records = sorted(records, key=lambda r: r.t)
+
+    @classmethod
+    def from_file(cls, path) -> "Replayer":
+        return cls(read_trace(path))
+
+    @property
+    def span_s(self) -> float:
+        return self.records[-1].t - self.records[0].t if self.records else 0.0
+
+    def targets(self) -> dict[str, list[str]]:
+        """Ressourcentyp -> IDs in der Reihenfolge ihres ersten Auftretens."""
+        seen: dict[str, dict[str, None]] = {}
+        for r in self.records:
+            seen.setdefault(r.rtype, {})[r.rid] = None
+        return {rtype: list(ids) for rtype, ids in seen.items()}
+
+    def fake_resources(self) -> dict[str, dict[str, dict]]:
+        """Topologie, die groß genug ist, dass jede Trace-ID eine eigene Fake-Ressource bekommt."""
+        targets = self.targets()
+        lights = len(targets.get("light", ()))
+        # Pro Raum ein grouped_light, dazu eins für die Zone und eins für bridge_home
+        groups = len(targets.get("grouped_light", ()))
+        rooms = max(1, math.ceil(lights / LIGHTS_PER_ROOM), groups - 2)
+        return generate_resources(rooms=rooms, lights_per_room=LIGHTS_PER_ROOM)
+
+    def id_map(self, resources: dict[str, dict[str, dict]]) -> dict[tuple[str, str], str]:
+        mapping: dict[tuple[str, str], str] = {}
+        for rtype, ids in self.targets().items():
+            fake = sorted(resources.get(rtype, {}))
+            if not fake:
+                continue
+            for i, rid in enumerate(ids):
+                mapping[(rtype, rid)] = fake[i % len(fake)]
+        return mapping
+
+    def run(self, *, speed: Optional[float] = 1.0,
+            config: Optional[FakeBridgeConfig] = None,
+            budgets: Optional[dict[str, Budget]] = None,
+            workers: int = 1,
+            drain_timeout_s: float = 60.0,
+            recorder: Optional[TraceRecorder] = None) -> ReplayReport:
+        """Spielt den Trace mit `speed`-facher Geschwindigkeit ab (None = ohne Pausen).
+
+        Mit `recorder` wird das Replay selbst wieder aufgezeichnet (IDs der Fake-Bridge).
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError(f"'speed' must be > 0 or None, got {speed}")
+        resources = self.fake_resources()
+        mapping = self.id_map(resources)
+        metrics = InMemorySink()
+        skipped = 0
+        max_lag = 0.0
+        with FakeBridge(resources, config) as bridge:
+            http = HttpClient(bridge.base_url, bridge.headers)
+            api = HueApi(http, RateLimiter(budgets), metrics=metrics, recorder=recorder)
+            dispatcher = Dispatcher(api, metrics=metrics, workers=workers)
+            dispatcher.start()
+            t0 = self.records[0].t if self.records else 0.0
+            start = time.perf_counter()
+            try:
+                for record in self.records:
+                    if speed is not None:
+                        due = (record.t - t0) / speed
+                        delay = due - (time.perf_counter() - start)
+                        if delay > 0:
+                            time.sleep(delay)
+                        else:
+                            max_lag = max(max_lag, -delay)
+                    payload = record.to_payload()
+                    rid = mapping.get((record.rtype, record.rid))
+                    if not isinstance(payload, dict) or rid is None:
+                        skipped += 1
+                        continue
+                    dispatcher.submit(record.rtype, rid, payload)
+            finally:
+                dispatcher.stop(drain=True, timeout=drain_timeout_s)
+                http.close()
+            wall_s = time.perf_counter() - start
+        return ReplayReport(records=len(self.records), skipped=skipped, speed=speed,
+                            trace_span_s=self.span_s, wall_s=wall_s, max_lag_s=max_lag,
+                            dispatcher=dispatcher.stats, bridge=bridge.stats, metrics=metrics)
+
+
+def replay(trace: Union[str, Iterable[TraceRecord]], **kwargs) -> ReplayReport:
+    """Kurzform: `replay("evening.trace", speed=10)`."""
+    replayer = Replayer.from_file(trace) if isinstance(trace, str) else Replayer(trace)
+    return replayer.run(**kwargs)
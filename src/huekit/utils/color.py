@@ -0,0 +1,159 @@
+from typing import Optional
+
+import numpy as np
+
+# Farbdreiecke der Hue-Lampen (CIE xy), siehe Hue Developer Docs "Color conversion"
+GAMUTS: dict[str, np.ndarray] = {
+    "A": np.array([[0.704, 0.296], [0.2151, 0.7106], [0.138, 0.08]]),
+    "B": np.array([[0.675, 0.322], [0.409, 0.518], [0.167, 0.04]]),
+    "C": np.array([[0.6915, 0.3083], [0.17, 0.7], [0.1532, 0.0475]]),
+}
+
+# sRGB (linear) -> XYZ, D65 - wie im alten srgb_to_xy
+_RGB_TO_XYZ = np.array([
+    [0.4124, 0.3576, 0.1805],
+    [0.2126, 0.7152, 0.0722],
+    [0.0193, 0.1192, 0.9505],
+])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+
+MIREK_MIN, MIREK_MAX = 153, 500
+
+
+def srgb_to_xy(r: int, g: int, b: int) -> tuple[float, float]:
+    """Skalare Referenz (unverändert aus src_old/hue_bridge.py)."""
+    def lin(u):
+        u = u/255
+        return pow((u+0.055)/1.055, 2.4) if u > 0.04045 else u/12.92
+    R, G, B = lin(r), lin(g), lin(b)
+    X = R*0.4124 + G*0.3576 + B*0.1805
+    Y = R*0.2126 + G*0.7152 + B*0.0722
+    Z = R*0.0193 + G*0.1192 + B*0.9505
+    denom = (X+Y+Z) or 1e-9
+    return X/denom, Y/denom
+
+
+def _as_unit_rgb(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint8:
+        return rgb.astype(np.float64) / 255.0
+    return rgb.astype(np.float64, copy=False)
+
+
+def linearize(rgb: np.ndarray) -> np.ndarray:
+    """sRGB-Gamma entfernen; Eingabe 0..1, beliebige Form (..., 3)."""
+    return np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+
+
+def rgb_to_xyb(rgb: np.ndarray, gamut: Optional[str] = None) -> np.ndarray:
+    """sRGB (uint8 0..255 oder float 0..1), Form (..., 3) -> (..., 3) mit x, y, Helligkeit 0..1."""
+    lin = linearize(_as_unit_rgb(rgb))
+    xyz = lin @ _RGB_TO_XYZ.T
+    total = xyz.sum(axis=-1, keepdims=True)
+    total[total == 0] = 1e-9
+    out = np.empty(xyz.shape, dtype=np.float64)
+    out[..., :2] = xyz[..., :2] / total
+    out[..., 2] = np.clip(xyz[..., 1], 0.0, 1.0)
+    if gamut is not None:
+        out[..., :2] = clip_to_gamut(out[..., :2], gamut)
+    return out
+
+
+def xyb_to_rgb(xyb: np.ndarray) -> np.ndarray:
+    """(..., 3) x, y, Helligkeit -> sRGB float 0..1 (Gamma-kodiert)."""
+    xyb = np.asarray(xyb, dtype=np.float64)
+    x, y, bri = xyb[..., 0], xyb[..., 1], xyb[..., 2]
+    y_safe = np.where(y == 0, 1e-9, y)
+    xyz = np.stack([bri / y_safe * x, bri, bri / y_safe * (1.0 - x - y)], axis=-1)
+    lin = np.clip(xyz @ _XYZ_TO_RGB.T, 0.0, None)
+    peak = lin.max(axis=-1, keepdims=True)
+    lin = np.where(peak > 1.0, lin / np.where(peak == 0, 1, peak), lin)
+    return np.where(lin <= 0.0031308, 12.92 * lin, 1.055 * lin ** (1 / 2.4) - 0.055)
+
+
+def hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    """(..., 3) Hue 0..1, Sättigung 0..1, Wert 0..1 -> sRGB float 0..1."""
+    hsv = np.asarray(hsv, dtype=np.float64)
+    h, s, v = hsv[..., 0] % 1.0, hsv[..., 1], hsv[..., 2]
+    k = (np.array([5.0, 3.0, 1.0]) + h[..., None] * 6.0) % 6.0
+    return v[..., None] - v[..., None] * s[..., None] * np.clip(np.minimum(k, 4.0 - k), 0.0, 1.0)
+
+
+def hsv_to_xyb(hsv: np.ndarray, gamut: Optional[str] = None) -> np.ndarray:
+    return rgb_to_xyb(hsv_to_rgb(hsv), gamut)
+
+
+def mirek_to_xy(mirek: np.ndarray) -> np.ndarray:
+    """Farbtemperatur (mirek) -> Punkt auf der Planck-Kurve (Kim et al. Näherung), Form (..., 2)."""
+    kelvin = 1e6 / np.clip(np.asarray(mirek, dtype=np.float64), MIREK_MIN, MIREK_MAX)
+    t = 1e3 / kelvin
+    x = np.where(kelvin <= 4000,
+                 -0.2661239 * t**3 - 0.2343589 * t**2 + 0.8776956 * t + 0.179910,
+                 -3.0258469 * t**3 + 2.1070379 * t**2 + 0.2226347 * t + 0.240390)
+    y = np.select(
+        [kelvin <= 2222, kelvin <= 4000],
+        [-1.1063814 * x**3 - 1.34811020 * x**2 + 2.18555832 * x - 0.20219683,
+         -0.9549476 * x**3 - 1.37418593 * x**2 + 2.09137015 * x - 0.16748867],
+        3.0817580 * x**3 - 5.87338670 * x**2 + 3.75112997 * x - 0.37001483,
+    )
+    return np.stack([x, y], axis=-1)
+
+
+def xy_to_mirek(xy: np.ndarray) -> np.ndarray:
+    """xy -> nächstliegende Farbtemperatur (McCamy), auf den Hue-Bereich 153..500 begrenzt."""
+    xy = np.asarray(xy, dtype=np.float64)
+    n = (xy[..., 0] - 0.3320) / (0.1858 - xy[..., 1])
+    kelvin = 449.0 * n**3 + 3525.0 * n**2 + 6823.3 * n + 5520.33
+    return np.clip(np.rint(1e6 / kelvin), MIREK_MIN, MIREK_MAX).astype(np.int64)
+
+
+def _closest_on_segment(p: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    ab = b - a
+    t = np.clip(((p - a) @ ab) / (ab @ ab), 0.0, 1.0)
+    return a + t[..., None] * ab
+
+
+def clip_to_gamut(xy: np.ndarray, gamut: str) -> np.ndarray:
+    """Punkte außerhalb des Farbdreiecks auf den nächsten Punkt der Dreieckskante ziehen."""
+    tri = GAMUTS[gamut]
+    xy = np.asarray(xy, dtype=np.float64)
+    r, g, b = tri
+    # Baryzentrischer Test: innen, wenn alle Kreuzprodukte dasselbe Vorzeichen haben
+    def cross(o, a, p):
+        return (a[0] - o[0]) * (p[..., 1] - o[1]) - (a[1] - o[1]) * (p[..., 0] - o[0])
+    c1, c2, c3 = cross(r, g, xy), cross(g, b, xy), cross(b, r, xy)
+    inside = ((c1 >= 0) & (c2 >= 0) & (c3 >= 0)) | ((c1 <= 0) & (c2 <= 0) & (c3 <= 0))
+    if inside.all():
+        return xy
+    candidates = np.stack([_closest_on_segment(xy, r, g),
+                           _closest_on_segment(xy, g, b),
+                           _closest_on_segment(xy, b, r)])
+    dist = ((candidates - xy) ** 2).sum(axis=-1)
+    nearest = np.take_along_axis(candidates, dist.argmin(axis=0)[None, ..., None], axis=0)[0]
+    return np.where(inside[..., None], xy, nearest)
+
+
+class ColorLUT:
+    """Vorberechnete RGB -> xyb-Tabelle für uint8-Eingaben (z.B. Video-Frames).
+
+    Bei bits=6 hat die Tabelle 64^3 Einträge (~6 MB); der Fehler durch die Quantisierung
+    liegt unter dem, was die Lampen darstellen können.
+    """
+
+    def __init__(self, gamut: Optional[str] = None, bits: int = 6):
+        if not 1 <= bits <= 8:
+            raise ValueError(f"'bits' must be in 1..8, got {bits}")
+        self.gamut = gamut
+        self.bits = bits
+        self.shift = 8 - bits
+        levels = 1 << bits
+        # Mitte jeder Quantisierungsstufe als Stützstelle
+        steps = (np.arange(levels) << self.shift) + ((1 << self.shift) >> 1)
+        grid = np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), axis=-1).reshape(-1, 3)
+        self.table = rgb_to_xyb(grid.astype(np.uint8), gamut).astype(np.float32)
+
+    def lookup(self, rgb: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        rgb = np.asarray(rgb, dtype=np.uint8)
+        q = (rgb >> self.shift).astype(np.intp)
+        index = (q[..., 0] << (2 * self.bits)) | (q[..., 1] << self.bits) | q[..., 2]
+        return np.take(self.table, index, axis=0, out=out)
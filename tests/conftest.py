@@ -0,0 +1,48 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from huekit.api.http_client import HttpClient  # noqa: E402
+from huekit.api.hue_api import HueApi  # noqa: E402
+from huekit.testing.fake_bridge import FakeBridge, FakeBridgeConfig, generate_resources  # noqa: E402
+
+
+def eventually(predicate, timeout: float = 3.0, interval: float = 0.01) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+
+@pytest.fixture
+def resources():
+    return generate_resources(rooms=2, lights_per_room=3)
+
+
+@pytest.fixture
+def bridge_config():
+    return FakeBridgeConfig()
+
+
+@pytest.fixture
+def bridge(resources, bridge_config):
+    with FakeBridge(resources, bridge_config) as b:
+        yield b
+
+
+@pytest.fixture
+def http(bridge):
+    client = HttpClient(bridge.base_url, bridge.headers)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def api(http):
+    return HueApi(http)
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+import pytest
+
+from huekit.api.http_client import AsyncHttpClient, HueBridgeError
+from huekit.api.hue_api import AsyncHueApi
+from huekit.services.group_service import AsyncGroupService
+from huekit.services.light_service import AsyncLightService
+
+
+@pytest.fixture
+def connections(bridge, monkeypatch):
+    """Zählt die TCP-Verbindungen, die die Fake-Bridge annimmt."""
+    accepted = []
+    lock = threading.Lock()
+    process = bridge._server.process_request
+
+    def counting(request, client_address):
+        with lock:
+            accepted.append(client_address)
+        return process(request, client_address)
+
+    monkeypatch.setattr(bridge._server, "process_request", counting)
+    return accepted
+
+
+def test_requests_share_the_bounded_keepalive_pool(bridge, connections):
+    async def run():
+        async with AsyncHttpClient(bridge.base_url, bridge.headers, pool_size=2) as client:
+            await asyncio.gather(*(client.get("light") for _ in range(10)))
+            await client.get("room")
+
+    asyncio.run(run())
+    assert bridge.stats.gets == 11
+    assert 1 <= len(connections) <= 2
+
+
+def test_errors_are_mapped_to_hue_bridge_error(bridge):
+    async def run():
+        async with AsyncHttpClient(bridge.base_url, bridge.headers) as client:
+            with pytest.raises(HueBridgeError) as missing:
+                await client.get("light/does-not-exist")
+            bridge.fail_next(1, status=503)
+            with pytest.raises(HueBridgeError) as unavailable:
+                await client.get("light")
+            return missing.value, unavailable.value
+
+    missing, unavailable = asyncio.run(run())
+    assert missing.status == 404 and missing.path == "light/does-not-exist"
+    assert "not found" in str(missing)
+    assert unavailable.status == 503 and "injected" in str(unavailable)
+
+
+def test_async_with_closes_the_session(bridge):
+    async def run():
+        async with AsyncHttpClient(bridge.base_url, bridge.headers) as client:
+            await client.get("light")
+            session = client._session
+            assert session is not None and not session.closed
+        return client, session
+
+    client, session = asyncio.run(run())
+    assert session.closed
+    assert client._session is None
+
+
+def test_async_services_write_through_to_the_bridge(bridge, resources):
+    light_id = next(iter(resources["light"]))
+    group_id = next(g for g, body in resources["grouped_light"].items() if body["owner"]["rtype"] == "room")
+
+    async def run():
+        async with AsyncHttpClient(bridge.base_url, bridge.headers) as http:
+            api = AsyncHueApi(http)
+            await AsyncLightService(api).set_brightness(light_id, 42)
+            await AsyncGroupService(api).turn_off(group_id)
+            result = await AsyncLightService(api).apply_many([(light_id, {"on": {"on": True}}),
+                                                              ("does-not-exist", {"on": {"on": True}})])
+            return result
+
+    result = asyncio.run(run())
+    assert resources["light"][light_id]["dimming"]["brightness"] == 42
+    assert resources["grouped_light"][group_id]["on"]["on"] is False
+    assert [item.ok for item in result.items] == [True, False]
+    assert resources["light"][light_id]["on"]["on"] is True
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from huekit.api.batch import BatchError
+from huekit.api.http_client import AsyncHttpClient, HueBridgeError
+from huekit.api.hue_api import AsyncHueApi
+from huekit.testing.fake_bridge import FakeBridgeConfig
+
+
+@pytest.fixture
+def bridge_config():
+    return FakeBridgeConfig(error_rate=0.3, latency_s=0.002, seed=3)
+
+
+def commands(resources: dict) -> list[tuple[str, str, dict]]:
+    # Je Lampe drei Helligkeiten nacheinander, verschränkt über alle Lampen
+    lights = sorted(resources["light"])
+    return [("light", lid, {"dimming": {"brightness": float(10 * step + n)}})
+            for step in range(1, 4) for n, lid in enumerate(lights)]
+
+
+def check(result, items, bridge, resources):
+    assert [(i.index, i.rtype, i.rid) for i in result.items] == [(n, rtype, rid) for n, (rtype, rid, _) in
+                                                                 enumerate(items)]
+    assert len(result.failed) == bridge.stats.injected_errors > 0
+    assert len(result.succeeded) == bridge.stats.puts == len(items) - len(result.failed)
+    for item in result.failed:
+        assert isinstance(item.error, HueBridgeError) and item.error.status == 503 and item.response is None
+    for item in result.succeeded:
+        assert item.response["data"] == [{"rid": item.rid, "rtype": "light"}] and item.seconds > 0
+    # Pro Lampe wird der Reihe nach gesendet: der Endstand ist der letzte erfolgreiche Befehl
+    last: dict[str, float] = {}
+    for item in result.succeeded:
+        last[item.rid] = items[item.index][2]["dimming"]["brightness"]
+    for lid, brightness in last.items():
+        assert resources["light"][lid]["dimming"]["brightness"] == brightness
+    assert result.wall_s > 0 and not result.ok
+
+
+def test_apply_many_reports_per_item_outcome(api, bridge, resources):
+    items = commands(resources)
+    result = api.apply_many(items, concurrency=4)
+    check(result, items, bridge, resources)
+    with pytest.raises(BatchError, match=f"{len(result.failed)} of {len(items)} commands failed"):
+        result.raise_for_errors()
+
+
+def test_async_apply_many_reports_per_item_outcome(bridge, resources):
+    items = commands(resources)
+
+    async def run():
+        async with AsyncHttpClient(bridge.base_url, bridge.headers) as http:
+            return await AsyncHueApi(http).apply_many(items, concurrency=4)
+
+    check(asyncio.run(run()), items, bridge, resources)
+
+
+def test_successful_batch_and_invalid_concurrency(bridge, api, resources):
+    bridge.config.error_rate = 0.0
+    lid = sorted(resources["light"])[0]
+    result = api.apply_many([("light", lid, {"on": {"on": True}})])
+    assert result.ok and result.failed == []
+    result.raise_for_errors()
+    with pytest.raises(ValueError, match="concurrency"):
+        api.apply_many([], concurrency=0)
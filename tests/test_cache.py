@@ -0,0 +1,100 @@
+import gzip
+import json
+import logging
+import time
+
+import pytest
+
+from conftest import eventually
+from huekit.repo.cache import CACHE_FORMAT, BridgeIdentity, TopologyCache, fetch_identity
+from huekit.repo.hue_repository import HueRepository
+
+URL = "https://10.0.0.2/clip/v2/resource"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TopologyCache(tmp_path / "cache")
+
+
+def test_save_load_round_trip(cache, resources):
+    identity = BridgeIdentity("001788fffe123456", "1.66.1966060010")
+    cache.save(URL, identity, resources)
+    entry = cache.load(URL + "/")                       # gleiche Bridge, gleiche Datei
+    assert entry.identity == identity
+    assert entry.resources == resources
+    assert 0 <= entry.age_s < 5
+    assert cache.load("https://10.0.0.3/clip/v2/resource") is None
+    assert not list(cache.directory.glob("*.tmp"))
+    cache.invalidate(URL)
+    assert cache.load(URL) is None
+    cache.invalidate(URL)                                 # fehlende Datei ist kein Fehler
+
+
+@pytest.mark.parametrize("content", [
+    b"definitely not gzip",
+    gzip.compress(b'{"format": 1, "bridge_id": ')[:-8],   # abgeschnitten
+    gzip.compress(b"not json"),
+], ids=["garbage", "truncated", "not-json"])
+def test_corrupt_file_is_ignored(cache, content, caplog):
+    cache.directory.mkdir(parents=True)
+    cache.path_for(URL).write_bytes(content)
+    with caplog.at_level(logging.WARNING, logger="huekit.repo.cache"):
+        assert cache.load(URL) is None
+    assert "unreadable cache file" in caplog.text
+
+
+@pytest.mark.parametrize("body", [
+    {"format": CACHE_FORMAT + 1, "bridge_id": "x", "swversion": "y", "saved_at": 0, "resources": {}},
+    {"format": CACHE_FORMAT, "bridge_id": "x"},
+    [1, 2, 3],
+], ids=["other-format", "incomplete", "not-an-object"])
+def test_unexpected_content_is_ignored(cache, body):
+    cache.directory.mkdir(parents=True)
+    cache.path_for(URL).write_bytes(gzip.compress(json.dumps(body).encode()))
+    assert cache.load(URL) is None
+
+
+def _ghost_cache(cache, bridge, resources, identity):
+    stale = json.loads(json.dumps(resources))
+    stale["light"]["ghost"] = {"id": "ghost", "type": "light", "on": {"on": True}}
+    cache.save(bridge.base_url, identity, stale)
+
+
+def test_repository_serves_cache_then_refreshes(cache, bridge, api, resources):
+    _ghost_cache(cache, bridge, resources, fetch_identity(api))
+    repo = HueRepository(api, cache)
+    try:
+        repo.start()
+        assert repo.synced.is_set()
+        assert eventually(lambda: not repo.from_cache)
+        assert repo.get("light", "ghost") is None
+        assert set(r["id"] for r in repo.all("light")) == set(resources["light"])
+    finally:
+        repo.stop()
+    # Der Sync hat die Datei mit dem frischen Stand überschrieben
+    assert "ghost" not in cache.load(bridge.base_url).resources["light"]
+
+
+def test_cache_from_other_firmware_is_discarded(cache, bridge, api, resources):
+    identity = fetch_identity(api)
+    _ghost_cache(cache, bridge, resources, BridgeIdentity(identity.bridge_id, "0.0.0"))
+    repo = HueRepository(api, cache)
+    try:
+        repo.start()
+        assert eventually(lambda: repo.identity == identity and not repo.from_cache)
+        assert repo.get("light", "ghost") is None
+        assert cache.load(bridge.base_url).identity == identity
+    finally:
+        repo.stop()
+
+
+def test_repository_without_cache_file_syncs_directly(cache, bridge, api, resources):
+    repo = HueRepository(api, cache)
+    try:
+        t0 = time.monotonic()
+        repo.start()
+        assert not repo.from_cache and time.monotonic() - t0 < 5
+        assert cache.load(bridge.base_url) is not None
+    finally:
+        repo.stop()
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from huekit.utils.color import GAMUTS, ColorLUT, clip_to_gamut, rgb_to_xyb, srgb_to_xy
+
+
+@pytest.fixture
+def rgb():
+    return np.random.default_rng(0).integers(0, 256, size=(2000, 3), dtype=np.uint8)
+
+
+def inside(xy: np.ndarray, gamut: str, eps: float = 1e-9) -> np.ndarray:
+    r, g, b = GAMUTS[gamut]
+
+    def cross(o, a):
+        return (a[0] - o[0]) * (xy[..., 1] - o[1]) - (a[1] - o[1]) * (xy[..., 0] - o[0])
+    c = np.stack([cross(r, g), cross(g, b), cross(b, r)])
+    return (c >= -eps).all(axis=0) | (c <= eps).all(axis=0)
+
+
+def test_vectorized_conversion_matches_scalar_reference(rgb):
+    xyb = rgb_to_xyb(rgb)
+    reference = np.array([srgb_to_xy(*map(int, px)) for px in rgb])
+    np.testing.assert_allclose(xyb[:, :2], reference, atol=1e-9)
+    # float-Eingabe 0..1 ergibt dasselbe wie uint8
+    np.testing.assert_allclose(rgb_to_xyb(rgb / 255.0), xyb, atol=1e-12)
+
+
+def test_black_does_not_divide_by_zero():
+    xyb = rgb_to_xyb(np.zeros((1, 3), dtype=np.uint8))
+    assert np.isfinite(xyb).all() and xyb[0, 2] == 0.0
+
+
+@pytest.mark.parametrize("gamut", sorted(GAMUTS))
+def test_points_outside_the_gamut_move_onto_the_edge(gamut):
+    tri = GAMUTS[gamut]
+    # Außerhalb: jeweils ein Stück hinter jeder Ecke und jeder Kantenmitte
+    center = tri.mean(axis=0)
+    targets = np.concatenate([tri, (tri + np.roll(tri, -1, axis=0)) / 2])
+    outside = targets + (targets - center) * 0.3
+    assert not inside(outside, gamut).any()
+    clipped = clip_to_gamut(outside, gamut)
+    assert inside(clipped, gamut).all()
+    # Auf einer Kante: Abstand zur nächsten Kante ~0
+    edge_dist = []
+    for a, b in zip(tri, np.roll(tri, -1, axis=0)):
+        ab = b - a
+        t = np.clip(((clipped - a) @ ab) / (ab @ ab), 0, 1)
+        edge_dist.append(np.linalg.norm(clipped - (a + t[:, None] * ab), axis=1))
+    np.testing.assert_allclose(np.min(edge_dist, axis=0), 0.0, atol=1e-12)
+    # Die Ecken selbst sind der nächste Punkt für Punkte hinter den Ecken
+    np.testing.assert_allclose(clipped[:3], tri, atol=1e-9)
+
+
+@pytest.mark.parametrize("gamut", sorted(GAMUTS))
+def test_points_inside_the_gamut_are_unchanged(gamut):
+    weights = np.random.default_rng(1).dirichlet([1, 1, 1], size=500)
+    points = weights @ GAMUTS[gamut]
+    np.testing.assert_array_equal(clip_to_gamut(points, gamut), points)
+
+
+def test_gamut_is_applied_by_rgb_to_xyb(rgb):
+    xyb = rgb_to_xyb(rgb, "A")
+    assert inside(xyb[:, :2], "A", eps=1e-12).all()
+    np.testing.assert_array_equal(xyb[:, 2], rgb_to_xyb(rgb)[:, 2])
+
+
+def test_lut_lookup_stays_close_to_exact_conversion(rgb):
+    lut = ColorLUT("C")
+    approx, exact = lut.lookup(rgb), rgb_to_xyb(rgb, "C")
+    assert approx.shape == exact.shape and approx.dtype == np.float32
+    # Bei sehr dunklen Pixeln ist die Farbart instabil; dort zählt nur die Helligkeit
+    lit = rgb.max(axis=1) >= 32
+    assert np.abs(approx - exact)[lit, :2].max() < 0.03
+    assert np.abs(approx - exact)[:, 2].max() < 0.02
+
+
+def test_lut_is_exact_at_its_grid_points(rgb):
+    lut = ColorLUT("C")
+    # Stützstellen liegen in der Mitte jeder Stufe: 2, 6, 10, ...
+    centers = (rgb & ~np.uint8(3)) | np.uint8(2)
+    np.testing.assert_allclose(lut.lookup(centers), rgb_to_xyb(centers, "C"), atol=1e-6)
+
+
+def test_lut_lookup_writes_into_out(rgb):
+    lut = ColorLUT(bits=4)
+    out = np.empty((len(rgb), 3), dtype=np.float32)
+    assert lut.lookup(rgb, out=out) is out
+    with pytest.raises(ValueError, match="bits"):
+        ColorLUT(bits=9)
@@ -0,0 +1,196 @@
+import threading
+import time
+
+import pytest
+
+from huekit.runtime.context import CommandContext, Priority
+from huekit.runtime.dispatcher import Dispatcher
+
+
+class RecordingApi:
+    """Stand-in für HueApi: protokolliert PUTs, kann blockieren oder fehlschlagen."""
+
+    def __init__(self, *, delay_s: float = 0.0, fail: bool = False):
+        self.calls: list[tuple[str, str, dict]] = []
+        self.delay_s = delay_s
+        self.fail = fail
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def put_resource(self, rtype, rid, payload, *, deadline=None):
+        self.gate.wait(5)
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        with self._lock:
+            self.calls.append((rtype, rid, payload))
+        if self.fail:
+            raise RuntimeError("bridge said no")
+        return {"errors": [], "data": []}
+
+
+@pytest.fixture
+def fake_api():
+    return RecordingApi()
+
+
+def test_coalesces_pending_commands_per_target(fake_api):
+    d = Dispatcher(fake_api)
+    for level in (10, 20, 30):
+        d.submit("light", "a", {"dimming": {"brightness": level}})
+    d.submit("light", "a", {"on": {"on": True}})
+    assert d.queue_depth == 1 and d.stats.merged == 3
+    d.start()
+    assert d.flush(2)
+    d.stop()
+    assert fake_api.calls == [("light", "a", {"dimming": {"brightness": 30}, "on": {"on": True}})]
+
+
+def test_color_modes_replace_each_other(fake_api):
+    d = Dispatcher(fake_api)
+    d.submit("light", "a", {"color_temperature": {"mirek": 300}})
+    d.submit("light", "a", {"color": {"xy": {"x": 0.3, "y": 0.3}}})
+    d.start()
+    d.stop()
+    assert fake_api.calls == [("light", "a", {"color": {"xy": {"x": 0.3, "y": 0.3}}})]
+
+
+def test_different_dynamics_are_not_merged(fake_api):
+    d = Dispatcher(fake_api)
+    d.submit("light", "a", {"on": {"on": True}, "dimming": {"brightness": 10}, "dynamics": {"duration": 0}})
+    d.submit("light", "a", {"dimming": {"brightness": 90}, "dynamics": {"duration": 2000}})
+    d.start()
+    d.stop()
+    assert [c[2]["dimming"]["brightness"] for c in fake_api.calls] == [10, 90]
+
+
+def test_newer_command_supersedes_covered_older_one(fake_api):
+    d = Dispatcher(fake_api)
+    d.submit("light", "a", {"dimming": {"brightness": 10}, "dynamics": {"duration": 0}})
+    d.submit("light", "a", {"dimming": {"brightness": 90}, "on": {"on": True}, "dynamics": {"duration": 500}})
+    assert d.queue_depth == 1
+    d.start()
+    d.stop()
+    assert len(fake_api.calls) == 1
+
+
+def test_priorities_are_served_most_important_first(fake_api):
+    d = Dispatcher(fake_api)
+    d.submit("light", "bg", {"on": {"on": True}}, CommandContext(Priority.BACKGROUND))
+    d.submit("light", "normal", {"on": {"on": True}})
+    d.submit("light", "ui", {"on": {"on": True}}, CommandContext.interactive())
+    d.start()
+    d.stop()
+    assert [c[1] for c in fake_api.calls] == ["ui", "normal", "bg"]
+
+
+def test_merge_raises_priority(fake_api):
+    d = Dispatcher(fake_api)
+    d.submit("light", "a", {"on": {"on": True}}, CommandContext(Priority.BACKGROUND))
+    d.submit("light", "b", {"on": {"on": True}})
+    d.submit("light", "a", {"on": {"on": False}}, CommandContext.interactive())
+    d.start()
+    d.stop()
+    assert [c[1] for c in fake_api.calls] == ["a", "b"]
+
+
+def test_expired_commands_are_dropped(fake_api):
+    d = Dispatcher(fake_api)
+    d.submit("light", "late", {"on": {"on": True}}, CommandContext(deadline=time.monotonic() - 1))
+    d.submit("light", "ok", {"on": {"on": True}}, CommandContext.background(timeout_s=60))
+    d.start()
+    d.stop()
+    assert [c[1] for c in fake_api.calls] == ["ok"]
+    assert d.stats.expired == 1 and d.stats.sent == 1
+
+
+def test_stop_with_drain_sends_everything():
+    api = RecordingApi(delay_s=0.01)
+    d = Dispatcher(api)
+    d.start()
+    for i in range(10):
+        d.submit("light", f"l{i}", {"on": {"on": True}})
+    d.stop(drain=True)
+    assert len(api.calls) == 10 and d.stats.sent == 10 and d.stats.dropped == 0
+
+
+def test_stop_without_drain_drops_backlog():
+    api = RecordingApi()
+    api.gate.clear()
+    d = Dispatcher(api)
+    d.start()
+    for i in range(10):
+        d.submit("light", f"l{i}", {"on": {"on": True}})
+    threading.Timer(0.1, api.gate.set).start()
+    start = time.monotonic()
+    d.stop(drain=False)
+    assert time.monotonic() - start < 1.0
+    # Nur der bereits laufende Request geht noch raus
+    assert len(api.calls) == 1
+    assert d.stats.sent == 1 and d.stats.dropped == 9
+    assert d.queue_depth == 0
+
+
+def test_failing_on_error_handler_does_not_kill_worker():
+    api = RecordingApi(fail=True)
+    seen = []
+
+    def on_error(target, payload, error):
+        seen.append(target)
+        raise ValueError("handler bug")
+
+    d = Dispatcher(api, on_error=on_error)
+    d.start()
+    d.submit("light", "a", {"on": {"on": True}})
+    d.submit("light", "b", {"on": {"on": True}})
+    assert d.flush(2)
+    d.stop()
+    assert seen == [("light", "a"), ("light", "b")]
+    assert d.stats.failed == 2
+
+
+def test_lanes_keep_per_target_order():
+    api = RecordingApi(delay_s=0.001)
+    d = Dispatcher(api, workers=4)
+    d.start()
+    for level in range(20):
+        for target in ("a", "b", "c", "d", "e"):
+            # Unterschiedliche dynamics -> kein Zusammenlegen, jeder Befehl geht einzeln raus
+            d.submit("light", target, {"dimming": {"brightness": level}, "on": {"on": True},
+                                       "dynamics": {"duration": level}})
+    d.stop(drain=True)
+    for target in ("a", "b", "c", "d", "e"):
+        levels = [c[2]["dimming"]["brightness"] for c in api.calls if c[1] == target]
+        assert levels == sorted(levels) and levels[-1] == 19
+    assert sum(d.lane_depths) == 0
+
+
+def test_merge_keeps_only_the_newer_dynamics(fake_api):
+    d = Dispatcher(fake_api)
+    d.submit("light", "a", {"dimming": {"brightness": 50}, "dynamics": {"duration": 500}})
+    d.submit("light", "a", {"dimming": {"brightness": 70}})
+    d.submit("light", "b", {"dimming": {"brightness": 50}})
+    d.submit("light", "b", {"dimming": {"brightness": 70}, "dynamics": {"duration": 100}})
+    d.start()
+    d.stop()
+    # Sofortige Änderung bleibt sofort, statt die alte Überblendzeit zu erben
+    assert ("light", "a", {"dimming": {"brightness": 70}}) in fake_api.calls
+    assert ("light", "b", {"dimming": {"brightness": 70}, "dynamics": {"duration": 100}}) in fake_api.calls
+
+
+def test_deadline_is_rechecked_after_rate_limit_wait(http, bridge, resources):
+    from huekit.api.hue_api import HueApi
+    from huekit.runtime.rate_limit import Budget, RateLimiter
+
+    # 1 Token, danach 2 s Wartezeit - länger als die Deadline des zweiten Befehls
+    limiter = RateLimiter({"grouped_light": Budget(rate=0.5, burst=1.0)})
+    errors = []
+    d = Dispatcher(HueApi(http, limiter), on_error=lambda *a: errors.append(a))
+    first, second = list(resources["grouped_light"])[:2]
+    d.submit("grouped_light", first, {"on": {"on": False}})
+    d.submit("grouped_light", second, {"on": {"on": False}}, CommandContext.background(timeout_s=0.3))
+    d.start()
+    d.stop()
+    assert bridge.stats.puts == 1
+    assert d.stats.sent == 1 and d.stats.expired == 1 and d.stats.failed == 0
+    assert errors == []
@@ -0,0 +1,46 @@
+import json
+import threading
+import time
+
+from huekit.effects.engine import EffectEngine
+from huekit.effects.keyframes import Effect, Keyframe
+
+
+class SlowApi:
+    """Jeder PUT dauert länger als ein Keyframe -> der Engine muss Keyframes zurückstellen."""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.start = time.perf_counter()
+        self.sent: list[tuple[float, dict]] = []
+        self._lock = threading.Lock()
+
+    def put_resource(self, rtype, rid, body):
+        with self._lock:
+            self.sent.append((time.perf_counter() - self.start, json.loads(body)))
+        time.sleep(self.latency_s)
+
+
+def test_deferred_keyframe_only_transitions_for_the_time_left():
+    api = SlowApi(latency_s=0.3)
+    effect = Effect("steps", tuple(Keyframe(0.2, brightness=b) for b in (10, 20, 30, 40, 50)), repeats=1)
+    with EffectEngine(api) as engine:
+        handle = engine.play("light", "l1", effect)
+        assert handle.wait(3)
+        time.sleep(0.4)
+    for at, body in api.sent[1:]:
+        # Zurückgestellt bei 0.2 s, gesendet bei ~0.3 s: höchstens die Restzeit bis zum nächsten Keyframe
+        next_keyframe = (int(at / 0.2) + 1) * 0.2
+        assert body["dynamics"]["duration"] <= (next_keyframe - at) * 1000 + 20
+    # Der letzte Keyframe geht immer raus, damit der Effekt im Endzustand landet
+    assert api.sent[-1][1]["dimming"]["brightness"] == 50
+    assert handle.sent + handle.dropped == len(effect.keyframes)
+
+
+def test_on_time_keyframes_use_full_transition():
+    api = SlowApi(latency_s=0.0)
+    effect = Effect("steps", (Keyframe(0.1, brightness=10), Keyframe(0.1, brightness=90)), repeats=1)
+    with EffectEngine(api) as engine:
+        assert engine.play("light", "l1", effect).wait(2)
+    assert [b["dimming"]["brightness"] for _, b in api.sent] == [10, 90]
+    assert all(b["dynamics"]["duration"] >= 90 for _, b in api.sent)
@@ -0,0 +1,160 @@
+import socket
+import struct
+
+import numpy as np
+import pytest
+
+from conftest import eventually
+from huekit.entertainment.pipeline import FramePipeline
+from huekit.entertainment.protocol import HEADER_SIZE, PROTOCOL_NAME, HueStreamEncoder, _to_u16
+from huekit.entertainment.stream import EntertainmentStream
+from huekit.entertainment.transport import UdpTransport
+from huekit.models.entertainment import EntertainmentConfiguration
+from huekit.utils.color import rgb_to_xyb
+
+CONFIG_ID = "1a8d99cc-967b-44f2-9202-43f976c0fa6b"
+
+
+def _channels(frame: bytes, n: int) -> list[tuple[int, int, int, int]]:
+    return list(struct.iter_unpack(">BHHH", frame[HEADER_SIZE:HEADER_SIZE + 7 * n]))
+
+
+def test_header_layout():
+    encoder = HueStreamEncoder(CONFIG_ID, [0, 1])
+    frame = bytes(encoder.encode([(0.0, 0.0, 0.0), (1.0, 1.0, 1.0)]))
+    assert frame[:9] == PROTOCOL_NAME
+    assert frame[9:11] == b"\x02\x00"
+    assert frame[11] == 1                    # Sequenz
+    assert frame[14] == 0x01                 # xy + Helligkeit
+    assert frame[16:52] == CONFIG_ID.encode()
+    assert len(frame) == HEADER_SIZE + 2 * 7
+    assert _channels(frame, 2) == [(0, 0, 0, 0), (1, 0xFFFF, 0xFFFF, 0xFFFF)]
+
+
+def test_encode_array_matches_encode():
+    rng = np.random.default_rng(1)
+    values = rng.uniform(-0.1, 1.1, size=(7, 3))
+    values[0] = (0.5, 0.25, 1 / 0xFFFF * 2.5)    # Rundung genau auf .5
+    a, b = HueStreamEncoder(CONFIG_ID, range(7)), HueStreamEncoder(CONFIG_ID, range(7))
+    assert bytes(a.encode(values.tolist())) == bytes(b.encode_array(values))
+
+
+def test_sequence_wraps():
+    encoder = HueStreamEncoder(CONFIG_ID, [0])
+    for _ in range(256):
+        frame = encoder.encode_raw()
+    assert frame[11] == 0
+
+
+@pytest.mark.parametrize("channels", [[], list(range(21))])
+def test_channel_count_is_checked(channels):
+    with pytest.raises(ValueError):
+        HueStreamEncoder(CONFIG_ID, channels)
+
+
+@pytest.fixture
+def config(resources) -> EntertainmentConfiguration:
+    return EntertainmentConfiguration.model_validate(next(iter(resources["entertainment_configuration"].values())))
+
+
+@pytest.fixture
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    yield sock
+    sock.close()
+
+
+def test_stream_sends_frames_to_udp_stand_in(api, bridge, config, receiver):
+    values = np.tile([0.3, 0.4, 0.5], (len(config.channel_ids), 1))
+    stream = EntertainmentStream(api, config, UdpTransport(*receiver.getsockname()), rate_hz=50,
+                                 source=lambda index, due: values)
+    with stream:
+        assert bridge.resources["entertainment_configuration"][config.id]["status"] == "active"
+        frames = [receiver.recv(2048) for _ in range(5)]
+    assert bridge.resources["entertainment_configuration"][config.id]["status"] == "inactive"
+    sequences = [f[11] for f in frames]
+    assert sequences == list(range(sequences[0], sequences[0] + 5))
+    expected = [(cid, _to_u16(0.3), _to_u16(0.4), _to_u16(0.5)) for cid in config.channel_ids]
+    assert all(_channels(f, len(config.channel_ids)) == expected for f in frames)
+
+
+def test_send_errors_drop_frames_but_keep_streaming(api, config):
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    closed_port = probe.getsockname()[1]
+    probe.close()
+    stream = EntertainmentStream(api, config, UdpTransport("127.0.0.1", closed_port), rate_hz=100)
+    with stream:
+        # ICMP "port unreachable" kommt beim nächsten send() als ConnectionRefusedError an
+        assert eventually(lambda: stream.send_errors >= 3)
+        assert stream.running
+        assert stream.error is None
+    assert stream.stats.dropped >= stream.send_errors
+
+
+def test_source_error_stops_stream_and_reports(api, config, receiver):
+    errors = []
+
+    def source(index, due):
+        if index >= 2:
+            raise RuntimeError("source broke")
+        return [(0.0, 0.0, 0.0)] * len(config.channel_ids)
+
+    stream = EntertainmentStream(api, config, UdpTransport(*receiver.getsockname()), rate_hz=100,
+                                 source=source, on_error=errors.append)
+    with stream:
+        assert eventually(lambda: not stream.running)
+    assert isinstance(stream.error, RuntimeError)
+    assert errors == [stream.error]
+    assert stream.frames_sent == 2
+
+
+# ---- FramePipeline
+QUADRANTS = np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255], [255, 255, 255]], dtype=np.uint8)
+# Oben links, oben rechts, unten links, unten rechts (Zeile +1 = oben)
+QUADRANT_POSITIONS = np.array([[-0.5, 0.0, 0.5], [0.5, 0.0, 0.5], [-0.5, 0.0, -0.5], [0.5, 0.0, -0.5]])
+
+
+def _quadrant_frame(height: int = 90, width: int = 160) -> np.ndarray:
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    h, w = height // 2, width // 2
+    frame[:h, :w], frame[:h, w:], frame[h:, :w], frame[h:, w:] = QUADRANTS
+    return frame
+
+
+def test_pipeline_maps_frame_regions_to_channels():
+    pipeline = FramePipeline([_quadrant_frame()], QUADRANT_POSITIONS, alpha=1.0, radius=0.1)
+    out = pipeline(0, 0.0)
+    np.testing.assert_allclose(pipeline.sampler.rgb, QUADRANTS)          # Raster liegt ganz im Quadranten
+    expected = rgb_to_xyb(QUADRANTS, "C")
+    np.testing.assert_allclose(out, expected, atol=0.03)
+    assert out[0, 0] > 0.6 and out[1, 1] > 0.55 and out[2, 1] < 0.1     # rot, grün, blau
+    assert out[3, 2] == pytest.approx(1.0, abs=0.02) and out[2, 2] < 0.1  # weiß hell, blau dunkel
+
+
+def test_pipeline_smooths_color_and_brightness_separately():
+    black = np.zeros_like(_quadrant_frame())
+    pipeline = FramePipeline([_quadrant_frame(), black, black], QUADRANT_POSITIONS,
+                             alpha=0.5, brightness_alpha=1.0, radius=0.1)
+    first = pipeline(0, 0.0).copy()
+    second = pipeline(1, 0.0)
+    target = rgb_to_xyb(np.zeros((4, 3), dtype=np.uint8), "C")
+    np.testing.assert_allclose(second[:, :2], (first[:, :2] + pipeline.converter.xyb[:, :2]) / 2, atol=1e-6)
+    np.testing.assert_allclose(second[:, 2], pipeline.converter.xyb[:, 2], atol=1e-6)   # Helligkeit folgt sofort
+    np.testing.assert_allclose(second[:, 2], target[:, 2], atol=0.01)
+    assert pipeline(2, 0.0) is second                                     # ein Puffer, in-place überschrieben
+
+
+def test_pipeline_skips_frames_by_source_fps_and_holds_last_value():
+    frames = [np.full((9, 16, 3), v, dtype=np.uint8) for v in (0, 50, 100, 150, 200)]
+    pipeline = FramePipeline(frames, QUADRANT_POSITIONS, source_fps=10.0, alpha=1.0)
+    pipeline(0, 100.0)
+    assert (pipeline.consumed, pipeline.skipped) == (1, 0)
+    pipeline(1, 100.35)                                                   # Frames 2 und 3 fällig, nur 4 zählt
+    assert (pipeline.consumed, pipeline.skipped) == (4, 2)
+    np.testing.assert_allclose(pipeline.sampler.rgb, 150)
+    last = pipeline(2, 101.0).copy()
+    assert pipeline.exhausted and pipeline.consumed == 5
+    np.testing.assert_array_equal(pipeline(3, 102.0), last)
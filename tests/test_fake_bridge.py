@@ -0,0 +1,33 @@
+import socket
+import struct
+import time
+
+import pytest
+
+from huekit.testing.fake_bridge import FakeBridgeConfig
+
+
+@pytest.fixture
+def bridge_config():
+    return FakeBridgeConfig(latency_s=0.05)
+
+
+def test_client_disconnect_does_not_print_tracebacks(bridge, capsys):
+    host, port = bridge._server.server_address[:2]
+    for _ in range(3):
+        sock = socket.create_connection((host, port))
+        sock.sendall(b"GET /clip/v2/resource/light HTTP/1.1\r\nHost: x\r\nhue-application-key: fake\r\n\r\n")
+        # RST statt FIN: die Antwort der Bridge läuft ins Leere
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        sock.close()
+    time.sleep(0.2)
+    assert bridge.stats.gets == 3
+    assert "Traceback" not in capsys.readouterr().err
+
+
+def test_put_updates_state_and_emits_group_fanout(bridge, api, resources):
+    gid = next(g for g, body in resources["grouped_light"].items() if body["owner"]["rtype"] == "room")
+    api.put_resource("grouped_light", gid, {"dimming": {"brightness": 33.0}})
+    lights = bridge._group_lights(bridge.resources["grouped_light"][gid])
+    assert lights
+    assert all(bridge.resources["light"][lid]["dimming"]["brightness"] == 33.0 for lid in lights)
@@ -0,0 +1,71 @@
+import time
+
+from huekit.api.http_client import HttpClient
+from huekit.api.hue_api import HueApi
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.rate_limit import Budget, RateLimiter
+from huekit.runtime.resolve import plan_fanout
+from huekit.services.light_service import LightService
+from huekit.testing.fake_bridge import FakeBridge, generate_resources
+
+ON = {"on": {"on": True}}
+OFF = {"on": {"on": False}}
+GROUPS = {"g1": frozenset({"a", "b", "c"}), "g2": frozenset({"d", "e"})}
+
+
+def test_uniform_costs_prefer_groups():
+    plan = plan_fanout({lid: ON for lid in "abcde"}, GROUPS)
+    assert sorted((c.rtype, c.rid) for c in plan.commands) == [("grouped_light", "g1"), ("grouped_light", "g2")]
+    assert plan.saved == 3
+
+
+def test_group_with_deviating_light_gets_override():
+    plan = plan_fanout({"a": ON, "b": ON, "c": {**ON, "dimming": {"brightness": 5.0}}}, GROUPS)
+    assert [(c.rtype, c.rid) for c in plan.commands] == [("grouped_light", "g1"), ("light", "c")]
+    assert plan.overrides == 1
+
+
+def test_partially_requested_group_is_not_used():
+    plan = plan_fanout({"a": ON, "b": ON}, GROUPS)
+    assert {c.rtype for c in plan.commands} == {"light"}
+
+
+def test_flexible_lights_may_ride_along():
+    plan = plan_fanout({"a": ON, "b": ON}, GROUPS, flexible={"c": ON})
+    assert [(c.rtype, c.rid) for c in plan.commands] == [("grouped_light", "g1")]
+    plan = plan_fanout({"a": ON, "b": ON}, GROUPS, flexible={"c": OFF})
+    assert {c.rtype for c in plan.commands} == {"light"}
+
+
+def test_rate_limited_costs_avoid_expensive_groups():
+    costs = RateLimiter().costs()                      # grouped_light 1/s, light 10/s
+    plan = plan_fanout({lid: ON for lid in "abcde"}, GROUPS, costs=costs)
+    assert {c.rtype for c in plan.commands} == {"light"}
+    big = {"g": frozenset(f"l{i}" for i in range(12))}
+    plan = plan_fanout({lid: ON for lid in big["g"]}, big, costs=costs)
+    assert [(c.rtype, c.rid) for c in plan.commands] == [("grouped_light", "g")]
+
+
+def test_set_states_with_default_limiter_drains_fast():
+    resources = generate_resources(rooms=4, lights_per_room=2, zones=0)
+    with FakeBridge(resources) as bridge:
+        http = HttpClient(bridge.base_url, bridge.headers)
+        api = HueApi(http, RateLimiter())
+        repo = HueRepository(api)
+        repo.sync()
+        # Drei komplette Räume: ohne Kostenmodell drei grouped_light-PUTs (~2 s bei 1/s)
+        rooms = [ls for gid, ls in sorted(repo.group_memberships().items())
+                 if repo.resolve_group_room(gid) is not None][:3]
+        lights = sorted(lid for ls in rooms for lid in ls)
+        assert plan_fanout({lid: ON for lid in lights}, repo.group_memberships()).groups_used == 3
+        start = time.monotonic()
+        plan = LightService(api, repo).set_states({lid: ON for lid in lights})
+        elapsed = time.monotonic() - start
+        http.close()
+    assert plan.groups_used == 0 and len(plan.commands) == 6
+    assert elapsed < 1.0
+
+
+def test_costs_follow_budgets():
+    limiter = RateLimiter({"light": Budget(20.0), "grouped_light": Budget(0.5)})
+    assert limiter.costs() == {"light": 0.05, "grouped_light": 2.0}
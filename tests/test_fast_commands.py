@@ -0,0 +1,22 @@
+import json
+
+import pytest
+
+from huekit.commands.fast import color_body, dimming_body, encode_state, on_body
+
+
+def test_encode_state_builds_valid_json():
+    body = encode_state(on=True, brightness=42, xy=(0.3, 0.4), duration_ms=250)
+    assert json.loads(body) == {"on": {"on": True}, "dimming": {"brightness": 42.0},
+                                "color": {"xy": {"x": 0.3, "y": 0.4}}, "dynamics": {"duration": 250}}
+
+
+def test_helpers():
+    assert json.loads(on_body(False)) == {"on": {"on": False}}
+    assert json.loads(dimming_body(10.5)) == {"dimming": {"brightness": 10.5}}
+    assert json.loads(color_body((0.1, 0.2), 0)) == {"color": {"xy": {"x": 0.1, "y": 0.2}}, "dynamics": {"duration": 0}}
+
+
+def test_encode_state_without_fields_is_rejected():
+    with pytest.raises(ValueError, match="no fields set"):
+        encode_state()
@@ -0,0 +1,88 @@
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from huekit.models.fast import _UNSET, MODELS, LightView, decode_list, decode_one, view_class
+from huekit.models.light import LightModel
+
+
+def same(view, model) -> bool:
+    """Rekursiver Vergleich View <-> validiertes Modell über alle Modellfelder."""
+    if isinstance(model, BaseModel):
+        return all(same(getattr(view, name), getattr(model, name)) for name in type(model).model_fields)
+    if isinstance(model, list):
+        return isinstance(view, tuple) and len(view) == len(model) and all(map(same, view, model))
+    return view == model
+
+
+@pytest.mark.parametrize("rtype", sorted(MODELS))
+def test_views_expose_the_same_values_as_model_validate(api, rtype):
+    body = api.list_resource(rtype)
+    views = decode_list(body, rtype)
+    assert len(views) == len(body["data"]) > 0
+    for view, raw in zip(views, body["data"]):
+        model = MODELS[rtype].model_validate(raw)
+        assert same(view, model)
+        assert view.to_model() == model
+        assert view.raw is raw
+
+
+def test_typed_list_through_api(api, resources):
+    lights = api.list_typed("light")
+    assert {light.id for light in lights} == set(resources["light"])
+    assert all(isinstance(light, LightView) for light in lights)
+
+
+def test_nested_views_are_built_lazily_and_cached():
+    raw = {"id": "l1", "metadata": {"name": "Desk", "archetype": "sultan_bulb"}, "on": {"on": True},
+           "color": {"xy": {"x": 0.3, "y": 0.4}}}
+    view = LightView(raw)
+    assert view._c_color is _UNSET                                     # noch nicht gelesen
+    first = view.color
+    assert first is view.color and first.xy is view.color.xy
+    assert view.on.is_on is True                                       # Alias "on" -> is_on
+    # Methoden des Modells funktionieren auch auf Views
+    device = decode_one({"id": "d", "metadata": {"name": "x"},
+                         "services": [{"rid": "l1", "rtype": "light"}, {"rid": "z", "rtype": "zigbee_connectivity"}]},
+                        MODELS["device"])
+    assert device.service_ids("light") == ["l1"]
+    assert decode_one(None, LightModel) is None
+
+
+def test_missing_optional_fields_fall_back_to_model_defaults():
+    raw = {"id": "l1", "metadata": {"name": "Desk", "archetype": "sultan_bulb"}, "on": {"on": False}}
+    view, model = LightView(raw), LightModel.model_validate(raw)
+    assert view.dimming is None and view.color is None and view.owner is None
+    assert same(view, model)
+    room = decode_one({"id": "r", "metadata": {"name": "Kitchen"}}, MODELS["room"])
+    assert room.children == () and room.type == "room"
+
+
+def test_missing_required_field_fails_on_access_not_on_decode():
+    raw = {"id": "l1", "on": {"on": True}}                 # ohne metadata
+    view = decode_list({"data": [raw]}, "light")[0]
+    assert view.id == "l1"
+    with pytest.raises(KeyError):
+        view.metadata
+    with pytest.raises(ValidationError):
+        view.to_model()
+
+
+def test_unknown_fields_are_kept_in_raw_but_not_exposed():
+    raw = {"id": "l1", "metadata": {"name": "Desk", "archetype": "sultan_bulb"}, "on": {"on": True},
+           "effects": {"status": "candle"}}
+    view = LightView(raw)
+    assert view.raw["effects"] == {"status": "candle"}
+    with pytest.raises(AttributeError):
+        view.effects
+    with pytest.raises(AttributeError):
+        view.id = "other"                                  # Views sind unveränderlich
+    assert not hasattr(view.to_model(), "effects")
+
+
+def test_views_compare_by_raw_data_and_hash_by_id():
+    raw = {"id": "l1", "metadata": {"name": "Desk", "archetype": "sultan_bulb"}, "on": {"on": True}}
+    a, b = LightView(raw), LightView(dict(raw))
+    assert a == b and hash(a) == hash(b) and {a, b} == {a}
+    assert a != LightView({**raw, "on": {"on": False}})
+    assert view_class(LightModel) is LightView
+    assert repr(a) == "LightModelView('l1')"
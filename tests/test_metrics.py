@@ -0,0 +1,96 @@
+import re
+
+import pytest
+
+from huekit.api.http_client import HttpClient, HueBridgeError
+from huekit.api.hue_api import HueApi
+from huekit.runtime.metrics import (API_SECONDS, HTTP_ERRORS, HTTP_IN_FLIGHT, HTTP_SECONDS, RATE_LIMIT_WAIT,
+                                    SERVICE_SECONDS, Histogram, MultiSink, PrometheusSink)
+from huekit.runtime.rate_limit import RateLimiter
+from huekit.services.light_service import LightService
+
+
+def test_histogram_buckets_and_quantile():
+    hist = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+    assert hist.counts == [2, 1, 1]          # <= 0.1, <= 1.0, +Inf
+    assert hist.count == 4 and hist.sum == pytest.approx(3.65)
+    assert hist.quantile(0.5) == 0.1
+    assert hist.quantile(0.75) == 1.0
+    assert hist.quantile(1.0) == float("inf")
+
+
+def test_prometheus_render_format():
+    sink = PrometheusSink(buckets=(0.1, 1.0))
+    sink.inc("hue_things_total", labels={"rtype": "light"})
+    sink.inc("hue_things_total", 2, labels={"rtype": "light"})
+    sink.inc("hue_things_total", labels={"note": 'say "hi"\n'})
+    sink.set_gauge("hue_depth", 3)
+    sink.observe("hue_latency_seconds", 0.05, {"op": "get"})
+    sink.observe("hue_latency_seconds", 0.5, {"op": "get"})
+    sink.observe("hue_latency_seconds", 5.0, {"op": "get"})
+
+    lines = sink.render().splitlines()
+    assert lines == [
+        "# TYPE hue_things_total counter",
+        'hue_things_total{rtype="light"} 3.0',
+        'hue_things_total{note="say \\"hi\\"\\n"} 1.0',
+        "# TYPE hue_depth gauge",
+        "hue_depth 3.0",
+        "# TYPE hue_latency_seconds histogram",
+        'hue_latency_seconds_bucket{op="get",le="0.1"} 1',
+        'hue_latency_seconds_bucket{op="get",le="1.0"} 2',
+        'hue_latency_seconds_bucket{op="get",le="+Inf"} 3',
+        'hue_latency_seconds_sum{op="get"} 5.55',
+        'hue_latency_seconds_count{op="get"} 3',
+    ]
+    sample = re.compile(r'^[a-z_]+(\{([a-z_]+="([^"\\]|\\.)*",?)+\})? [-+0-9.eInf]+$')
+    assert all(line.startswith("# TYPE ") or sample.match(line) for line in lines)
+
+
+def test_multi_sink_fans_out():
+    a, b = PrometheusSink(), PrometheusSink()
+    sink = MultiSink(a, b)
+    sink.inc("c")
+    sink.observe("h", 0.2)
+    sink.add_gauge("g", 2)
+    sink.add_gauge("g", -1)
+    for s in (a, b):
+        assert s.counter("c") == 1 and s.histogram("h").count == 1 and s.gauge("g") == 1
+
+
+def test_requests_against_fake_bridge_are_counted(bridge, resources):
+    sink = PrometheusSink()
+    http = HttpClient(bridge.base_url, bridge.headers, metrics=sink)
+    try:
+        api = HueApi(http, RateLimiter(), metrics=sink)
+        service = LightService(api)
+        light_ids = list(resources["light"])[:2]
+        for _ in range(3):
+            api.list_lights()
+        for lid in light_ids:
+            service.turn_on(lid)
+        with pytest.raises(HueBridgeError):
+            api.get_light("does-not-exist")
+        bridge.fail_next(1, status=503)
+        with pytest.raises(HueBridgeError):
+            service.turn_off(light_ids[0])
+    finally:
+        http.close()
+
+    get, put = {"method": "GET", "rtype": "light"}, {"method": "PUT", "rtype": "light"}
+    assert sink.histogram(HTTP_SECONDS, get).count == 4
+    assert sink.histogram(HTTP_SECONDS, put).count == 3
+    assert sink.counter(HTTP_ERRORS, {**get, "status": "404"}) == 1
+    assert sink.counter(HTTP_ERRORS, {**put, "status": "503"}) == 1
+    assert sink.gauge(HTTP_IN_FLIGHT) == 0
+    assert sink.histogram(API_SECONDS, {"op": "list", "rtype": "light"}).count == 3
+    assert sink.histogram(API_SECONDS, {"op": "put", "rtype": "light"}).count == 3
+    assert sink.histogram(RATE_LIMIT_WAIT, {"rtype": "light"}).count == 3
+    assert sink.histogram(SERVICE_SECONDS, {"service": "light", "op": "turn_on"}).count == 2
+    assert sink.histogram(SERVICE_SECONDS, {"service": "light", "op": "turn_off"}).count == 1
+
+    text = sink.render()
+    assert f'{HTTP_ERRORS}{{method="GET",rtype="light",status="404"}} 1.0' in text
+    assert f'{HTTP_SECONDS}_count{{method="PUT",rtype="light"}} 3' in text
@@ -0,0 +1,98 @@
+import pytest
+
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.resolve import EXACT, FUZZY, PREFIX, NameIndex, normalize_name
+
+
+def res(rtype: str, rid: str, name: str) -> dict:
+    return {"id": rid, "type": rtype, "metadata": {"name": name}}
+
+
+@pytest.fixture
+def index():
+    index = NameIndex()
+    index.load({
+        "room": {"r1": res("room", "r1", "Wohnzimmer"), "r2": res("room", "r2", "Küche")},
+        "zone": {"z1": res("zone", "z1", "Wohnbereich")},
+        "grouped_light": {"g1": {"id": "g1", "type": "grouped_light", "owner": {"rid": "r1", "rtype": "room"}},
+                          "g2": {"id": "g2", "type": "grouped_light", "owner": {"rid": "r2", "rtype": "room"}},
+                          "g3": {"id": "g3", "type": "grouped_light", "owner": {"rid": "z1", "rtype": "zone"}}},
+        "light": {"l1": res("light", "l1", "Wohnzimmer Decke"), "l2": res("light", "l2", "Küche Decke"),
+                  "l3": res("light", "l3", "Stehlampe"), "l4": res("light", "l4", "Stehlampe")},
+    })
+    return index
+
+
+def test_normalize_name():
+    assert normalize_name("  Küche-Decke (Süd) ") == "kuche decke sud"
+    assert normalize_name("Straße") == "strasse"
+    assert normalize_name("???") == ""
+
+
+def test_exact_match_ignores_case_accents_and_punctuation(index):
+    match = index.best("küche")
+    assert (match.rtype, match.rid, match.kind, match.score) == ("room", "r2", EXACT, 1.0)
+    assert match.group == "g2"                      # Raum -> sein grouped_light
+    assert (index.best("KUECHE").rid, index.best("KUECHE").kind) == ("r2", FUZZY)   # ue statt ü: nur unscharf
+    assert index.best("wohnzimmer-decke").rid == "l1"
+
+
+def test_prefix_matches_whole_names_and_inner_words(index):
+    matches = index.resolve("wohn")
+    assert [m.kind for m in matches] == [PREFIX] * 3
+    assert {m.rid for m in matches} == {"r1", "z1", "l1"}
+    # Wortanfang im Namensinneren: "deck" findet beide Decken, aber schwächer als ein Namensanfang
+    decke = index.resolve("deck", rtypes=["light"])
+    assert {m.rid for m in decke} == {"l1", "l2"} and all(m.score < 0.8 for m in decke)
+    assert index.resolve("wohnz")[0].score > index.resolve("wohn")[0].score   # mehr getippt = besser
+
+
+def test_exact_beats_prefix(index):
+    index.upsert(res("light", "l5", "Küche Spot"))
+    matches = index.resolve("küche")
+    assert matches[0].kind == EXACT and matches[0].rid == "r2"
+    assert {m.rid for m in matches[1:]} == {"l2", "l5"} and all(m.kind == PREFIX for m in matches[1:])
+
+
+def test_fuzzy_fallback_for_typos(index):
+    match = index.best("wohnzimer")
+    assert match.kind == FUZZY and match.rid == "r1" and match.score < 0.69
+    assert index.best("stelampe").rid in {"l3", "l4"}
+    assert index.resolve("xyzzy") == []
+
+
+def test_ambiguous_names_return_all_candidates(index):
+    matches = index.resolve("stehlampe")
+    assert [(m.rid, m.kind, m.score) for m in matches] == [("l3", EXACT, 1.0), ("l4", EXACT, 1.0)]
+    assert matches[0].group is None                 # Lampen haben kein eigenes grouped_light
+    assert index.resolve("stehlampe", limit=1) == matches[:1]
+
+
+def test_rtype_filter_and_group_resolution(index):
+    assert index.resolve("wohnbereich", rtypes=["light"]) == []
+    match = index.best("wohnbereich", rtypes=("grouped_light", "room", "zone"))
+    assert (match.rtype, match.group) == ("zone", "g3")
+
+
+def test_incremental_rename_and_remove(index):
+    index.upsert(res("room", "r2", "Esszimmer"))
+    assert index.resolve("küche", rtypes=["room"]) == []
+    assert index.best("esszimmer").rid == "r2"
+    index.remove("light", "l3")
+    assert [m.rid for m in index.resolve("stehlampe")] == ["l4"]
+    index.remove("grouped_light", "g1")
+    assert index.best("wohnzimmer").group is None
+    before = len(index)
+    index.upsert(res("light", "l4", "Stehlampe"))   # unveränderter Name ist ein No-op
+    assert len(index) == before
+
+
+def test_repository_resolves_group_names(api, resources):
+    repo = HueRepository(api)
+    repo.sync()
+    room = next(r for r in resources["room"].values() if r["metadata"]["name"] == "Room 2")
+    group = next(g for g, body in resources["grouped_light"].items() if body["owner"]["rid"] == room["id"])
+    assert repo.resolve_group("room 2") == group
+    assert repo.resolve_name("Room 2 Light 1")[0].rtype == "light"
+    with pytest.raises(KeyError, match="no room, zone or group"):
+        repo.resolve_group("Garage")
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from conftest import eventually
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.context import OptimisticState
+from huekit.services.light_service import LightService
+
+
+class StubRepo:
+    def __init__(self, brightness: float = 10.0):
+        self.light = {"id": "l1", "type": "light", "on": {"on": True}, "dimming": {"brightness": brightness}}
+        self.group = {"id": "g1", "type": "grouped_light", "on": {"on": True}}
+
+    def get(self, rtype, rid):
+        return self.light if rtype == "light" else self.group
+
+    def group_memberships(self):
+        return {"g1": frozenset({"l1"})}
+
+
+@pytest.fixture
+def repo():
+    return StubRepo()
+
+
+def brightness(state: OptimisticState) -> float:
+    return state.get("light", "l1")["dimming"]["brightness"]
+
+
+def test_prediction_is_visible_until_confirmed(repo):
+    state = OptimisticState(repo)
+    write = state.begin("light", "l1", {"dimming": {"brightness": 40.0}, "dynamics": {"duration": 0}})
+    assert brightness(state) == 40.0
+    assert "dynamics" not in state.get("light", "l1")
+    assert repo.light["dimming"]["brightness"] == 10.0     # Repository bleibt unangetastet
+    state.confirm(write)
+    repo.light["dimming"]["brightness"] = 40.0               # Event ist angekommen
+    assert not state.is_pending("light", "l1")
+    assert len(state) == 0
+
+
+def test_rollback_restores_bridge_state(repo):
+    state = OptimisticState(repo)
+    with pytest.raises(RuntimeError):
+        with state.track("light", "l1", {"dimming": {"brightness": 40.0}}):
+            raise RuntimeError("PUT failed")
+    assert brightness(state) == 10.0
+
+
+def test_unconfirmed_ack_loses_after_settle(repo):
+    state = OptimisticState(repo, settle_s=0.05)
+    state.confirm(state.begin("light", "l1", {"dimming": {"brightness": 40.0}}))
+    assert brightness(state) == 40.0
+    time.sleep(0.06)
+    assert brightness(state) == 10.0
+
+
+def test_group_write_predicts_member_lights(repo):
+    state = OptimisticState(repo)
+    state.begin("grouped_light", "g1", {"on": {"on": False}})
+    assert state.get("grouped_light", "g1")["on"]["on"] is False
+    assert state.get("light", "l1")["on"]["on"] is False
+
+
+def test_confirmed_newer_write_supersedes_older_one(repo):
+    state = OptimisticState(repo)
+    older = state.begin("light", "l1", {"dimming": {"brightness": 30.0}})
+    newer = state.begin("light", "l1", {"dimming": {"brightness": 70.0}})
+    state.confirm(older)
+    state.confirm(newer)
+    repo.light["dimming"]["brightness"] = 70.0
+    assert brightness(state) == 70.0
+    assert len(state) == 0
+
+
+def test_older_write_keeps_fields_the_confirmed_one_does_not_cover(repo):
+    state = OptimisticState(repo)
+    state.begin("light", "l1", {"on": {"on": False}, "dimming": {"brightness": 30.0}})
+    state.begin("light", "l1", {"dimming": {"brightness": 70.0}})
+    later = state.begin("light", "l1", {"dimming": {"brightness": 90.0}})
+    repo.light["dimming"]["brightness"] = 70.0
+    raw = state.get("light", "l1")
+    assert raw["on"]["on"] is False            # nicht überdeckt -> Vorhersage bleibt
+    assert raw["dimming"]["brightness"] == 90.0  # jüngerer, offener Write liegt weiter oben
+    state.rollback(later)
+    assert brightness(state) == 70.0
+
+
+def test_light_service_reads_its_own_writes(api, resources):
+    repo = HueRepository(api)
+    repo.start()
+    try:
+        state = OptimisticState(repo)
+        lights = LightService(api, repo, state)
+        lid = sorted(resources["light"])[0]
+        lights.set_brightness(lid, 30, duration_ms=0)
+        lights.set_brightness(lid, 70, duration_ms=0)
+        assert state.get_light(lid).dimming.brightness == 70.0
+        assert eventually(lambda: not state.is_pending("light", lid))
+        assert state.get_light(lid).dimming.brightness == 70.0
+    finally:
+        repo.stop()
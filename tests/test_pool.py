@@ -0,0 +1,85 @@
+import pytest
+
+from huekit.repo.cache import TopologyCache
+from huekit.runtime.pool import BridgePool
+from huekit.testing.fake_bridge import FakeBridge, FakeBridgeConfig, generate_resources
+
+
+@pytest.fixture
+def bridges():
+    # Verschiedene Seeds -> disjunkte IDs, wie bei zwei echten Bridges
+    with FakeBridge(generate_resources(rooms=2, lights_per_room=2, seed=1), FakeBridgeConfig(seed=1)) as a, \
+            FakeBridge(generate_resources(rooms=1, lights_per_room=3, seed=2), FakeBridgeConfig(seed=2)) as b:
+        yield {"upstairs": a, "downstairs": b}
+
+
+@pytest.fixture
+def pool(bridges, tmp_path):
+    pool = BridgePool(cache=TopologyCache(tmp_path))
+    for name, fake in bridges.items():
+        pool.add_bridge(name, fake.base_url, fake.headers)
+    pool.sync()
+    yield pool
+    pool.close()
+
+
+def test_sync_routes_every_resource_to_its_bridge(pool, bridges):
+    for name, fake in bridges.items():
+        for rtype in ("light", "room", "grouped_light"):
+            for rid in fake.resources[rtype]:
+                assert pool.bridge_for(rid).name == name
+    with pytest.raises(KeyError, match="does not belong"):
+        pool.bridge_for("unknown")
+
+
+def test_all_off_sends_one_home_group_put_per_bridge(pool, bridges):
+    for fake in bridges.values():
+        for light in fake.resources["light"].values():
+            light["on"]["on"] = True
+    result = pool.all_off()
+    assert result.ok and result.sent == 2
+    for fake in bridges.values():
+        assert fake.stats.puts == 1
+        assert not any(light["on"]["on"] for light in fake.resources["light"].values())
+
+
+def test_apply_shards_commands_by_owner(pool, bridges):
+    up, down = (next(iter(fake.resources["light"])) for fake in bridges.values())
+    result = pool.apply([("light", up, {"dimming": {"brightness": 10.0}}),
+                         ("light", down, {"dimming": {"brightness": 20.0}}),
+                         ("light", down, {"dimming": {"brightness": 30.0}})])
+    assert result.ok and result.sent == 3
+    assert bridges["upstairs"].resources["light"][up]["dimming"]["brightness"] == 10.0
+    assert bridges["downstairs"].resources["light"][down]["dimming"]["brightness"] == 30.0   # Reihenfolge bleibt
+    assert bridges["upstairs"].stats.puts == 1 and bridges["downstairs"].stats.puts == 2
+
+
+def test_apply_collects_failures_per_command(pool, bridges):
+    up = next(iter(bridges["upstairs"].resources["light"]))
+    down = next(iter(bridges["downstairs"].resources["light"]))
+    bridges["downstairs"].fail_next(1, status=503)
+    result = pool.apply([("light", up, {"on": {"on": True}}), ("light", down, {"on": {"on": True}})])
+    assert result.sent == 1
+    assert [target for target, _ in result.failed] == [("light", down)]
+
+
+def test_sync_writes_one_cache_file_per_bridge(pool, bridges, tmp_path):
+    cache = TopologyCache(tmp_path)
+    assert len(list(tmp_path.glob("hue-*.json.gz"))) == 2
+    for fake in bridges.values():
+        entry = cache.load(fake.base_url)
+        assert entry is not None
+        assert entry.identity.bridge_id == next(iter(fake.resources["bridge"].values()))["bridge_id"]
+        assert set(entry.resources["light"]) == set(fake.resources["light"])
+
+    # Ein zweiter Pool startet aus dem Cache und findet die besitzende Bridge ohne Sync
+    warm = BridgePool(cache=cache)
+    try:
+        for name, fake in bridges.items():
+            warm.add_bridge(name, fake.base_url, fake.headers)
+        for bridge in warm.bridges.values():
+            assert bridge.repo.load_cached() is not None
+        lid = next(iter(bridges["downstairs"].resources["light"]))
+        assert warm.bridge_for(lid).name == "downstairs"
+    finally:
+        warm.close()
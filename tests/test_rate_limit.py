@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from huekit.runtime import rate_limit
+from huekit.runtime.rate_limit import Budget, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Ersetzt das time-Modul in rate_limit: monotonic() ist steuerbar, sleep() spult vor."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+def test_bucket_refills_at_rate_up_to_burst(clock):
+    bucket = TokenBucket(Budget(rate=2.0, burst=3.0))
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    clock.now += 0.5                       # +1 Token
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 60                        # nie mehr als burst
+    assert sum(bucket.try_acquire() for _ in range(5)) == 3
+
+
+def test_reservations_queue_up_in_order(clock):
+    bucket = TokenBucket(Budget(rate=4.0, burst=1.0))
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.25, 0.5, 0.75]
+
+
+def test_budgets_are_per_rtype_and_bridge(clock):
+    limiter = RateLimiter({"light": Budget(rate=10.0, burst=2.0), "grouped_light": Budget(rate=1.0, burst=1.0)})
+    assert [limiter.acquire("light") for _ in range(3)] == [0.0, 0.0, pytest.approx(0.1)]
+    assert limiter.acquire("grouped_light") == 0.0            # eigener Bucket
+    assert limiter.acquire("grouped_light") == pytest.approx(1.0)
+    assert limiter.acquire("grouped_light", bridge="other") == 0.0
+    assert limiter.acquire("scene") == 0.0                    # Default-Budget
+    stats = limiter.stats()
+    assert stats[("default", "grouped_light")].waited == 1
+    assert stats[("default", "light")].max_wait_s == pytest.approx(0.1)
+    assert limiter.costs() == {"light": pytest.approx(0.1), "grouped_light": pytest.approx(1.0)}
+
+
+def test_acquire_blocks_until_a_slot_is_free():
+    limiter = RateLimiter({"light": Budget(rate=20.0, burst=1.0)})
+    limiter.acquire("light")
+    t0 = time.perf_counter()
+    waited = limiter.acquire("light")
+    elapsed = time.perf_counter() - t0
+    assert waited > 0.03 and elapsed >= waited * 0.9
+
+
+def test_acquire_async_waits_without_blocking_the_loop():
+    limiter = RateLimiter({"light": Budget(rate=20.0, burst=1.0)})
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.ensure_future(ticker())
+        waits = [await limiter.acquire_async("light") for _ in range(3)]
+        task.cancel()
+        return waits, ticks
+
+    waits, ticks = asyncio.run(run())
+    assert waits[0] == 0.0 and waits[2] > 0.03
+    assert ticks >= 5
+
+
+def test_set_budget_keeps_the_current_level(clock):
+    limiter = RateLimiter({"light": Budget(rate=10.0, burst=10.0)})
+    for _ in range(7):
+        limiter.acquire("light")                              # 3 Tokens übrig
+    limiter.set_budget("light", Budget(rate=1.0, burst=5.0))
+    assert sum(limiter._slot("default", "light").bucket.try_acquire() for _ in range(5)) == 3
+
+
+def test_set_budget_clamps_to_the_new_burst(clock):
+    limiter = RateLimiter({"light": Budget(rate=10.0, burst=10.0)})
+    limiter.acquire("light")                                  # Slot anlegen, 9 Tokens übrig
+    limiter.set_budget("light", Budget(rate=1.0, burst=2.0))
+    bucket = limiter._slot("default", "light").bucket
+    assert sum(bucket.try_acquire() for _ in range(5)) == 2
+
+
+def test_set_budget_keeps_accumulated_debt(clock):
+    limiter = RateLimiter({"grouped_light": Budget(rate=1.0, burst=1.0)})
+    # Drei Reservierungen ohne zu schlafen (die Wartenden hängen noch) -> 2 Tokens Schulden
+    assert [limiter._reserve("default", "grouped_light", 1.0) for _ in range(3)] == [0.0, 1.0, 2.0]
+    limiter.set_budget("grouped_light", Budget(rate=2.0, burst=4.0))
+    # Schulden von 2 Tokens bei neuer Rate 2/s -> der nächste Slot ist erst in 1.5 s frei
+    assert limiter.acquire("grouped_light") == pytest.approx(1.5)
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from conftest import eventually
+from huekit.api.event_stream import EventStream, eventstream_url, iter_sse
+from huekit.api.http_client import HttpClient
+from huekit.api.hue_api import HueApi
+from huekit.repo.hue_repository import HueRepository
+from huekit.testing.fake_bridge import FakeBridge, FakeBridgeConfig
+
+
+def _stream(repo: HueRepository) -> EventStream:
+    return EventStream(repo.api.http, repo.apply_events, on_connect=repo._on_connect,
+                       backoff_initial_s=0.05, backoff_max_s=0.05)
+
+
+@pytest.fixture
+def repo(api):
+    repo = HueRepository(api)
+    repo.start(_stream(repo))
+    yield repo
+    repo.stop()
+
+
+def test_iter_sse_parses_ids_comments_and_multiline_data():
+    lines = [": hi", "", "id: 1:1", "data: [1,", "data: 2]", "", "data: {}", ""]
+    assert list(iter_sse(iter(lines))) == [("1:1", "[1,\n2]"), (None, "{}")]
+
+
+def test_eventstream_url():
+    assert eventstream_url("https://10.0.0.2/clip/v2/resource") == "https://10.0.0.2/eventstream/clip/v2"
+
+
+def test_start_mirrors_bridge(repo, resources):
+    assert repo.synced.is_set() and repo.stream_connected.is_set()
+    for rid, light in resources["light"].items():
+        assert repo.get("light", rid)["dimming"] == light["dimming"]
+    assert set(repo.group_memberships()) == set(resources["grouped_light"])
+
+
+def test_events_keep_mirror_current(repo, api, resources):
+    lid = sorted(resources["light"])[0]
+    api.put_resource("light", lid, {"dimming": {"brightness": 12.0}})
+    assert eventually(lambda: repo.get("light", lid)["dimming"]["brightness"] == 12.0)
+
+
+def test_group_put_updates_member_lights(repo, api):
+    gid, lights = next((g, ls) for g, ls in repo.group_memberships().items() if ls)
+    api.put_resource("grouped_light", gid, {"on": {"on": True}})
+    assert eventually(lambda: all(repo.get("light", lid)["on"]["on"] for lid in lights))
+
+
+def test_reconnect_resyncs_missed_changes(repo, bridge, resources):
+    lid = sorted(resources["light"])[0]
+    # Änderung ohne Event -> nur ein Resync nach dem Reconnect bringt sie in den Spiegel
+    bridge.resources["light"][lid]["dimming"]["brightness"] = 77.0
+    bridge.disconnect_streams()
+    assert eventually(lambda: repo.resyncs == 2)
+    assert repo.get("light", lid)["dimming"]["brightness"] == 77.0
+
+
+def test_events_during_initial_sync_are_not_lost(resources):
+    lid = sorted(resources["light"])[0]
+    with FakeBridge(resources, FakeBridgeConfig(latency_s=0.05)) as bridge:
+        http = HttpClient(bridge.base_url, bridge.headers)
+        repo = HueRepository(HueApi(http))
+        # Mitten in den GETs (6 x 50 ms): Event, das die Abfrage schon nicht mehr sieht
+        timer = threading.Timer(0.12, bridge.emit, args=("update", [{"id": lid, "type": "light",
+                                                                       "dimming": {"brightness": 42.0}}]))
+        timer.start()
+        try:
+            repo.start(_stream(repo))
+            timer.join()
+            assert repo.resyncs == 1
+            assert repo.get("light", lid)["dimming"]["brightness"] == 42.0
+        finally:
+            repo.stop()
+            http.close()
+
+
+def test_concurrent_syncs_are_serialized(resources):
+    with FakeBridge(resources, FakeBridgeConfig(latency_s=0.01)) as bridge:
+        http = HttpClient(bridge.base_url, bridge.headers)
+        repo = HueRepository(HueApi(http))
+        errors = []
+
+        def run():
+            try:
+                repo.sync()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        http.close()
+    assert errors == []
+    assert repo.resyncs == 4
+    assert len(repo.all("light")) == len(resources["light"])
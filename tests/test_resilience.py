@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from conftest import eventually
+from huekit.api.http_client import AsyncHttpClient, HttpClient, HueBridgeError
+from huekit.api.resilience import CircuitBreaker, CircuitOpenError, HedgePolicy, RetryPolicy
+from huekit.runtime.metrics import HTTP_HEDGE_WINS, HTTP_HEDGED, HTTP_IN_FLIGHT, InMemorySink
+
+
+def test_breaker_opens_after_threshold_and_recovers_via_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=0.05)
+    breaker.before_request()
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError, match="is open"):
+        breaker.before_request()
+    time.sleep(0.06)
+    breaker.before_request()                      # die eine Probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError, match="is half-open") as info:
+        breaker.before_request()                  # zweite Anfrage während der Probe
+    assert info.value.state == "half-open"
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_released_probe_frees_the_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    breaker.before_request()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_request()
+
+
+def test_retry_recovers_from_transient_errors(bridge):
+    client = HttpClient(bridge.base_url, bridge.headers, retry=RetryPolicy(backoff_initial_s=0.001))
+    try:
+        bridge.fail_next(2, status=503)
+        assert client.request("GET", "light")["data"]
+        assert bridge.stats.injected_errors == 2
+    finally:
+        client.close()
+
+
+def test_client_breaker_half_open_recovery(bridge):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=0.05)
+    client = HttpClient(bridge.base_url, bridge.headers, breaker=breaker)
+    try:
+        bridge.fail_next(2, status=503)
+        for _ in range(2):
+            with pytest.raises(HueBridgeError):
+                client.request("GET", "light")
+        requests_before = bridge.stats.requests
+        with pytest.raises(CircuitOpenError):
+            client.request("GET", "light")
+        assert bridge.stats.requests == requests_before   # abgewiesen, ohne die Bridge zu fragen
+        time.sleep(0.06)
+        assert client.request("GET", "light")["data"]
+        assert breaker.state == CircuitBreaker.CLOSED
+    finally:
+        client.close()
+
+
+def test_not_found_does_not_trip_breaker(bridge):
+    breaker = CircuitBreaker(failure_threshold=1)
+    client = HttpClient(bridge.base_url, bridge.headers, breaker=breaker)
+    try:
+        with pytest.raises(HueBridgeError):
+            client.request("GET", "light/does-not-exist")
+        assert breaker.state == CircuitBreaker.CLOSED
+    finally:
+        client.close()
+
+
+def test_cancelled_probe_does_not_wedge_breaker(bridge, bridge_config):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.05)
+
+    async def scenario():
+        async with AsyncHttpClient(bridge.base_url, bridge.headers, breaker=breaker) as client:
+            breaker.record_failure()
+            await asyncio.sleep(0.06)
+            bridge_config.latency_s = 0.5
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.request("GET", "light"), 0.05)
+            bridge_config.latency_s = 0.0
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            return await client.request("GET", "light")
+
+    assert asyncio.run(scenario())["data"]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def _slow_first_request(bridge, bridge_config, slow_s: float) -> threading.Thread:
+    """Nur die erste Anfrage ist langsam: sobald sie angekommen ist, wird die Latenz abgeschaltet."""
+    bridge_config.latency_s = slow_s
+
+    def flip():
+        eventually(lambda: bridge.stats.requests >= 1)
+        bridge_config.latency_s = 0.0
+
+    thread = threading.Thread(target=flip, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_hedge_fires_after_delay_and_faster_answer_wins(bridge, bridge_config):
+    sink = InMemorySink()
+    client = HttpClient(bridge.base_url, bridge.headers, metrics=sink, hedge=HedgePolicy(delay_s=0.05))
+    try:
+        _slow_first_request(bridge, bridge_config, 0.5)
+        t0 = time.perf_counter()
+        assert client.get("light")["data"]
+        elapsed = time.perf_counter() - t0
+    finally:
+        client.close()
+    assert 0.05 <= elapsed < 0.4
+    assert bridge.stats.requests == 2
+    assert sink.counter(HTTP_HEDGED, {"rtype": "light"}) == 1
+    assert sink.counter(HTTP_HEDGE_WINS, {"rtype": "light"}) == 1
+
+
+def test_fast_primary_sends_no_hedge(bridge):
+    sink = InMemorySink()
+    client = HttpClient(bridge.base_url, bridge.headers, metrics=sink, hedge=HedgePolicy(delay_s=0.2))
+    try:
+        assert client.get("light")["data"]
+        client.put("light/" + next(iter(bridge.resources["light"])), {"on": {"on": True}})
+    finally:
+        client.close()
+    assert bridge.stats.requests == 2                  # PUTs werden nie gehedged
+    assert sink.counter(HTTP_HEDGED, {"rtype": "light"}) == 0
+
+
+def test_hedge_that_loses_is_counted_without_a_win(bridge, bridge_config):
+    sink = InMemorySink()
+    bridge_config.latency_s = 0.15                     # beide gleich langsam -> die erste kommt zuerst
+    client = HttpClient(bridge.base_url, bridge.headers, metrics=sink, hedge=HedgePolicy(delay_s=0.05))
+    try:
+        assert client.get("light")["data"]
+    finally:
+        client.close()
+    assert bridge.stats.requests == 2
+    assert sink.counter(HTTP_HEDGED, {"rtype": "light"}) == 1
+    assert sink.counter(HTTP_HEDGE_WINS, {"rtype": "light"}) == 0
+
+
+def test_async_hedge_wins_and_cancels_the_slow_primary(bridge, bridge_config):
+    sink = InMemorySink()
+
+    async def run():
+        async with AsyncHttpClient(bridge.base_url, bridge.headers, metrics=sink,
+                                   hedge=HedgePolicy(delay_s=0.05)) as client:
+            t0 = time.perf_counter()
+            body = await client.get("light")
+            return body, time.perf_counter() - t0
+
+    _slow_first_request(bridge, bridge_config, 0.5)
+    body, elapsed = asyncio.run(run())
+    assert body["data"] and 0.05 <= elapsed < 0.4
+    assert sink.counter(HTTP_HEDGED, {"rtype": "light"}) == 1
+    assert sink.counter(HTTP_HEDGE_WINS, {"rtype": "light"}) == 1
+    assert sink.gauge(HTTP_IN_FLIGHT) == 0             # abgebrochener Verlierer ist ausgetragen
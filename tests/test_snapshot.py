@@ -0,0 +1,84 @@
+import copy
+
+import pytest
+
+from conftest import eventually
+from huekit.repo.hue_repository import HueRepository
+from huekit.runtime.snapshot import LightState, Snapshot
+from huekit.services.light_service import LightService
+
+FIELDS = ("on", "dimming", "color")
+
+
+@pytest.fixture
+def repo(api):
+    repo = HueRepository(api)
+    repo.start()
+    yield repo
+    repo.stop()
+
+
+@pytest.fixture
+def service(api, repo):
+    return LightService(api, repo)
+
+
+def state(resources: dict, light_ids) -> dict:
+    return {lid: {f: copy.deepcopy(resources["light"][lid][f]) for f in FIELDS} for lid in light_ids}
+
+
+def mirrored(repo: HueRepository, expected: dict) -> bool:
+    return all({f: repo.get("light", lid)[f] for f in FIELDS} == fields for lid, fields in expected.items())
+
+
+def test_snapshot_change_restore_round_trip(service, repo, bridge, resources):
+    room_group = next(g for g, body in resources["grouped_light"].items() if body["owner"]["rtype"] == "room")
+    lights = sorted(repo.group_memberships()[room_group])
+    other = next(lid for lid in sorted(resources["light"]) if lid not in lights)
+    before = state(resources, lights + [other])
+
+    snap = service.snapshot(light_ids=[other], group_ids=[room_group])
+    assert set(snap.lights) == set(before)
+
+    # Ganzer Raum an + gedimmt, eine Lampe zusätzlich umgefärbt, eine fremde Lampe an
+    service.set_states({**{lid: {"on": {"on": True}, "dimming": {"brightness": 80.0}} for lid in lights},
+                        lights[0]: {"on": {"on": True}, "dimming": {"brightness": 80.0},
+                                    "color": {"xy": {"x": 0.6, "y": 0.35}}},
+                        other: {"on": {"on": True}}})
+    changed = state(resources, lights + [other])
+    assert changed != before
+    assert eventually(lambda: mirrored(repo, changed))
+
+    plan = service.restore(snap)
+    assert plan.commands
+    assert state(resources, lights + [other]) == before
+    assert eventually(lambda: mirrored(repo, before))
+
+    puts = bridge.stats.puts
+    assert service.restore(snap).commands == []
+    assert bridge.stats.puts == puts
+
+
+def test_restore_with_duration_adds_dynamics(service, repo, api, resources):
+    lid = sorted(resources["light"])[0]
+    snap = service.snapshot(light_ids=[lid])
+    api.put_resource("light", lid, {"dimming": {"brightness": 5.0}})
+    assert eventually(lambda: repo.get("light", lid)["dimming"]["brightness"] == 5.0)
+    plan = service.restore(snap, duration_ms=400)
+    assert [c.payload for c in plan.commands] == [{"dimming": {"brightness": 50.0}, "dynamics": {"duration": 400}}]
+
+
+def test_snapshot_serializes_compactly():
+    snap = Snapshot({"a": LightState(True, 40.0, xy=(0.3, 0.4)),
+                     "b": LightState(False, 10.0, mirek=366),
+                     "c": LightState(True)}, taken_at=123.0)
+    data = snap.to_dict()
+    assert data["lights"]["a"] == [True, 40.0, 0.3, 0.4, None]
+    assert Snapshot.from_dict(data) == snap
+
+
+def test_diff_ignores_changes_below_tolerance():
+    target = LightState(True, 50.0, xy=(0.3, 0.3))
+    assert target.diff(LightState(True, 50.3, xy=(0.3002, 0.2999))) == {}
+    assert target.diff(LightState(False, 50.0, xy=(0.3, 0.3))) == {"on": {"on": True}}
+    assert LightState(True, mirek=300).diff(LightState(True, xy=(0.3, 0.3))) == {"color_temperature": {"mirek": 300}}
@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+import pytest
+
+from huekit.effects.spatial import WHITE, Gradient, LinearSweep, RadialWave, light_resolver, rest_items, stream_source
+from huekit.models.entertainment import EntertainmentConfiguration
+from huekit.repo.hue_repository import HueRepository
+
+# Kanäle auf einer Linie entlang x, dazu einer abseits in y
+POSITIONS = np.array([(-1.0, 0.0, 0.0), (-0.5, 0.0, 0.0), (0.0, 0.0, 0.0), (0.5, 0.0, 0.0), (1.0, 0.0, 0.0),
+                      (0.0, 0.75, 0.0)])
+TIMES = np.array([0.0, 0.3, 1.1, 2.7])
+
+
+def test_radial_wave_phase_follows_distance_from_center():
+    wave = RadialWave(wavelength=1.0, speed=0.5, color=(0.15, 0.06), brightness=1.0, background_brightness=0.0)
+    t = 0.4
+    values = wave(t, POSITIONS)
+    radius = np.linalg.norm(POSITIONS, axis=1)
+    weight = 0.5 + 0.5 * np.cos(2 * math.pi * (radius - 0.5 * t))
+    np.testing.assert_allclose(values[:, 2], weight)
+    np.testing.assert_allclose(values[:, 0], WHITE[0] + weight * (0.15 - WHITE[0]))
+    # Gleicher Abstand zum Zentrum -> gleicher Wert, unabhängig von der Richtung
+    np.testing.assert_allclose(values[0], values[4])
+    np.testing.assert_allclose(values[1], values[3])
+    assert not np.allclose(values[2], values[3])
+    # Eine halbe Wellenlänge weiter außen liegt die Welle in Gegenphase
+    assert values[2, 2] + values[1, 2] == pytest.approx(1.0)
+
+
+def test_radial_wave_moves_outward_with_time():
+    wave = RadialWave(wavelength=1.0, speed=0.5)
+    # Was bei r=0 ist, liegt eine Sekunde später bei r=speed
+    np.testing.assert_allclose(wave(1.0, POSITIONS)[1], wave(0.0, POSITIONS)[2])
+    # Nach wavelength/speed Sekunden wiederholt sich alles
+    np.testing.assert_allclose(wave(2.0, POSITIONS), wave(0.0, POSITIONS), atol=1e-12)
+
+
+def test_linear_sweep_lights_channels_along_its_direction():
+    sweep = LinearSweep(direction=(1.0, 0.0, 0.0), speed=0.5, width=0.35)
+    reach = math.sqrt(3) + 2 * 0.35
+    # Bandmitte genau auf dem Kanal bei x=0.5
+    t = (0.5 + reach) / 0.5
+    values = sweep(t, POSITIONS)
+    assert values[3, 2] == pytest.approx(1.0)
+    assert values[3, :2] == pytest.approx((0.17, 0.7))
+    # Abfall mit dem Abstand entlang der Richtung: halbe Helligkeit bei `width`, Kanal in y zählt nur über x
+    along = POSITIONS[:, 0]
+    np.testing.assert_allclose(values[:, 2], np.exp2(-((along - 0.5) / 0.35) ** 2))
+    assert values[0, 2] < 1e-5
+    np.testing.assert_allclose(values[5], values[2])
+    # Andere Richtung -> anderer Kanal hell
+    assert LinearSweep(direction=(0.0, 1.0, 0.0), speed=0.5)(
+        (0.75 + reach) / 0.5, POSITIONS)[5, 2] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("effect", [RadialWave(), LinearSweep(direction=(1.0, 1.0, 0.0)),
+                                    Gradient(((-1.0, (0.6, 0.3), 0.2), (1.0, (0.2, 0.6), 1.0)), scroll=0.4)],
+                         ids=["wave", "sweep", "gradient"])
+def test_time_array_matches_single_evaluations(effect):
+    batch = effect(TIMES, POSITIONS)
+    assert batch.shape == (len(TIMES), len(POSITIONS), 3)
+    for n, t in enumerate(TIMES):
+        np.testing.assert_allclose(batch[n], effect(float(t), POSITIONS))
+
+
+def test_gradient_interpolates_between_stops():
+    red, blue = (0.6915, 0.3083), (0.1532, 0.0475)
+    gradient = Gradient(((-1.0, red, 0.0), (1.0, blue, 1.0)))
+    values = gradient(0.0, POSITIONS)
+    assert values[0] == pytest.approx((*red, 0.0))
+    assert values[4] == pytest.approx((*blue, 1.0))
+    assert values[2] == pytest.approx(((red[0] + blue[0]) / 2, (red[1] + blue[1]) / 2, 0.5))
+    np.testing.assert_allclose(values[:5, 2], [0.0, 0.25, 0.5, 0.75, 1.0])
+    # Ohne scroll ist der Verlauf zeitunabhängig, mit scroll wandert er um scroll * t
+    np.testing.assert_allclose(gradient(5.0, POSITIONS), values)
+    scrolled = Gradient(gradient.stops, scroll=0.5)
+    np.testing.assert_allclose(scrolled(1.0, POSITIONS)[3], values[2])
+    with pytest.raises(ValueError, match="at least two"):
+        Gradient(((0.0, red, 1.0),))
+    with pytest.raises(ValueError, match="increasing"):
+        Gradient(((1.0, red, 1.0), (0.0, blue, 1.0)))
+
+
+def test_stream_source_counts_time_from_first_tick_and_reuses_buffer():
+    wave = RadialWave(background_brightness=-0.5)
+    source = stream_source(wave, POSITIONS)
+    first = source(0, 10.0)
+    np.testing.assert_allclose(first, np.clip(wave(0.0, POSITIONS), 0.0, 1.0))
+    second = source(1, 10.4)
+    assert second is first
+    np.testing.assert_allclose(second, np.clip(wave(0.4, POSITIONS), 0.0, 1.0))
+    assert second.min() >= 0.0
+
+
+def test_rest_items_follow_channel_positions(api, resources):
+    repo = HueRepository(api)
+    repo.sync()
+    config = EntertainmentConfiguration.model_validate(next(iter(resources["entertainment_configuration"].values())))
+    positions = np.asarray(config.positions)
+    sweep = LinearSweep(speed=0.5, background_brightness=0.1)
+    # Band auf dem Kanal mit dem größten x
+    brightest = int(positions[:, 0].argmax())
+    values = sweep((positions[brightest, 0] + math.sqrt(3) + 0.7) / 0.5, positions)
+
+    items = rest_items(config, values, light_resolver(repo), duration_ms=200)
+    assert len(items) == len(config.channels)
+    by_light = {rid: payload for _, rid, payload in items}
+    for row, channel in enumerate(config.channels):
+        payload = by_light[channel.members[0].service.rid]
+        assert payload["dimming"]["brightness"] == pytest.approx(values[row, 2] * 100.0, abs=0.01)
+        assert payload["dynamics"] == {"duration": 200}
+    top = by_light[config.channels[brightest].members[0].service.rid]
+    assert top["dimming"]["brightness"] == 100.0 and top["color"]["xy"] == {"x": 0.17, "y": 0.7}
+    assert api.apply_many(items).ok
+    assert resources["light"][config.channels[brightest].members[0].service.rid]["dimming"]["brightness"] == 100.0
@@ -0,0 +1,128 @@
+import copy
+
+import pytest
+
+from huekit.repo.topology import TopologyIndex
+from huekit.testing.fake_bridge import generate_resources
+
+
+def view(index: TopologyIndex, resources: dict) -> dict:
+    """Alle Lookups über alle bekannten IDs - zwei Indizes mit gleicher Sicht sind gleichwertig."""
+    ids = {rid for rtype in ("light", "device", "room", "zone", "grouped_light", "bridge_home")
+           for rid in resources.get(rtype, {})}
+    return {
+        "groups": index.groups(),
+        "owners": {gid: index.group_owner(gid) for gid in ids},
+        "owner_groups": {rid: index.owner_group(rid) for rid in ids},
+        "container_lights": {rid: index.container_lights(rid) for rid in ids},
+        "container_devices": {rid: index.container_devices(rid) for rid in ids},
+        "light_device": {rid: index.light_device(rid) for rid in ids},
+        "device_services": {rid: index.device_services(rid) for rid in ids},
+        "light_room": {rid: index.light_room(rid) for rid in ids},
+        "light_zones": {rid: index.light_zones(rid) for rid in ids},
+        "light_groups": {rid: index.light_groups(rid) for rid in ids},
+        "device_room": {rid: index.device_room(rid) for rid in ids},
+    }
+
+
+def rebuilt(resources: dict) -> TopologyIndex:
+    index = TopologyIndex()
+    index.load(resources)
+    return index
+
+
+@pytest.fixture
+def topo():
+    resources = generate_resources(rooms=3, lights_per_room=2, zones=1)
+    index = rebuilt(copy.deepcopy(resources))
+    return resources, index
+
+
+def rooms(resources: dict) -> list[dict]:
+    return list(resources["room"].values())
+
+
+def test_load_matches_generated_topology(topo):
+    resources, index = topo
+    for room in rooms(resources):
+        devices = {c["rid"] for c in room["children"]}
+        lights = {s["rid"] for d in devices for s in resources["device"][d]["services"] if s["rtype"] == "light"}
+        assert index.container_lights(room["id"]) == lights
+        assert all(index.light_room(lid) == room["id"] for lid in lights)
+    home_group = next(g for g, body in resources["grouped_light"].items() if body["owner"]["rtype"] == "bridge_home")
+    assert index.group_lights(home_group) == set(resources["light"])
+
+
+def test_device_move_matches_rebuild(topo):
+    resources, index = topo
+    src, dst = rooms(resources)[:2]
+    moved = src["children"].pop(0)
+    dst["children"].append(moved)
+    # Die Bridge schickt zwei Updates - in beliebiger Reihenfolge
+    index.upsert(copy.deepcopy(dst))
+    index.upsert(copy.deepcopy(src))
+    assert index.device_room(moved["rid"]) == dst["id"]
+    assert view(index, resources) == view(rebuilt(resources), resources)
+
+
+def test_light_delete_matches_rebuild(topo):
+    resources, index = topo
+    room = rooms(resources)[0]
+    device_id = room["children"][0]["rid"]
+    device = resources["device"][device_id]
+    light_id = next(s["rid"] for s in device["services"] if s["rtype"] == "light")
+    del resources["light"][light_id]
+    device["services"] = [s for s in device["services"] if s["rid"] != light_id]
+    index.remove("light", light_id)
+    index.upsert(copy.deepcopy(device))
+    assert light_id not in index.container_lights(room["id"])
+    # Die Bridge schickt danach Updates für Zonen, die die Lampe direkt enthielten
+    for zone in resources["zone"].values():
+        if any(c["rid"] == light_id for c in zone["children"]):
+            zone["children"] = [c for c in zone["children"] if c["rid"] != light_id]
+            index.upsert(copy.deepcopy(zone))
+    assert index.light_groups(light_id) == set()
+    assert view(index, resources) == view(rebuilt(resources), resources)
+
+
+def test_grouped_light_removal_matches_rebuild(topo):
+    resources, index = topo
+    room = rooms(resources)[1]
+    group_id = index.owner_group(room["id"])
+    del resources["grouped_light"][group_id]
+    index.remove("grouped_light", group_id)
+    assert index.owner_group(room["id"]) is None
+    assert index.group_lights(group_id) == set()
+    assert all(group_id not in index.light_groups(lid) for lid in index.container_lights(room["id"]))
+    assert view(index, resources) == view(rebuilt(resources), resources)
+
+
+def test_sequence_of_updates_matches_rebuild(topo):
+    resources, index = topo
+    first, second, third = rooms(resources)
+    # Gerät umziehen, Zone umbauen, Raum löschen, neue Lampe mit Gerät anlegen
+    moved = first["children"].pop()
+    third["children"].append(moved)
+    index.upsert(copy.deepcopy(first))
+    index.upsert(copy.deepcopy(third))
+
+    zone = next(iter(resources["zone"].values()))
+    zone["children"] = [{"rid": second["id"], "rtype": "room"}]
+    index.upsert(copy.deepcopy(zone))
+
+    del resources["room"][first["id"]]
+    index.remove("room", first["id"])
+    group_id = next(g for g, body in resources["grouped_light"].items() if body["owner"]["rid"] == first["id"])
+    del resources["grouped_light"][group_id]
+    index.remove("grouped_light", group_id)
+
+    light = {"id": "new-light", "type": "light", "owner": {"rid": "new-device", "rtype": "device"}}
+    device = {"id": "new-device", "type": "device", "services": [{"rid": "new-light", "rtype": "light"}]}
+    resources["light"]["new-light"] = light
+    resources["device"]["new-device"] = device
+    second["children"].append({"rid": "new-device", "rtype": "device"})
+    for res in (light, device, second):
+        index.upsert(copy.deepcopy(res))
+
+    assert index.light_zones("new-light") == {zone["id"]}
+    assert view(index, resources) == view(rebuilt(resources), resources)
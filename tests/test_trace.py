@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from huekit.api.http_client import HueBridgeError
+from huekit.api.hue_api import HueApi
+from huekit.runtime.rate_limit import Budget
+from huekit.runtime.trace import MAGIC, TraceRecord, TraceRecorder, read_trace
+from huekit.testing.replay import Replayer, replay
+
+GAP_S = 0.1
+FAST = {"light": Budget(rate=1000.0, burst=1000.0), "grouped_light": Budget(rate=1000.0, burst=1000.0)}
+
+
+@pytest.fixture
+def recorded(tmp_path, http, bridge, resources):
+    """Trace mit Lampen- und Gruppenbefehlen im Abstand von GAP_S und einem 503."""
+    path = tmp_path / "session.trace"
+    lights = sorted(resources["light"])
+    group = sorted(resources["grouped_light"])[0]
+    with TraceRecorder(path) as recorder:
+        api = HueApi(http, recorder=recorder)
+        steps = [("light", lights[0], {"on": {"on": True}}),
+                 ("light", lights[1], {"dimming": {"brightness": 30.0}}),
+                 ("grouped_light", group, {"on": {"on": False}, "dynamics": {"duration": 400}}),
+                 ("light", lights[0], {"color": {"xy": {"x": 0.4, "y": 0.4}}})]
+        for n, (rtype, rid, payload) in enumerate(steps):
+            if n:
+                time.sleep(GAP_S)
+            api.put_resource(rtype, rid, payload)
+        bridge.fail_next(1, status=503)
+        with pytest.raises(HueBridgeError):
+            api.put_resource("light", lights[2], {"on": {"on": True}})
+        assert recorder.records == 5
+    return path, steps
+
+
+def test_recorded_trace_round_trips(recorded):
+    path, steps = recorded
+    records = list(read_trace(path))
+    assert [(r.rtype, r.rid, r.to_payload()) for r in records[:4]] == steps
+    assert [r.status for r in records] == [200, 200, 200, 200, 503]
+    assert records[2].fields == ("dynamics", "on")
+    assert all(r.latency_s > 0 for r in records)
+    assert [round(b.t - a.t, 1) for a, b in zip(records, records[1:4])] == [GAP_S] * 3
+
+
+def test_truncated_last_record_is_ignored(recorded, tmp_path):
+    path, _ = recorded
+    data = path.read_bytes()
+    cut = tmp_path / "cut.trace"
+    cut.write_bytes(data[:-3])
+    assert len(list(read_trace(cut))) == 4
+    bad = tmp_path / "bad.trace"
+    bad.write_bytes(b"NOTATRACE" + data[len(MAGIC):])
+    with pytest.raises(ValueError, match="not a hue-kit trace"):
+        list(read_trace(bad))
+
+
+def test_replay_reproduces_sequence_and_scaled_timing(recorded, tmp_path):
+    path, _ = recorded
+    original = list(read_trace(path))
+    replayed_path = tmp_path / "replayed.trace"
+    with TraceRecorder(replayed_path) as recorder:
+        report = replay(str(path), speed=2.0, budgets=FAST, recorder=recorder)
+    replayed = list(read_trace(replayed_path))
+
+    playable = original                                                  # auch der 503 wird erneut gesendet
+    assert report.records == 5 and report.skipped == 0
+    assert report.bridge.puts == len(replayed) == report.dispatcher.sent == 5
+    # Gleiche Reihenfolge und Payloads; IDs werden stabil und eindeutig abgebildet
+    assert [(r.rtype, r.to_payload()) for r in replayed] == [(r.rtype, r.to_payload()) for r in playable]
+    mapping = {}
+    for a, b in zip(playable, replayed):
+        assert mapping.setdefault((a.rtype, a.rid), b.rid) == b.rid
+    assert len(set(mapping.values())) == len(mapping)
+    assert all(r.ok for r in replayed)
+
+    # Halbe Abstände bei speed=2 (plus wenig Dispatcher-Latenz)
+    for (a0, a1), (b0, b1) in zip(zip(playable, playable[1:]), zip(replayed, replayed[1:])):
+        assert (b1.t - b0.t) == pytest.approx((a1.t - a0.t) / 2, abs=0.03)
+    assert report.trace_span_s / 2 <= report.wall_s < report.trace_span_s
+    assert report.max_lag_s < 0.05
+
+
+def test_replay_without_pauses_skips_raw_bodies(recorded):
+    path, _ = recorded
+    records = list(read_trace(path))
+    # Vorkodierter Body, der kein JSON ist -> nicht über den Dispatcher abspielbar
+    raw = TraceRecord(records[-1].t + 1.0, "light", records[0].rid, b"\x00raw", 0.001, 200)
+    replayer = Replayer(records + [raw])
+    report = replayer.run(speed=None, budgets=FAST)
+    stats = report.dispatcher
+    assert report.skipped == 1 and stats.submitted == 5
+    # Ohne Pausen darf der Dispatcher die beiden Befehle an dieselbe Lampe zusammenfassen
+    assert report.bridge.puts == stats.sent == stats.submitted - stats.merged - stats.superseded
+    assert report.wall_s < replayer.span_s / 2
+    assert report.summary()["speed"] == "max"
+    with pytest.raises(ValueError, match="speed"):
+        replayer.run(speed=0)